@@ -0,0 +1,270 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+
+from . import __version__
+
+
+class ConversionCache:
+    """
+    変換結果（xlsx）をディスクに保存するコンテンツアドレス型キャッシュ
+    
+    キーは入力内容のハッシュ・変換オプション・ツールのバージョンから算出する。
+    保存容量が上限を超えた場合は、最後に利用された時刻が古いものから削除する。
+    複数プロセスから同じディレクトリを共有できるよう、書き込みは一時ファイル
+    経由のリネームで行う。
+    """
+    
+    # 入力ファイルのハッシュ計算時の読み込み単位
+    CHUNK_SIZE = 1024 * 1024
+    
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            cache_dir: キャッシュディレクトリパス（存在しない場合は作成）
+            max_bytes: キャッシュの最大合計サイズ（バイト）
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # 合計サイズの概算（初回の保存時にディレクトリを走査して初期化）
+        self._total_bytes = None
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def content_digest(data: bytes) -> str:
+        """バイト列のハッシュを計算する"""
+        return hashlib.sha256(data).hexdigest()
+    
+    @classmethod
+    def file_digest(cls, file_path: str) -> str:
+        """ファイル内容のハッシュを一定サイズずつ読み込みながら計算する"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(cls.CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def make_key(content_digest: str, options: Dict[str, Any]) -> str:
+        """
+        入力内容のハッシュと変換オプションからキャッシュキーを作成する
+        
+        Args:
+            content_digest: content_digest() / file_digest() で計算したハッシュ
+            options: 出力内容に影響する変換オプション
+            
+        Returns:
+            キャッシュキー
+        """
+        key_source = json.dumps(
+            {'content': content_digest, 'options': options, 'version': __version__},
+            sort_keys=True
+        )
+        return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        キャッシュエントリを取得する
+        
+        Args:
+            key: キャッシュキー
+            
+        Returns:
+            メタデータと 'path'（キャッシュされたxlsxのパス）を含む辞書。
+            存在しない場合はNone
+        """
+        data_path = self._data_path(key)
+        try:
+            with open(self._meta_path(key), 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            # LRU判定のため最終利用時刻を更新
+            os.utime(data_path)
+        except (OSError, ValueError):
+            return None
+        
+        metadata['path'] = data_path
+        return metadata
+    
+    def restore(self, key: str, output_path: str) -> Optional[Dict[str, Any]]:
+        """
+        キャッシュされたxlsxを出力パスにコピーする
+        
+        Args:
+            key: キャッシュキー
+            output_path: 出力Excelファイルパス
+            
+        Returns:
+            メタデータ。キャッシュに存在しない場合はNone
+        """
+        entry = self.get(key)
+        if entry is None:
+            return None
+        
+        try:
+            shutil.copyfile(entry['path'], output_path)
+        except FileNotFoundError:
+            # 他プロセスにより削除された場合
+            return None
+        return entry
+    
+    def read(self, key: str) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        """
+        キャッシュされたxlsxの内容を読み込む
+        
+        Args:
+            key: キャッシュキー
+            
+        Returns:
+            (xlsxファイルのバイト列, メタデータ) のタプル。
+            キャッシュに存在しない場合はNone
+        """
+        entry = self.get(key)
+        if entry is None:
+            return None
+        
+        try:
+            with open(entry['path'], 'rb') as f:
+                return f.read(), entry
+        except FileNotFoundError:
+            return None
+    
+    def put(self, key: str, source, metadata: Dict[str, Any]) -> None:
+        """
+        変換結果をキャッシュに保存する
+        
+        Args:
+            key: キャッシュキー
+            source: xlsxファイルのパス、またはxlsxのバイト列
+            metadata: 結果とともに保存する情報（tables_found, warnings など）
+        """
+        data_path = self._data_path(key)
+        
+        if isinstance(source, bytes):
+            self._atomic_write(data_path, lambda f: f.write(source))
+        else:
+            with open(source, 'rb') as src:
+                self._atomic_write(data_path, lambda f: shutil.copyfileobj(src, f))
+        
+        meta_bytes = json.dumps(metadata, ensure_ascii=False).encode('utf-8')
+        self._atomic_write(self._meta_path(key), lambda f: f.write(meta_bytes))
+        
+        if self._total_bytes is None:
+            self._total_bytes = self.size()
+        else:
+            self._total_bytes += os.path.getsize(data_path) + len(meta_bytes)
+        
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+    
+    def size(self) -> int:
+        """キャッシュの合計サイズ（バイト）を取得する"""
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            try:
+                total += entry.stat().st_size
+            except FileNotFoundError:
+                continue
+        return total
+    
+    def evict(self) -> None:
+        """最後に利用された時刻が古いエントリから削除し、合計サイズを上限以下にする"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith('.xlsx'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            key = entry.name[:-len('.xlsx')]
+            meta_size = self._safe_getsize(self._meta_path(key))
+            entries.append((stat.st_mtime, key, stat.st_size + meta_size))
+            total += stat.st_size + meta_size
+        
+        entries.sort()
+        for _, key, entry_size in entries:
+            if total <= self.max_bytes:
+                break
+            for path in (self._data_path(key), self._meta_path(key)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total -= entry_size
+        
+        self._total_bytes = total
+    
+    def clear(self) -> None:
+        """キャッシュをすべて削除する"""
+        for entry in os.scandir(self.cache_dir):
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+        self._total_bytes = 0
+    
+    def _data_path(self, key: str) -> str:
+        """キャッシュされたxlsxのパスを取得する"""
+        return os.path.join(self.cache_dir, f"{key}.xlsx")
+    
+    def _meta_path(self, key: str) -> str:
+        """メタデータファイルのパスを取得する"""
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def _atomic_write(self, path: str, write) -> None:
+        """一時ファイルに書き込んでからリネームする"""
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    @staticmethod
+    def _safe_getsize(path: str) -> int:
+        """ファイルサイズを取得する（存在しない場合は0）"""
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+
+class HashingReader(io.RawIOBase):
+    """
+    読み込んだバイト列のハッシュとバイト数を記録しながら読むストリーム
+    
+    ConversionCache.file_digest() と同じハッシュを、入力を読み直さずに求めるために使う。
+    閉じても元のストリームは閉じない。
+    """
+    
+    def __init__(self, stream: BinaryIO):
+        """
+        Args:
+            stream: 読み込み元のバイナリストリーム
+        """
+        self._stream = stream
+        self._digest = hashlib.sha256()
+        self.bytes_read = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        size = len(data)
+        buffer[:size] = data
+        self._digest.update(data)
+        self.bytes_read += size
+        return size
+    
+    def hexdigest(self) -> str:
+        """これまでに読み込んだバイト列のハッシュ"""
+        return self._digest.hexdigest()
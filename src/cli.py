@@ -2,8 +2,7 @@ import click
 import os
 from pathlib import Path
 from typing import Optional
-from .parser import MarkdownTableParser
-from .converter import ExcelConverter
+from .cache import ConversionCache
 
 
 @click.command()
@@ -23,18 +22,71 @@ from .converter import ExcelConverter
     is_flag=True,
     help='列幅の自動調整を有効にする'
 )
+@click.option(
+    '--width-sample-rows',
+    type=click.IntRange(min=1),
+    help='列幅の自動調整に使う先頭行数（巨大なテーブル向け。省略時は全行、--streaming では100行）'
+)
+@click.option(
+    '--sparse',
+    is_flag=True,
+    help='空のセルを作成せず、書式を列・行全体に設定する（空欄の多いテーブルのメモリ使用量とファイルサイズを削減）'
+)
+@click.option(
+    '--streaming',
+    is_flag=True,
+    help='入力を行単位で読み込み、メモリ使用量を一定に保ったまま変換する（大きなファイル向け）'
+)
+@click.option(
+    '--mmap', 'use_mmap',
+    is_flag=True,
+    help='入力ファイルをメモリマップし、テーブル部分の行だけを読み込む（巨大なファイル向け）'
+)
+@click.option(
+    '--infer-types',
+    is_flag=True,
+    help='列の型（整数・小数・パーセント・通貨・日付・真偽値）を推定し、数値や日付として書き出す'
+)
 @click.option(
     '--batch',
     is_flag=True,
     help='ディレクトリ内のすべてのMarkdownファイルを一括変換'
 )
+@click.option(
+    '--jobs', '-j',
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help='一括変換時の並列プロセス数（0の場合はCPUコア数）'
+)
+@click.option(
+    '--incremental',
+    is_flag=True,
+    help='一括変換時、前回から変更のないファイルの変換をスキップする'
+)
+@click.option(
+    '--cache-dir',
+    type=click.Path(file_okay=False),
+    envvar='MD2EXCEL_CACHE_DIR',
+    help='変換結果キャッシュのディレクトリ（同じ内容・オプションの再変換を省略）'
+)
+@click.option(
+    '--engine',
+    type=click.Choice(['openpyxl', 'native']),
+    default='openpyxl',
+    show_default=True,
+    help='Excel出力エンジン（native: openpyxlを使わずに高速に書き出す）'
+)
 @click.option(
     '--verbose', '-v',
     is_flag=True,
     help='詳細な実行ログを出力'
 )
 def cli(input_path: str, output: Optional[str], apply_formatting: bool, 
-        auto_width: bool, batch: bool, verbose: bool):
+        auto_width: bool, width_sample_rows: Optional[int], sparse: bool,
+        streaming: bool, use_mmap: bool, infer_types: bool,
+        batch: bool, jobs: int, incremental: bool, cache_dir: Optional[str],
+        engine: str, verbose: bool):
     """
     Convert Markdown files to Excel format.
     
@@ -42,7 +94,12 @@ def cli(input_path: str, output: Optional[str], apply_formatting: bool,
     """
     input_path_obj = Path(input_path)
     
+    if streaming and infer_types:
+        raise click.UsageError("--infer-types cannot be used with --streaming")
+    
     try:
+        cache = ConversionCache(cache_dir) if cache_dir else None
+        
         if batch or input_path_obj.is_dir():
             # ディレクトリ一括変換
             if not input_path_obj.is_dir():
@@ -58,7 +115,16 @@ def cli(input_path: str, output: Optional[str], apply_formatting: bool,
                 str(output_dir),
                 apply_formatting,
                 auto_width,
-                verbose
+                verbose,
+                streaming=streaming,
+                use_mmap=use_mmap,
+                jobs=jobs,
+                incremental=incremental,
+                cache=cache,
+                engine=engine,
+                infer_types=infer_types,
+                width_sample_rows=width_sample_rows,
+                sparse=sparse
             )
         else:
             # 単一ファイル変換
@@ -73,7 +139,14 @@ def cli(input_path: str, output: Optional[str], apply_formatting: bool,
                 str(output_file),
                 apply_formatting,
                 auto_width,
-                verbose
+                verbose,
+                streaming=streaming,
+                use_mmap=use_mmap,
+                cache=cache,
+                engine=engine,
+                infer_types=infer_types,
+                width_sample_rows=width_sample_rows,
+                sparse=sparse
             )
         
         if verbose:
@@ -85,7 +158,14 @@ def cli(input_path: str, output: Optional[str], apply_formatting: bool,
 
 
 def convert_file(input_file: str, output_file: str, apply_formatting: bool,
-                auto_adjust_width: bool, verbose: bool) -> None:
+                auto_adjust_width: bool, verbose: bool,
+                streaming: bool = False,
+                cache: Optional[ConversionCache] = None,
+                engine: str = 'openpyxl',
+                use_mmap: bool = False,
+                infer_types: bool = False,
+                width_sample_rows: Optional[int] = None,
+                sparse: bool = False) -> None:
     """
     単一のMarkdownファイルをExcelに変換する
     
@@ -95,7 +175,20 @@ def convert_file(input_file: str, output_file: str, apply_formatting: bool,
         apply_formatting: フォーマット適用フラグ
         auto_adjust_width: 列幅自動調整フラグ
         verbose: 詳細出力フラグ
+        streaming: ストリーミング変換フラグ
+        cache: 変換結果キャッシュ（Noneの場合はキャッシュしない）
+        engine: Excel出力エンジン（'openpyxl' または 'native'）
+        use_mmap: 入力ファイルをメモリマップして読み込むフラグ
+        infer_types: 列の型推定フラグ（ストリーミング変換では使用できない）
+        width_sample_rows: 列幅の自動調整に使う先頭行数（Noneの場合は全行）
+        sparse: 空のセルを作成しないモード
     """
+    # openpyxlの読み込みに時間がかかるため、変換時まで読み込まない（--help を速く返すため）
+    from .integration import MarkdownToExcelProcessor
+    
+    if streaming and infer_types:
+        raise ValueError("Type inference is not supported in streaming mode")
+    
     if verbose:
         click.echo(f"Processing: {input_file}")
     
@@ -103,40 +196,51 @@ def convert_file(input_file: str, output_file: str, apply_formatting: bool,
     if not os.path.exists(input_file):
         raise FileNotFoundError(f"Input file does not exist: {input_file}")
     
-    # 出力ディレクトリの作成
-    output_path = Path(output_file)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    # ファイル読み込み
-    with open(input_file, 'r', encoding='utf-8') as f:
-        markdown_content = f.read()
-    
-    # Markdownテーブル解析
-    parser = MarkdownTableParser()
-    tables_data = parser.parse(markdown_content)
-    
-    if verbose:
-        table_count = len(tables_data)
-        if table_count == 0:
-            click.echo("  ⚠️  テーブルが見つかりませんでした")
-        else:
-            click.echo(f"  📊 {table_count}個のテーブルを検出")
-    
-    # Excel変換
-    converter = ExcelConverter()
-    converter.convert_to_excel(
-        tables_data,
+    # キャッシュの確認・保存を含め、一括変換と同じ処理で変換する
+    processor = MarkdownToExcelProcessor(
+        cache=cache,
+        engine=engine,
+        width_sample_rows=width_sample_rows,
+        sparse=sparse
+    )
+    result = processor.process_file(
+        input_file,
         output_file,
         apply_formatting=apply_formatting,
-        auto_adjust_width=auto_adjust_width
+        auto_adjust_width=auto_adjust_width,
+        streaming=streaming,
+        use_mmap=use_mmap,
+        infer_types=infer_types
     )
+    if not result.success:
+        raise RuntimeError('; '.join(result.errors))
     
     if verbose:
+        _echo_table_count(result.tables_found)
+        if result.cache_hit:
+            click.echo(f"  ♻️  キャッシュから出力: {output_file}")
+            return
         click.echo(f"  💾 出力: {output_file}")
 
 
+def _echo_table_count(table_count: int) -> None:
+    """検出したテーブル数を出力する"""
+    if table_count == 0:
+        click.echo("  ⚠️  テーブルが見つかりませんでした")
+    else:
+        click.echo(f"  📊 {table_count}個のテーブルを検出")
+
+
 def convert_directory(input_dir: str, output_dir: str, apply_formatting: bool,
-                     auto_adjust_width: bool, verbose: bool) -> None:
+                     auto_adjust_width: bool, verbose: bool,
+                     streaming: bool = False, jobs: int = 1,
+                     incremental: bool = False,
+                     cache: Optional[ConversionCache] = None,
+                     engine: str = 'openpyxl',
+                     use_mmap: bool = False,
+                     infer_types: bool = False,
+                     width_sample_rows: Optional[int] = None,
+                     sparse: bool = False) -> None:
     """
     ディレクトリ内のMarkdownファイルを一括変換する
     
@@ -146,6 +250,15 @@ def convert_directory(input_dir: str, output_dir: str, apply_formatting: bool,
         apply_formatting: フォーマット適用フラグ
         auto_adjust_width: 列幅自動調整フラグ
         verbose: 詳細出力フラグ
+        streaming: ストリーミング変換フラグ
+        jobs: 並列プロセス数（0の場合はCPUコア数）
+        incremental: 差分変換フラグ（変更のないファイルをスキップ）
+        cache: 変換結果キャッシュ（Noneの場合はキャッシュしない）
+        engine: Excel出力エンジン（'openpyxl' または 'native'）
+        use_mmap: 入力ファイルをメモリマップして読み込むフラグ
+        infer_types: 列の型推定フラグ
+        width_sample_rows: 列幅の自動調整に使う先頭行数（Noneの場合は全行）
+        sparse: 空のセルを作成しないモード
     """
     input_path = Path(input_dir)
     output_path = Path(output_dir)
@@ -165,6 +278,47 @@ def convert_directory(input_dir: str, output_dir: str, apply_formatting: bool,
             click.echo("  ⚠️  Markdownファイルが見つかりませんでした")
         return
     
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    
+    if jobs > 1 or incremental:
+        # プロセスプールでの並列変換・差分変換（結果は入力順に返る）
+        from .integration import MarkdownToExcelProcessor
+        
+        processor = MarkdownToExcelProcessor(
+            cache=cache,
+            engine=engine,
+            width_sample_rows=width_sample_rows,
+            sparse=sparse
+        )
+        results = processor.process_directory(
+            input_dir,
+            output_dir,
+            apply_formatting=apply_formatting,
+            auto_adjust_width=auto_adjust_width,
+            streaming=streaming,
+            max_workers=jobs,
+            incremental=incremental,
+            use_mmap=use_mmap,
+            infer_types=infer_types
+        )
+        
+        if verbose:
+            for result in results:
+                if result.skipped:
+                    click.echo(f"  ⏭️  変更なし: {Path(result.input_file).name}")
+                elif result.success:
+                    click.echo(f"  💾 出力: {result.output_file}")
+                else:
+                    click.echo(f"  ❌ {Path(result.input_file).name}: {'; '.join(result.errors)}")
+            stats = processor.get_statistics(results)
+            click.echo(
+                f"📁 ディレクトリ処理完了: {len(markdown_files)}ファイル"
+                f"（変換 {stats['successful_files']} / スキップ {stats['skipped_files']}"
+                f" / 失敗 {stats['failed_files']}）"
+            )
+        return
+    
     # 各ファイルを変換
     for md_file in markdown_files:
         output_file = output_path / f"{md_file.stem}.xlsx"
@@ -175,7 +329,14 @@ def convert_directory(input_dir: str, output_dir: str, apply_formatting: bool,
                 str(output_file),
                 apply_formatting,
                 auto_adjust_width,
-                verbose
+                verbose,
+                streaming=streaming,
+                cache=cache,
+                engine=engine,
+                use_mmap=use_mmap,
+                infer_types=infer_types,
+                width_sample_rows=width_sample_rows,
+                sparse=sparse
             )
         except Exception as e:
             if verbose:
@@ -1,24 +1,61 @@
-import pandas as pd
 import openpyxl
-from openpyxl.styles import Font, Alignment
-from openpyxl.utils.dataframe import dataframe_to_rows
-from typing import List, Dict, Any, Optional
+from openpyxl.styles import Font
+from typing import List, Dict, Any, Optional, Iterable, BinaryIO, TYPE_CHECKING
+import io
+import itertools
 import os
+from .stats import ConversionStats
+from .styles import StyleEngine, HEADER, BODY
+from .table import RowsView
+from .width import ColumnWidthTracker
+from .native_writer import NativeXlsxWriter
+
+if TYPE_CHECKING:
+    # pandasは読み込みに時間がかかるため、convert_from_dataframe() の実行時まで読み込まない
+    import pandas as pd
 
 
 class ExcelConverter:
     """MarkdownテーブルデータをExcelファイルに変換するクラス"""
     
-    def __init__(self):
+    # ストリーミング変換時に列幅の算出に使う先頭行数
+    STREAMING_WIDTH_SAMPLE_ROWS = 100
+    
+    # 出力エンジン（openpyxl: 既定、native: openpyxlを使わない高速な書き出し）
+    ENGINES = ('openpyxl', 'native')
+    
+    def __init__(
+        self,
+        engine: str = 'openpyxl',
+        width_sample_rows: Optional[int] = None,
+        sparse: bool = False
+    ):
+        """
+        Args:
+            engine: 出力エンジン（'openpyxl' または 'native'）
+            width_sample_rows: 列幅の自動調整に使う先頭行数（Noneの場合は全行。
+                ストリーミング変換では STREAMING_WIDTH_SAMPLE_ROWS）
+            sparse: 空のセルを作成しないモード。書式は列・行全体に設定する
+                （nativeエンジンは常に空のセルを書き出さない）
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        if width_sample_rows is not None and width_sample_rows < 0:
+            raise ValueError(f"width_sample_rows must be zero or more: {width_sample_rows}")
+        self.engine = engine
+        self.width_sample_rows = width_sample_rows
+        self.sparse = sparse
         self.default_font = Font(name='Arial', size=10)
         self.header_font = Font(name='Arial', size=10, bold=True)
+        self.style_engine = StyleEngine(self.default_font, self.header_font)
     
     def convert_to_excel(
         self, 
         tables_data: List[Dict[str, Any]], 
         output_path: str,
         apply_formatting: bool = False,
-        auto_adjust_width: bool = False
+        auto_adjust_width: bool = False,
+        stats: Optional[ConversionStats] = None
     ) -> None:
         """
         テーブルデータをExcelファイルに変換する
@@ -28,12 +65,114 @@ class ExcelConverter:
             output_path: 出力Excelファイルパス
             apply_formatting: フォーマット適用するか
             auto_adjust_width: 列幅自動調整するか
+            stats: 段階別の計測値の記録先
         """
+        if stats is None:
+            stats = ConversionStats()
+        
         # 出力ディレクトリの確認
         output_dir = os.path.dirname(output_path)
         if output_dir and not os.path.exists(output_dir):
             raise Exception(f"Output directory does not exist: {output_dir}")
         
+        if self.engine == 'native':
+            self._write_native(
+                tables_data,
+                output_path,
+                apply_formatting,
+                auto_adjust_width,
+                stats,
+                width_sample_rows=self.width_sample_rows
+            )
+        else:
+            workbook = self._build_workbook(tables_data, apply_formatting, auto_adjust_width, stats)
+            
+            # ファイルに保存
+            with stats.stage('save'):
+                workbook.save(output_path)
+        stats.output_bytes = os.path.getsize(output_path)
+    
+    def convert_to_stream(
+        self,
+        tables_data: List[Dict[str, Any]],
+        stream: BinaryIO,
+        apply_formatting: bool = False,
+        auto_adjust_width: bool = False,
+        stats: Optional[ConversionStats] = None
+    ) -> None:
+        """
+        テーブルデータをExcel形式でバイナリストリームに書き出す
+        
+        Args:
+            tables_data: テーブルデータのリスト
+            stream: 書き込み先のバイナリストリーム（BytesIOなど）
+            apply_formatting: フォーマット適用するか
+            auto_adjust_width: 列幅自動調整するか
+            stats: 段階別の計測値の記録先
+        """
+        if stats is None:
+            stats = ConversionStats()
+        
+        start_position = stream.tell() if stream.seekable() else None
+        if self.engine == 'native':
+            self._write_native(
+                tables_data,
+                stream,
+                apply_formatting,
+                auto_adjust_width,
+                stats,
+                width_sample_rows=self.width_sample_rows
+            )
+        else:
+            workbook = self._build_workbook(tables_data, apply_formatting, auto_adjust_width, stats)
+            
+            with stats.stage('save'):
+                workbook.save(stream)
+        if start_position is not None:
+            stats.output_bytes = stream.tell() - start_position
+    
+    def convert_to_bytes(
+        self,
+        tables_data: List[Dict[str, Any]],
+        apply_formatting: bool = False,
+        auto_adjust_width: bool = False,
+        stats: Optional[ConversionStats] = None
+    ) -> bytes:
+        """
+        テーブルデータをExcelファイルの内容（xlsxのバイト列）に変換する
+        
+        Args:
+            tables_data: テーブルデータのリスト
+            apply_formatting: フォーマット適用するか
+            auto_adjust_width: 列幅自動調整するか
+            stats: 段階別の計測値の記録先
+            
+        Returns:
+            xlsxファイルのバイト列
+        """
+        buffer = io.BytesIO()
+        self.convert_to_stream(tables_data, buffer, apply_formatting, auto_adjust_width, stats)
+        return buffer.getvalue()
+    
+    def _build_workbook(
+        self,
+        tables_data: List[Dict[str, Any]],
+        apply_formatting: bool,
+        auto_adjust_width: bool,
+        stats: ConversionStats
+    ):
+        """
+        テーブルデータからワークブックを作成する
+        
+        Args:
+            tables_data: テーブルデータのリスト
+            apply_formatting: フォーマット適用するか
+            auto_adjust_width: 列幅自動調整するか
+            stats: 段階別の計測値の記録先
+            
+        Returns:
+            openpyxlワークブック
+        """
         # ワークブック作成
         workbook = openpyxl.Workbook()
         
@@ -54,18 +193,98 @@ class ExcelConverter:
                     worksheet, 
                     table_data, 
                     apply_formatting, 
-                    auto_adjust_width
+                    auto_adjust_width,
+                    stats
                 )
         
+        return workbook
+    
+    def convert_to_excel_streaming(
+        self,
+        tables_data: Iterable[Dict[str, Any]],
+        output_path: str,
+        apply_formatting: bool = False,
+        auto_adjust_width: bool = False,
+        stats: Optional[ConversionStats] = None
+    ) -> int:
+        """
+        テーブルデータを逐次Excelファイルに書き出す（write-onlyモード）
+        
+        行はワークシートに追記された時点で破棄されるため、入力サイズに
+        関わらずメモリ使用量はほぼ一定になる。
+        
+        Args:
+            tables_data: テーブルデータのイテラブル。'rows' はイテレータでもよい
+                （MarkdownTableParser.iter_tables(fp, stream_rows=True) の結果など）
+            output_path: 出力Excelファイルパス
+            apply_formatting: フォーマット適用するか
+            auto_adjust_width: 列幅自動調整するか（先頭の一部の行から算出）
+            stats: 段階別の計測値の記録先（入力の読み込み・解析を含めて 'build' に記録）
+            
+        Returns:
+            書き出したテーブル数
+        """
+        if stats is None:
+            stats = ConversionStats()
+        
+        # 出力ディレクトリの確認
+        output_dir = os.path.dirname(output_path)
+        if output_dir and not os.path.exists(output_dir):
+            raise Exception(f"Output directory does not exist: {output_dir}")
+        
+        if self.engine == 'native':
+            # nativeエンジンは常に行を逐次書き出す
+            table_count = self._write_native(
+                tables_data,
+                output_path,
+                apply_formatting,
+                auto_adjust_width,
+                stats,
+                width_sample_rows=self._streaming_width_sample_rows()
+            )
+            stats.output_bytes = os.path.getsize(output_path)
+            return table_count
+        
+        workbook = openpyxl.Workbook(write_only=True)
+        first_sheet = None
+        table_count = 0
+        
+        with stats.stage('build'):
+            for i, table_data in enumerate(tables_data):
+                # テーブル数は事前に分からないため、連番で作成して最後に調整する
+                worksheet = workbook.create_sheet(f"Table{i+1}")
+                if first_sheet is None:
+                    first_sheet = worksheet
+                
+                self._stream_worksheet(
+                    worksheet,
+                    table_data,
+                    apply_formatting,
+                    auto_adjust_width,
+                    stats
+                )
+                table_count += 1
+        
+        if table_count == 0:
+            # 空のテーブルリストの場合、空のシートを作成
+            workbook.create_sheet("Sheet1")
+        elif table_count == 1:
+            first_sheet.title = "Sheet1"
+        
         # ファイルに保存
-        workbook.save(output_path)
+        with stats.stage('save'):
+            workbook.save(output_path)
+        stats.output_bytes = os.path.getsize(output_path)
+        
+        return table_count
     
     def _populate_worksheet(
         self, 
         worksheet, 
         table_data: Dict[str, Any],
         apply_formatting: bool,
-        auto_adjust_width: bool
+        auto_adjust_width: bool,
+        stats: ConversionStats
     ) -> None:
         """
         ワークシートにテーブルデータを設定する
@@ -75,86 +294,237 @@ class ExcelConverter:
             table_data: テーブルデータ
             apply_formatting: フォーマット適用するか
             auto_adjust_width: 列幅自動調整するか
+            stats: 段階別の計測値の記録先
         """
         headers = table_data.get('headers', [])
         rows = table_data.get('rows', [])
         alignment = table_data.get('alignment', [])
+        # 型を推定したテーブルは列ごとの表示形式を持つ
+        number_formats = getattr(table_data, 'number_formats', None)
         
-        # ヘッダーを設定
-        for col_idx, header in enumerate(headers, 1):
-            cell = worksheet.cell(row=1, column=col_idx, value=header)
+        body_styles = None
+        if apply_formatting:
+            # 登録済みスタイルを列ごとに用意し、値の書き込みと同時に設定する
+            with stats.stage('format'):
+                header_styles = self.style_engine.column_styles(worksheet, HEADER, alignment, len(headers))
+                body_styles = self.style_engine.column_styles(
+                    worksheet, BODY, alignment, len(headers), number_formats
+                )
+                if self.sparse:
+                    # 空のセルは作成しないため、書式は列・ヘッダー行全体に設定する
+                    self.style_engine.apply_column_defaults(worksheet, alignment, number_formats)
+                    self.style_engine.apply_row_defaults(worksheet, 1, HEADER)
+                else:
+                    self.style_engine.apply_column_defaults(worksheet, alignment)
+        elif number_formats:
+            with stats.stage('format'):
+                body_styles = self.style_engine.column_styles(
+                    worksheet, None, [], len(headers), number_formats
+                )
+        
+        # 列幅はセルの書き込みと同じ走査で算出する
+        # （列単位で保持したテーブルは、書き込み後に列ごとの重複を除いた値から算出する）
+        tracker = ColumnWidthTracker(headers, self.width_sample_rows) if auto_adjust_width else None
+        row_tracker = tracker if not isinstance(rows, RowsView) else None
+        
+        with stats.stage('build'):
+            # 'rows' が列から行を組み立てるビューの場合もあるため、走査は1度にする
+            cell_count = len(headers)
             
-            if apply_formatting:
-                cell.font = self.header_font
-                
-                # アライメント設定
-                if col_idx <= len(alignment):
-                    align_type = alignment[col_idx - 1]
-                    if align_type == 'center':
-                        cell.alignment = Alignment(horizontal='center')
-                    elif align_type == 'right':
-                        cell.alignment = Alignment(horizontal='right')
-                    else:
-                        cell.alignment = Alignment(horizontal='left')
-        
-        # データ行を設定
-        for row_idx, row_data in enumerate(rows, 2):
-            for col_idx, cell_value in enumerate(row_data, 1):
-                # 空文字列の場合はNoneに変換
-                value = cell_value if cell_value != '' else None
-                cell = worksheet.cell(row=row_idx, column=col_idx, value=value)
+            if self.sparse:
+                # 空でない値のセルだけを作成する
+                set_sparse_row = self.style_engine.set_sparse_row
+                set_sparse_row(worksheet, 1, headers, header_styles if apply_formatting else None)
+                for row_idx, row_data in enumerate(rows, 2):
+                    set_sparse_row(worksheet, row_idx, row_data, body_styles)
+                    cell_count += len(row_data)
+                    if row_tracker is not None:
+                        row_tracker.update(row_data)
+            else:
+                styled_cells = self.style_engine.styled_cells
                 
+                # ヘッダーを設定
                 if apply_formatting:
-                    cell.font = self.default_font
-                    
-                    # アライメント設定
-                    if col_idx <= len(alignment):
-                        align_type = alignment[col_idx - 1]
-                        if align_type == 'center':
-                            cell.alignment = Alignment(horizontal='center')
-                        elif align_type == 'right':
-                            cell.alignment = Alignment(horizontal='right')
-                        else:
-                            cell.alignment = Alignment(horizontal='left')
+                    worksheet.append(styled_cells(worksheet, headers, header_styles))
+                else:
+                    worksheet.append(headers)
+                
+                if body_styles is not None:
+                    for row_data in rows:
+                        worksheet.append(styled_cells(worksheet, row_data, body_styles))
+                        cell_count += len(row_data)
+                        if row_tracker is not None:
+                            row_tracker.update(row_data)
+                else:
+                    # データ行を設定（空文字列の場合はNoneに変換）
+                    for row_data in rows:
+                        worksheet.append([value if value != '' else None for value in row_data])
+                        cell_count += len(row_data)
+                        if row_tracker is not None:
+                            row_tracker.update(row_data)
+            
+            stats.rows += len(rows)
+            stats.cells_written += cell_count
         
         # 列幅の自動調整
-        if auto_adjust_width:
-            self._auto_adjust_column_width(worksheet, headers, rows)
+        if tracker is not None:
+            with stats.stage('width'):
+                if row_tracker is None:
+                    tracker.update_columns(rows.columns)
+                self._set_column_widths(worksheet, tracker.widths)
     
-    def _auto_adjust_column_width(
-        self, 
-        worksheet, 
-        headers: List[str], 
-        rows: List[List[str]]
+    def _stream_worksheet(
+        self,
+        worksheet,
+        table_data: Dict[str, Any],
+        apply_formatting: bool,
+        auto_adjust_width: bool,
+        stats: ConversionStats
     ) -> None:
         """
-        列幅を自動調整する
+        write-onlyワークシートにテーブルデータを逐次追記する
         
         Args:
-            worksheet: openpyxlワークシート
-            headers: ヘッダーリスト
-            rows: データ行リスト
+            worksheet: openpyxl write-onlyワークシート
+            table_data: テーブルデータ
+            apply_formatting: フォーマット適用するか
+            auto_adjust_width: 列幅自動調整するか
+            stats: 段階別の計測値の記録先（行数・セル数のみ記録）
         """
-        for col_idx, header in enumerate(headers, 1):
-            column_letter = openpyxl.utils.get_column_letter(col_idx)
+        headers = table_data.get('headers', [])
+        rows = iter(table_data.get('rows', []))
+        alignment = table_data.get('alignment', [])
+        
+        # write-onlyモードでは列幅を行の追記前に確定させる必要がある
+        if auto_adjust_width:
+            sample_rows = list(itertools.islice(rows, self._streaming_width_sample_rows()))
+            tracker = ColumnWidthTracker(headers)
+            tracker.update_rows(sample_rows)
+            self._set_column_widths(worksheet, tracker.widths)
+            rows = itertools.chain(sample_rows, rows)
+        
+        row_count = 0
+        cell_count = len(headers)
+        
+        if not apply_formatting:
+            worksheet.append(headers)
+            for row_data in rows:
+                # 空文字列の場合はNoneに変換
+                worksheet.append([value if value != '' else None for value in row_data])
+                row_count += 1
+                cell_count += len(row_data)
+            stats.rows += row_count
+            stats.cells_written += cell_count
+            return
+        
+        header_styles = self.style_engine.column_styles(worksheet, HEADER, alignment, len(headers))
+        body_styles = self.style_engine.column_styles(worksheet, BODY, alignment, len(headers))
+        self.style_engine.apply_column_defaults(worksheet, alignment)
+        if self.sparse:
+            # 空のセルにはスタイルを設定せず（書き出されない）、ヘッダー行全体に書式を設定する
+            self.style_engine.apply_row_defaults(worksheet, 1, HEADER)
+        styled_cells = self.style_engine.styled_cells
+        
+        worksheet.append(styled_cells(worksheet, headers, header_styles, self.sparse))
+        for row_data in rows:
+            worksheet.append(styled_cells(worksheet, row_data, body_styles, self.sparse))
+            row_count += 1
+            cell_count += len(row_data)
+        stats.rows += row_count
+        stats.cells_written += cell_count
+    
+    def _write_native(
+        self,
+        tables_data: Iterable[Dict[str, Any]],
+        target,
+        apply_formatting: bool,
+        auto_adjust_width: bool,
+        stats: ConversionStats,
+        width_sample_rows: Optional[int] = None
+    ) -> int:
+        """
+        nativeエンジンでテーブルデータを書き出す
+        
+        行はワークシートのXMLとして逐次書き出すため、'rows' はイテレータでもよい。
+        列幅の算出は 'build' に含めて記録する。
+        
+        Args:
+            tables_data: テーブルデータのイテラブル
+            target: 出力ファイルパス、または書き込み先のバイナリストリーム
+            apply_formatting: フォーマット適用するか
+            auto_adjust_width: 列幅自動調整するか
+            stats: 段階別の計測値の記録先
+            width_sample_rows: 列幅の算出に使う先頭行数（Noneの場合は全行）
             
-            # ヘッダーの長さを計算
-            max_length = len(str(header))
+        Returns:
+            書き出したテーブル数
+        """
+        with NativeXlsxWriter(target) as writer:
+            with stats.stage('build'):
+                for i, table_data in enumerate(tables_data):
+                    headers = table_data.get('headers', [])
+                    rows = table_data.get('rows', [])
+                    alignment = table_data.get('alignment', [])
+                    
+                    # 列幅はシートのXMLで行より前に書き出すため、行の書き出し前に算出する
+                    column_widths = None
+                    if auto_adjust_width:
+                        tracker = ColumnWidthTracker(headers, width_sample_rows)
+                        if isinstance(rows, RowsView):
+                            tracker.update_columns(rows.columns)
+                        elif width_sample_rows is None:
+                            tracker.update_rows(rows)
+                        else:
+                            rows = iter(rows)
+                            sample_rows = list(itertools.islice(rows, width_sample_rows))
+                            tracker.update_rows(sample_rows)
+                            rows = itertools.chain(sample_rows, rows)
+                        column_widths = tracker.widths
+                    
+                    # テーブル数は事前に分からないため、連番で作成して最後に調整する
+                    row_count, cell_count = writer.write_sheet(
+                        f"Table{i+1}",
+                        headers,
+                        rows,
+                        alignment,
+                        apply_formatting,
+                        column_widths,
+                        getattr(table_data, 'number_formats', None)
+                    )
+                    stats.rows += row_count
+                    stats.cells_written += cell_count
             
-            # 各行のセル値の長さを計算
-            for row_data in rows:
-                if col_idx <= len(row_data):
-                    cell_value = row_data[col_idx - 1]
-                    if cell_value:
-                        max_length = max(max_length, len(str(cell_value)))
+            table_count = writer.sheet_count
+            if table_count == 1:
+                writer.rename_sheet(0, "Sheet1")
             
-            # 最小幅と最大幅を設定
-            adjusted_width = min(max(max_length + 2, 10), 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+            with stats.stage('save'):
+                writer.close()
+        
+        return table_count
+    
+    def _streaming_width_sample_rows(self) -> int:
+        """ストリーミング変換で列幅の算出に使う先頭行数"""
+        if self.width_sample_rows is None:
+            return self.STREAMING_WIDTH_SAMPLE_ROWS
+        return self.width_sample_rows
+    
+    @staticmethod
+    def _set_column_widths(worksheet, widths: List[int]) -> None:
+        """
+        列幅を設定する
+        
+        Args:
+            worksheet: openpyxlワークシート
+            widths: 列幅のリスト
+        """
+        for col_idx, width in enumerate(widths, 1):
+            column_letter = openpyxl.utils.get_column_letter(col_idx)
+            worksheet.column_dimensions[column_letter].width = width
     
     def convert_from_dataframe(
         self, 
-        dataframes: List[pd.DataFrame], 
+        dataframes: List['pd.DataFrame'], 
         output_path: str,
         sheet_names: Optional[List[str]] = None
     ) -> None:
@@ -166,6 +536,8 @@ class ExcelConverter:
             output_path: 出力Excelファイルパス
             sheet_names: シート名のリスト
         """
+        import pandas as pd
+        
         with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
             for i, df in enumerate(dataframes):
                 sheet_name = sheet_names[i] if sheet_names and i < len(sheet_names) else f'Sheet{i+1}'
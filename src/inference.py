@@ -0,0 +1,192 @@
+import re
+from collections.abc import Mapping
+from typing import Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .table import Table, EMPTY_CELL
+
+
+# 数値の整数部（先頭の0は許可しない。0で始まるコードや郵便番号は文字列のまま残す）
+# Excelの有効桁数（15桁）を超える整数も文字列のまま残す
+_INTEGER = r'(?:0|[1-9]\d{0,2}(?:,\d{3}){1,4}|[1-9]\d{0,14})'
+_DECIMAL = _INTEGER + r'(?:\.\d+)?'
+
+BOOL_PATTERN = r'(?i:true|false)'
+INT_PATTERN = r'[+-]?' + _INTEGER
+FLOAT_PATTERN = r'[+-]?(?:' + _DECIMAL + r'|\.\d+)(?:[eE][+-]?\d+)?'
+PERCENT_PATTERN = r'[+-]?' + _DECIMAL + r'%'
+CURRENCY_PATTERN = r'(?P<sign>[+-]?)(?P<symbol>[¥￥$€£])(?P<amount>' + _DECIMAL + r')'
+DATE_PATTERN = r'\d{4}-\d{2}-\d{2}'
+
+# 小数点以下の桁数の表示の上限
+MAX_DECIMALS = 10
+
+DATE_FORMAT = 'yyyy-mm-dd'
+
+
+def infer_types(tables_data: Iterable[Any]) -> List[Table]:
+    """
+    テーブルごとに列の型を推定し、値を数値・日付・真偽値に変換する
+    
+    Args:
+        tables_data: テーブルデータのイテラブル（Table、または同じ構造の辞書）
+        
+    Returns:
+        型を変換したTableのリスト（number_formats に列ごとの表示形式を持つ）
+    """
+    return [infer_table_types(table_data) for table_data in tables_data]
+
+
+def infer_table_types(table_data: Any) -> Table:
+    """
+    1つのテーブルの列の型を推定し、値を変換したTableを返す
+    
+    列の値は pandas でまとめて判定・変換する。列のすべての空でない値が
+    同じ型として解釈できる場合のみ変換し、それ以外の列は文字列のまま残す。
+    
+    Args:
+        table_data: Table、または {'headers', 'rows', 'alignment'} の辞書
+        
+    Returns:
+        型を変換したTable
+    """
+    if isinstance(table_data, Table):
+        table = table_data
+    elif isinstance(table_data, Mapping):
+        table = Table.from_rows(
+            table_data.get('headers', []),
+            table_data.get('rows', []),
+            table_data.get('alignment', [])
+        )
+    else:
+        raise TypeError(f"Unsupported table data: {type(table_data).__name__}")
+    
+    columns = []
+    number_formats = []
+    for column in table.columns:
+        values, number_format = infer_column(column)
+        columns.append(values)
+        number_formats.append(number_format)
+    
+    return Table(table.headers, columns, table.alignment, table.row_count, number_formats)
+
+
+def infer_column(values: List[Any]) -> Tuple[List[Any], Optional[str]]:
+    """
+    列の型を推定して値を変換する
+    
+    空でない値を重複排除してから判定・変換し、結果を元の位置に展開する。
+    空のセルは空文字列のまま残す。
+    
+    Args:
+        values: 列のセル値のリスト
+        
+    Returns:
+        (変換後の値のリスト, Excelの表示形式) のタプル。
+        型を推定できない列は元の値と None を返す
+    """
+    series = pd.Series(values, dtype=object)
+    present = (series != EMPTY_CELL).to_numpy()
+    if not present.any():
+        return values, None
+    
+    codes, uniques = pd.factorize(series[present])
+    uniques = pd.Series(uniques, dtype=object)
+    if not uniques.map(type).eq(str).all():
+        # 既に変換済みの値を含む列はそのまま残す
+        return values, None
+    
+    inferred = _infer_uniques(uniques)
+    if inferred is None:
+        return values, None
+    
+    typed_uniques, number_format = inferred
+    result = np.full(len(series), EMPTY_CELL, dtype=object)
+    result[present] = _object_array(typed_uniques)[codes]
+    return result.tolist(), number_format
+
+
+def _infer_uniques(uniques: pd.Series) -> Optional[Tuple[List[Any], Optional[str]]]:
+    """重複排除した値の型を判定し、(変換後の値, 表示形式) を返す（判定できない場合はNone）"""
+    text = uniques.str
+    
+    if _all_match(uniques, BOOL_PATTERN):
+        return text.lower().eq('true').tolist(), None
+    
+    if _all_match(uniques, INT_PATTERN):
+        numbers, grouped = _to_numbers(uniques, 'int64')
+        return numbers.tolist(), _number_format(grouped, 0)
+    
+    if _all_match(uniques, FLOAT_PATTERN):
+        numbers, grouped = _to_numbers(uniques, 'float64')
+        if not np.isfinite(numbers).all():
+            # 倍精度の範囲を超える指数（1.0e400 など）は inf になり、Excelに書き出せない
+            return None
+        if text.contains('[eE]').any():
+            return numbers.tolist(), '0.00E+00'
+        return numbers.tolist(), _number_format(grouped, _max_decimals(uniques))
+    
+    if _all_match(uniques, PERCENT_PATTERN):
+        numbers, _ = _to_numbers(text[:-1], 'float64')
+        return (numbers / 100).tolist(), _decimal_format('0', _max_decimals(uniques)) + '%'
+    
+    if _all_match(uniques, CURRENCY_PATTERN):
+        parts = text.extract(CURRENCY_PATTERN)
+        symbols = parts['symbol'].unique()
+        if len(symbols) == 1:
+            numbers, _ = _to_numbers(parts['amount'], 'float64')
+            numbers = numbers.where(parts['sign'] != '-', -numbers)
+            symbol = symbols[0]
+            return numbers.tolist(), _decimal_format(f'"{symbol}"#,##0', _max_decimals(parts['amount']))
+    
+    if _all_match(uniques, DATE_PATTERN):
+        dates = pd.to_datetime(uniques, format='%Y-%m-%d', errors='coerce')
+        if dates.notna().all():
+            return dates.dt.date.tolist(), DATE_FORMAT
+    
+    return None
+
+
+def _to_numbers(values: pd.Series, dtype: str) -> Tuple[pd.Series, bool]:
+    """
+    数値の文字列を数値に変換する
+    
+    Returns:
+        (変換後の値, 桁区切りを含む値があったか) のタプル
+    """
+    grouped = bool(values.str.contains(',', regex=False).any())
+    if grouped:
+        values = values.str.replace(',', '', regex=False)
+    return values.astype(dtype), grouped
+
+
+def _all_match(uniques: pd.Series, pattern: str) -> bool:
+    """すべての値がパターンに一致するか（先頭の値で不一致が分かる列は列全体を照合しない）"""
+    if re.fullmatch(pattern, uniques.iat[0]) is None:
+        return False
+    return bool(uniques.str.fullmatch(pattern).all())
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    """値をPythonオブジェクトのまま保持する配列に変換する"""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _max_decimals(uniques: pd.Series) -> int:
+    """小数点以下の最大桁数"""
+    decimals = uniques.str.extract(r'\.(\d+)', expand=False).str.len().max()
+    return 0 if pd.isna(decimals) else min(int(decimals), MAX_DECIMALS)
+
+
+def _number_format(grouped: bool, decimals: int) -> str:
+    """数値の表示形式（桁区切りを含む値がある場合は桁区切りで表示）"""
+    return _decimal_format('#,##0' if grouped else '0', decimals)
+
+
+def _decimal_format(base: str, decimals: int) -> str:
+    """表示形式に小数点以下の桁数を付ける"""
+    return base + '.' + '0' * decimals if decimals else base
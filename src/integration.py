@@ -1,9 +1,56 @@
-from typing import List, Optional
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
+from contextlib import ExitStack
+import io
 from pathlib import Path
 import os
 from .parser import MarkdownTableParser
 from .converter import ExcelConverter
+from .cache import ConversionCache, HashingReader
+from .manifest import BuildManifest
+from .stats import ConversionStats, STAGES, percentile
+
+
+# process_string() の処理結果で入力ファイル名の代わりに使う表記
+STRING_INPUT = '<string>'
+
+# process_stream() の処理結果で入力ファイル名を指定しない場合の表記
+STREAM_INPUT = '<stream>'
+
+
+def count_lines(markdown_content: str) -> int:
+    """テキストの行数を数える（空文字列は0行）"""
+    if not markdown_content:
+        return 0
+    return markdown_content.count('\n') + 1
+
+
+def is_blank_file(file_path: str, chunk_size: int = 1024 * 1024) -> bool:
+    """
+    ファイルの内容が空白文字のみ（空のファイルを含む）かチェックする
+    
+    process_string() の markdown_content.strip() と同じ判定を、ファイル全体を
+    読み込まずに少しずつ行う。
+    """
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        for chunk in iter(lambda: f.read(chunk_size), ''):
+            if chunk.strip():
+                return False
+    return True
+
+
+class BlankLineTracker:
+    """読み進めた行に空白文字以外を含む行があったかを記録する"""
+    
+    def __init__(self, lines: Iterable[str]):
+        self.lines = lines
+        self.has_content = False
+    
+    def __iter__(self) -> Iterator[str]:
+        for line in self.lines:
+            if not self.has_content and line.strip():
+                self.has_content = True
+            yield line
 
 
 @dataclass
@@ -16,6 +63,11 @@ class ProcessingResult:
     errors: List[str]
     warnings: List[str]
     processing_time_seconds: Optional[float] = None
+    cache_hit: bool = False
+    skipped: bool = False
+    stats: Optional[ConversionStats] = None
+    # 変換前に取得した入力ファイルの状態（mtime_ns, size, sha256。差分変換のマニフェストに記録する）
+    input_state: Optional[Dict[str, Any]] = None
 
 
 class MarkdownToExcelProcessor:
@@ -24,16 +76,73 @@ class MarkdownToExcelProcessor:
     Parser + Converter + エラーハンドリングを組み合わせた高レベルAPI
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[ConversionCache] = None,
+        engine: str = 'openpyxl',
+        width_sample_rows: Optional[int] = None,
+        sparse: bool = False
+    ):
+        """
+        Args:
+            cache: 変換結果キャッシュ（Noneの場合はキャッシュしない）
+            engine: Excel出力エンジン（'openpyxl' または 'native'）
+            width_sample_rows: 列幅の自動調整に使う先頭行数（Noneの場合は全行）
+            sparse: 空のセルを作成せず、書式を列・行全体に設定するモード
+        """
         self.parser = MarkdownTableParser()
-        self.converter = ExcelConverter()
+        self.converter = ExcelConverter(
+            engine=engine,
+            width_sample_rows=width_sample_rows,
+            sparse=sparse
+        )
+        self.cache = cache
+    
+    @staticmethod
+    def cache_options(
+        apply_formatting: bool,
+        auto_adjust_width: bool,
+        streaming: bool = False,
+        engine: str = 'openpyxl',
+        infer_types: bool = False,
+        width_sample_rows: Optional[int] = None,
+        sparse: bool = False
+    ) -> dict:
+        """
+        キャッシュキーに含める変換オプションを作成する
+        
+        Args:
+            apply_formatting: フォーマット適用フラグ
+            auto_adjust_width: 列幅自動調整フラグ
+            streaming: ストリーミング変換フラグ（列幅の算出方法が変わるため含める）
+            engine: Excel出力エンジン
+            infer_types: 列の型推定フラグ
+            width_sample_rows: 列幅の自動調整に使う先頭行数
+            sparse: 空のセルを作成しないモード
+            
+        Returns:
+            dict: 出力内容に影響する変換オプション
+        """
+        return {
+            'apply_formatting': apply_formatting,
+            'auto_adjust_width': auto_adjust_width,
+            'streaming': streaming,
+            'engine': engine,
+            'infer_types': infer_types,
+            'width_sample_rows': width_sample_rows,
+            'sparse': sparse
+        }
     
     def process_file(
         self,
         input_file: str,
         output_file: str,
         apply_formatting: bool = False,
-        auto_adjust_width: bool = False
+        auto_adjust_width: bool = False,
+        streaming: bool = False,
+        use_mmap: bool = False,
+        infer_types: bool = False,
+        record_input_state: bool = False
     ) -> ProcessingResult:
         """
         単一ファイルのエンドツーエンド変換処理
@@ -43,6 +152,14 @@ class MarkdownToExcelProcessor:
             output_file: 出力Excelファイルパス
             apply_formatting: フォーマット適用フラグ
             auto_adjust_width: 列幅自動調整フラグ
+            streaming: ストリーミング変換フラグ（入力を行単位で読み、
+                write-onlyワークブックへ逐次書き出す）
+            use_mmap: 入力ファイルをメモリマップし、テーブルの候補行だけを
+                デコードするフラグ（ファイル全体を文字列として読み込まない）
+            infer_types: 列の型（整数・小数・パーセント・通貨・日付・真偽値）を推定し、
+                数値や日付としてExcelに書き出すフラグ（ストリーミング変換では使用できない）
+            record_input_state: 変換前の入力ファイルの状態を処理結果の input_state に
+                記録するフラグ（差分変換用）
             
         Returns:
             ProcessingResult: 処理結果
@@ -50,14 +167,15 @@ class MarkdownToExcelProcessor:
         errors = []
         warnings = []
         tables_found = 0
+        stats = ConversionStats()
         
         import time
         start_time = time.time()
         
         try:
-            # 入力ファイルの存在確認
-            if not os.path.exists(input_file):
-                errors.append(f"Input file does not exist: {input_file}")
+            # 型推定は列全体の値が必要なため、行を逐次書き出すストリーミング変換とは併用できない
+            if streaming and infer_types:
+                errors.append("Type inference is not supported in streaming mode")
                 return ProcessingResult(
                     success=False,
                     input_file=input_file,
@@ -68,12 +186,9 @@ class MarkdownToExcelProcessor:
                     processing_time_seconds=time.time() - start_time
                 )
             
-            # 出力ディレクトリの作成
-            output_path = Path(output_file)
-            try:
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-            except Exception as e:
-                errors.append(f"Failed to create output directory: {str(e)}")
+            # 入力ファイルの存在確認
+            if not os.path.exists(input_file):
+                errors.append(f"Input file does not exist: {input_file}")
                 return ProcessingResult(
                     success=False,
                     input_file=input_file,
@@ -84,12 +199,12 @@ class MarkdownToExcelProcessor:
                     processing_time_seconds=time.time() - start_time
                 )
             
-            # ファイル読み込み
+            # 出力ディレクトリの作成
+            output_path = Path(output_file)
             try:
-                with open(input_file, 'r', encoding='utf-8') as f:
-                    markdown_content = f.read()
+                output_path.parent.mkdir(parents=True, exist_ok=True)
             except Exception as e:
-                errors.append(f"Failed to read input file: {str(e)}")
+                errors.append(f"Failed to create output directory: {str(e)}")
                 return ProcessingResult(
                     success=False,
                     input_file=input_file,
@@ -100,50 +215,235 @@ class MarkdownToExcelProcessor:
                     processing_time_seconds=time.time() - start_time
                 )
             
-            # 空ファイルの処理
-            if not markdown_content.strip():
-                warnings.append("Input file is empty")
+            # 入力の状態とハッシュは変換前に取得する（変換中に更新された入力を
+            # 最新として記録しないため。ハッシュはキャッシュキーと共有する）
+            input_digest = None
+            input_state = None
+            cache_key = None
+            if self.cache is not None or record_input_state:
+                try:
+                    with stats.stage('read'):
+                        input_digest, input_state = self._input_state(input_file)
+                except Exception as e:
+                    errors.append(f"Failed to read input file: {str(e)}")
+                    return ProcessingResult(
+                        success=False,
+                        input_file=input_file,
+                        output_file=output_file,
+                        tables_found=0,
+                        errors=errors,
+                        warnings=warnings,
+                        processing_time_seconds=time.time() - start_time
+                    )
             
-            # Markdownテーブル解析
-            try:
-                tables_data = self.parser.parse(markdown_content)
-                tables_found = len(tables_data)
+            # キャッシュ確認
+            if self.cache is not None:
+                cache_key = self.cache.make_key(
+                    input_digest,
+                    self.cache_options(
+                        apply_formatting,
+                        auto_adjust_width,
+                        streaming,
+                        self.converter.engine,
+                        infer_types,
+                        self.converter.width_sample_rows,
+                        self.converter.sparse
+                    )
+                )
+                
+                with stats.stage('save'):
+                    cached = self.cache.restore(cache_key, output_file)
+                if cached is not None:
+                    stats.input_bytes = os.path.getsize(input_file)
+                    stats.output_bytes = os.path.getsize(output_file)
+                    return ProcessingResult(
+                        success=True,
+                        input_file=input_file,
+                        output_file=output_file,
+                        tables_found=cached['tables_found'],
+                        errors=errors,
+                        warnings=cached['warnings'],
+                        processing_time_seconds=time.time() - start_time,
+                        cache_hit=True,
+                        stats=stats,
+                        input_state=input_state if record_input_state else None
+                    )
+            
+            if streaming:
+                # ストリーミング変換（読み込み・解析・書き出しを1パスで行う）
+                input_context = ExitStack()
+                try:
+                    input_lines = input_context.enter_context(
+                        self.parser.open_lines(input_file, use_mmap)
+                    )
+                except Exception as e:
+                    errors.append(f"Failed to read input file: {str(e)}")
+                    return ProcessingResult(
+                        success=False,
+                        input_file=input_file,
+                        output_file=output_file,
+                        tables_found=0,
+                        errors=errors,
+                        warnings=warnings,
+                        processing_time_seconds=time.time() - start_time
+                    )
+                
+                stats.input_bytes = os.path.getsize(input_file)
+                
+                try:
+                    with input_context:
+                        tables_found = self.converter.convert_to_excel_streaming(
+                            self.parser.iter_tables(
+                                stats.count_lines(input_lines),
+                                stream_rows=True
+                            ),
+                            output_file,
+                            apply_formatting=apply_formatting,
+                            auto_adjust_width=auto_adjust_width,
+                            stats=stats
+                        )
+                except Exception as e:
+                    errors.append(f"Failed to convert to Excel: {str(e)}")
+                    return ProcessingResult(
+                        success=False,
+                        input_file=input_file,
+                        output_file=output_file,
+                        tables_found=0,
+                        errors=errors,
+                        warnings=warnings,
+                        processing_time_seconds=time.time() - start_time
+                    )
                 
                 if tables_found == 0:
+                    # テーブルがあれば空白文字のみの入力ではないため、見つからなかった場合のみ確認する
+                    if is_blank_file(input_file):
+                        warnings.append("Input file is empty")
                     warnings.append("No tables found in the input file")
+            else:
+                if use_mmap:
+                    # マップしたファイルからテーブルの候補行だけをデコードして解析
+                    input_context = ExitStack()
+                    try:
+                        with stats.stage('read'):
+                            input_lines = input_context.enter_context(
+                                self.parser.open_lines(input_file, use_mmap)
+                            )
+                        stats.input_bytes = os.path.getsize(input_file)
+                    except Exception as e:
+                        errors.append(f"Failed to read input file: {str(e)}")
+                        return ProcessingResult(
+                            success=False,
+                            input_file=input_file,
+                            output_file=output_file,
+                            tables_found=0,
+                            errors=errors,
+                            warnings=warnings,
+                            processing_time_seconds=time.time() - start_time
+                        )
                     
-            except Exception as e:
-                errors.append(f"Failed to parse markdown tables: {str(e)}")
-                return ProcessingResult(
-                    success=False,
-                    input_file=input_file,
-                    output_file=output_file,
-                    tables_found=0,
-                    errors=errors,
-                    warnings=warnings,
-                    processing_time_seconds=time.time() - start_time
-                )
-            
-            # Excel変換
-            try:
-                self.converter.convert_to_excel(
-                    tables_data,
-                    output_file,
-                    apply_formatting=apply_formatting,
-                    auto_adjust_width=auto_adjust_width
-                )
-            except Exception as e:
-                errors.append(f"Failed to convert to Excel: {str(e)}")
-                return ProcessingResult(
-                    success=False,
-                    input_file=input_file,
-                    output_file=output_file,
-                    tables_found=tables_found,
-                    errors=errors,
-                    warnings=warnings,
-                    processing_time_seconds=time.time() - start_time
-                )
-            
+                    try:
+                        with input_context, stats.stage('parse'):
+                            tables_data = list(self.parser.iter_tables(stats.count_lines(input_lines), as_table=True))
+                        tables_found = len(tables_data)
+                        
+                        if tables_found == 0:
+                            # 読み飛ばした行はデコードしないため、空白文字のみかはファイルから確認する
+                            if is_blank_file(input_file):
+                                warnings.append("Input file is empty")
+                            warnings.append("No tables found in the input file")
+                    except Exception as e:
+                        errors.append(f"Failed to parse markdown tables: {str(e)}")
+                        return ProcessingResult(
+                            success=False,
+                            input_file=input_file,
+                            output_file=output_file,
+                            tables_found=0,
+                            errors=errors,
+                            warnings=warnings,
+                            processing_time_seconds=time.time() - start_time
+                        )
+                else:
+                    # ファイル読み込み
+                    try:
+                        with stats.stage('read'):
+                            with open(input_file, 'r', encoding='utf-8') as f:
+                                markdown_content = f.read()
+                        stats.input_bytes = os.path.getsize(input_file)
+                    except Exception as e:
+                        errors.append(f"Failed to read input file: {str(e)}")
+                        return ProcessingResult(
+                            success=False,
+                            input_file=input_file,
+                            output_file=output_file,
+                            tables_found=0,
+                            errors=errors,
+                            warnings=warnings,
+                            processing_time_seconds=time.time() - start_time
+                        )
+                    
+                    # 空ファイルの処理
+                    if not markdown_content.strip():
+                        warnings.append("Input file is empty")
+                    
+                    # Markdownテーブル解析
+                    try:
+                        with stats.stage('parse'):
+                            tables_data = self.parser.parse(markdown_content, as_table=True)
+                        tables_found = len(tables_data)
+                        stats.lines_scanned = count_lines(markdown_content)
+                    
+                        if tables_found == 0:
+                            warnings.append("No tables found in the input file")
+                        
+                    except Exception as e:
+                        errors.append(f"Failed to parse markdown tables: {str(e)}")
+                        return ProcessingResult(
+                            success=False,
+                            input_file=input_file,
+                            output_file=output_file,
+                            tables_found=0,
+                            errors=errors,
+                            warnings=warnings,
+                            processing_time_seconds=time.time() - start_time
+                        )
+                
+                # 列の型推定
+                if infer_types:
+                    try:
+                        tables_data = self._infer_types(tables_data, stats)
+                    except Exception as e:
+                        errors.append(f"Failed to infer column types: {str(e)}")
+                        return ProcessingResult(
+                            success=False,
+                            input_file=input_file,
+                            output_file=output_file,
+                            tables_found=tables_found,
+                            errors=errors,
+                            warnings=warnings,
+                            processing_time_seconds=time.time() - start_time
+                        )
+                
+                # Excel変換
+                try:
+                    self.converter.convert_to_excel(
+                        tables_data,
+                        output_file,
+                        apply_formatting=apply_formatting,
+                        auto_adjust_width=auto_adjust_width,
+                        stats=stats
+                    )
+                except Exception as e:
+                    errors.append(f"Failed to convert to Excel: {str(e)}")
+                    return ProcessingResult(
+                        success=False,
+                        input_file=input_file,
+                        output_file=output_file,
+                        tables_found=tables_found,
+                        errors=errors,
+                        warnings=warnings,
+                        processing_time_seconds=time.time() - start_time
+                    )
+                
             # 出力ファイルの確認
             if not os.path.exists(output_file):
                 errors.append("Excel file was not created successfully")
@@ -157,6 +457,17 @@ class MarkdownToExcelProcessor:
                     processing_time_seconds=time.time() - start_time
                 )
             
+            # キャッシュに保存（失敗しても変換結果には影響させない）
+            if cache_key is not None:
+                try:
+                    self.cache.put(
+                        cache_key,
+                        output_file,
+                        {'tables_found': tables_found, 'warnings': list(warnings)}
+                    )
+                except Exception as e:
+                    warnings.append(f"Failed to store result in cache: {str(e)}")
+            
             # 成功
             return ProcessingResult(
                 success=True,
@@ -165,7 +476,9 @@ class MarkdownToExcelProcessor:
                 tables_found=tables_found,
                 errors=errors,
                 warnings=warnings,
-                processing_time_seconds=time.time() - start_time
+                processing_time_seconds=time.time() - start_time,
+                stats=stats,
+                input_state=input_state if record_input_state else None
             )
             
         except Exception as e:
@@ -180,12 +493,367 @@ class MarkdownToExcelProcessor:
                 processing_time_seconds=time.time() - start_time
             )
     
+    def process_string(
+        self,
+        markdown_content: str,
+        apply_formatting: bool = False,
+        auto_adjust_width: bool = False,
+        infer_types: bool = False
+    ) -> Tuple[Optional[bytes], ProcessingResult]:
+        """
+        Markdown文字列をメモリ上でExcelに変換する（一時ファイルを使用しない）
+        
+        Args:
+            markdown_content: 入力Markdownテキスト
+            apply_formatting: フォーマット適用フラグ
+            auto_adjust_width: 列幅自動調整フラグ
+            infer_types: 列の型推定フラグ
+            
+        Returns:
+            (xlsxファイルのバイト列, 処理結果) のタプル。失敗時のバイト列はNone
+        """
+        errors = []
+        warnings = []
+        tables_found = 0
+        stats = ConversionStats()
+        
+        import time
+        start_time = time.time()
+        
+        if not isinstance(markdown_content, str):
+            errors.append(f"Markdown content must be a string, not {type(markdown_content).__name__}")
+            return None, ProcessingResult(
+                success=False,
+                input_file=STRING_INPUT,
+                output_file='',
+                tables_found=0,
+                errors=errors,
+                warnings=warnings,
+                processing_time_seconds=time.time() - start_time
+            )
+        
+        stats.input_bytes = (
+            len(markdown_content) if markdown_content.isascii()
+            else len(markdown_content.encode('utf-8'))
+        )
+        
+        # キャッシュ確認
+        cache_key = None
+        if self.cache is not None:
+            with stats.stage('read'):
+                cache_key = self.cache.make_key(
+                    self.cache.content_digest(markdown_content.encode('utf-8')),
+                    self.cache_options(
+                        apply_formatting,
+                        auto_adjust_width,
+                        engine=self.converter.engine,
+                        infer_types=infer_types,
+                        width_sample_rows=self.converter.width_sample_rows,
+                        sparse=self.converter.sparse
+                    )
+                )
+                cached = self.cache.read(cache_key)
+            if cached is not None:
+                cached_data, metadata = cached
+                stats.output_bytes = len(cached_data)
+                return cached_data, ProcessingResult(
+                    success=True,
+                    input_file=STRING_INPUT,
+                    output_file='',
+                    tables_found=metadata['tables_found'],
+                    errors=errors,
+                    warnings=metadata['warnings'],
+                    processing_time_seconds=time.time() - start_time,
+                    cache_hit=True,
+                    stats=stats
+                )
+        
+        # 空コンテンツの処理
+        if not markdown_content.strip():
+            warnings.append("Input file is empty")
+        
+        # Markdownテーブル解析
+        try:
+            with stats.stage('parse'):
+                tables_data = self.parser.parse(markdown_content, as_table=True)
+            tables_found = len(tables_data)
+            stats.lines_scanned = count_lines(markdown_content)
+            
+            if tables_found == 0:
+                warnings.append("No tables found in the input file")
+                
+        except Exception as e:
+            errors.append(f"Failed to parse markdown tables: {str(e)}")
+            return None, ProcessingResult(
+                success=False,
+                input_file=STRING_INPUT,
+                output_file='',
+                tables_found=0,
+                errors=errors,
+                warnings=warnings,
+                processing_time_seconds=time.time() - start_time
+            )
+        
+        # 列の型推定
+        if infer_types:
+            try:
+                tables_data = self._infer_types(tables_data, stats)
+            except Exception as e:
+                errors.append(f"Failed to infer column types: {str(e)}")
+                return None, ProcessingResult(
+                    success=False,
+                    input_file=STRING_INPUT,
+                    output_file='',
+                    tables_found=tables_found,
+                    errors=errors,
+                    warnings=warnings,
+                    processing_time_seconds=time.time() - start_time
+                )
+        
+        # Excel変換
+        try:
+            excel_data = self.converter.convert_to_bytes(
+                tables_data,
+                apply_formatting=apply_formatting,
+                auto_adjust_width=auto_adjust_width,
+                stats=stats
+            )
+        except Exception as e:
+            errors.append(f"Failed to convert to Excel: {str(e)}")
+            return None, ProcessingResult(
+                success=False,
+                input_file=STRING_INPUT,
+                output_file='',
+                tables_found=tables_found,
+                errors=errors,
+                warnings=warnings,
+                processing_time_seconds=time.time() - start_time
+            )
+        
+        # キャッシュに保存（失敗しても変換結果には影響させない）
+        if cache_key is not None:
+            try:
+                self.cache.put(
+                    cache_key,
+                    excel_data,
+                    {'tables_found': tables_found, 'warnings': list(warnings)}
+                )
+            except Exception as e:
+                warnings.append(f"Failed to store result in cache: {str(e)}")
+        
+        return excel_data, ProcessingResult(
+            success=True,
+            input_file=STRING_INPUT,
+            output_file='',
+            tables_found=tables_found,
+            errors=errors,
+            warnings=warnings,
+            processing_time_seconds=time.time() - start_time,
+            stats=stats
+        )
+    
+    def process_stream(
+        self,
+        stream: BinaryIO,
+        output_file: Optional[str] = None,
+        apply_formatting: bool = False,
+        auto_adjust_width: bool = False,
+        infer_types: bool = False,
+        input_name: str = STREAM_INPUT
+    ) -> Tuple[Optional[bytes], ProcessingResult]:
+        """
+        バイナリストリームのMarkdownを、入力をファイルに保存せずにExcelに変換する
+        
+        入力はUTF-8として少しずつデコードしながら1行ずつ解析し、入力全体を
+        文字列として保持しない。キャッシュキーに使うハッシュも読み込みながら求める
+        （process_file() と同じ入力・オプションであれば同じキャッシュを使う）。
+        
+        Args:
+            stream: 入力Markdownのバイナリストリーム（アップロードされたファイルなど）
+            output_file: 出力Excelファイルパス（Noneの場合はファイルに保存せず、
+                xlsxのバイト列を返す）
+            apply_formatting: フォーマット適用フラグ
+            auto_adjust_width: 列幅自動調整フラグ
+            infer_types: 列の型推定フラグ
+            input_name: 処理結果の input_file に記録する名前
+            
+        Returns:
+            (xlsxファイルのバイト列, 処理結果) のタプル。output_file を指定した場合と
+            失敗時のバイト列はNone
+        """
+        errors = []
+        warnings = []
+        tables_found = 0
+        stats = ConversionStats()
+        result_output = output_file or ''
+        
+        import time
+        start_time = time.time()
+        
+        # 入力の読み込み・デコード・解析（読み込みながら解析するため 'parse' にまとめて記録）
+        reader = HashingReader(stream)
+        text = io.TextIOWrapper(io.BufferedReader(reader), encoding='utf-8')
+        lines = BlankLineTracker(stats.count_lines(text))
+        try:
+            with stats.stage('parse'):
+                tables_data = list(self.parser.iter_tables(lines, as_table=True))
+            tables_found = len(tables_data)
+        except (OSError, UnicodeDecodeError) as e:
+            errors.append(f"Failed to read input file: {str(e)}")
+            return None, ProcessingResult(
+                success=False,
+                input_file=input_name,
+                output_file=result_output,
+                tables_found=0,
+                errors=errors,
+                warnings=warnings,
+                processing_time_seconds=time.time() - start_time
+            )
+        except Exception as e:
+            errors.append(f"Failed to parse markdown tables: {str(e)}")
+            return None, ProcessingResult(
+                success=False,
+                input_file=input_name,
+                output_file=result_output,
+                tables_found=0,
+                errors=errors,
+                warnings=warnings,
+                processing_time_seconds=time.time() - start_time
+            )
+        finally:
+            # 元のストリームは呼び出し側が閉じる
+            text.detach()
+        
+        stats.input_bytes = reader.bytes_read
+        
+        # キャッシュ確認（ハッシュは入力を読み終えるまで確定しないため、解析の後に行う）
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(
+                reader.hexdigest(),
+                self.cache_options(
+                    apply_formatting,
+                    auto_adjust_width,
+                    engine=self.converter.engine,
+                    infer_types=infer_types,
+                    width_sample_rows=self.converter.width_sample_rows,
+                    sparse=self.converter.sparse
+                )
+            )
+            cached_data = None
+            with stats.stage('save'):
+                if output_file:
+                    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+                    metadata = self.cache.restore(cache_key, output_file)
+                    if metadata is not None:
+                        stats.output_bytes = os.path.getsize(output_file)
+                else:
+                    metadata = None
+                    cached = self.cache.read(cache_key)
+                    if cached is not None:
+                        cached_data, metadata = cached
+                        stats.output_bytes = len(cached_data)
+            if metadata is not None:
+                return cached_data, ProcessingResult(
+                    success=True,
+                    input_file=input_name,
+                    output_file=result_output,
+                    tables_found=metadata['tables_found'],
+                    errors=errors,
+                    warnings=metadata['warnings'],
+                    processing_time_seconds=time.time() - start_time,
+                    cache_hit=True,
+                    stats=stats
+                )
+        
+        # process_file() / process_string() と同じく空白文字のみの入力も空として扱う
+        # （キャッシュを共有するため、警告も同じにする）
+        if not lines.has_content:
+            warnings.append("Input file is empty")
+        if tables_found == 0:
+            warnings.append("No tables found in the input file")
+        
+        # 列の型推定
+        if infer_types:
+            try:
+                tables_data = self._infer_types(tables_data, stats)
+            except Exception as e:
+                errors.append(f"Failed to infer column types: {str(e)}")
+                return None, ProcessingResult(
+                    success=False,
+                    input_file=input_name,
+                    output_file=result_output,
+                    tables_found=tables_found,
+                    errors=errors,
+                    warnings=warnings,
+                    processing_time_seconds=time.time() - start_time
+                )
+        
+        # Excel変換
+        excel_data = None
+        try:
+            if output_file:
+                Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+                self.converter.convert_to_excel(
+                    tables_data,
+                    output_file,
+                    apply_formatting=apply_formatting,
+                    auto_adjust_width=auto_adjust_width,
+                    stats=stats
+                )
+            else:
+                excel_data = self.converter.convert_to_bytes(
+                    tables_data,
+                    apply_formatting=apply_formatting,
+                    auto_adjust_width=auto_adjust_width,
+                    stats=stats
+                )
+        except Exception as e:
+            errors.append(f"Failed to convert to Excel: {str(e)}")
+            return None, ProcessingResult(
+                success=False,
+                input_file=input_name,
+                output_file=result_output,
+                tables_found=tables_found,
+                errors=errors,
+                warnings=warnings,
+                processing_time_seconds=time.time() - start_time
+            )
+        
+        # キャッシュに保存（失敗しても変換結果には影響させない）
+        if cache_key is not None:
+            try:
+                self.cache.put(
+                    cache_key,
+                    excel_data if excel_data is not None else output_file,
+                    {'tables_found': tables_found, 'warnings': list(warnings)}
+                )
+            except Exception as e:
+                warnings.append(f"Failed to store result in cache: {str(e)}")
+        
+        return excel_data, ProcessingResult(
+            success=True,
+            input_file=input_name,
+            output_file=result_output,
+            tables_found=tables_found,
+            errors=errors,
+            warnings=warnings,
+            processing_time_seconds=time.time() - start_time,
+            stats=stats
+        )
+    
     def process_directory(
         self,
         input_dir: str,
         output_dir: str,
         apply_formatting: bool = False,
-        auto_adjust_width: bool = False
+        auto_adjust_width: bool = False,
+        streaming: bool = False,
+        max_workers: int = 1,
+        incremental: bool = False,
+        use_mmap: bool = False,
+        infer_types: bool = False,
+        progress_callback: Optional[Callable[[ProcessingResult], None]] = None
     ) -> List[ProcessingResult]:
         """
         ディレクトリ内のMarkdownファイルを一括変換
@@ -195,6 +863,14 @@ class MarkdownToExcelProcessor:
             output_dir: 出力ディレクトリパス
             apply_formatting: フォーマット適用フラグ
             auto_adjust_width: 列幅自動調整フラグ
+            streaming: ストリーミング変換フラグ
+            max_workers: 並列実行するプロセス数（1の場合は逐次処理）
+            incremental: 差分変換フラグ（出力ディレクトリのマニフェストと比較し、
+                出力が最新のファイルは変換せず skipped=True の結果を返す）
+            use_mmap: 入力ファイルをメモリマップして読み込むフラグ
+            infer_types: 列の型推定フラグ
+            progress_callback: ファイルごとの処理結果を受け取るコールバック
+                （ファイルの処理が終わるたびに呼び出す。呼び出し順は入力順とは限らない）
             
         Returns:
             List[ProcessingResult]: 各ファイルの処理結果リスト
@@ -240,20 +916,256 @@ class MarkdownToExcelProcessor:
                 warnings=["No Markdown files found in input directory"]
             )]
         
-        # 各ファイルを変換
-        for md_file in markdown_files:
-            output_file = output_path / f"{md_file.stem}.xlsx"
+        jobs = [
+            (str(md_file), str(output_path / f"{md_file.stem}.xlsx"))
+            for md_file in markdown_files
+        ]
+        
+        # 差分変換: 出力が最新のファイルは変換しない
+        manifest = None
+        options = self.cache_options(
+            apply_formatting,
+            auto_adjust_width,
+            streaming,
+            self.converter.engine,
+            infer_types,
+            self.converter.width_sample_rows,
+            self.converter.sparse
+        )
+        skipped_results = {}
+        pending_jobs = jobs
+        
+        if incremental:
+            manifest = BuildManifest.for_directory(output_dir)
+            pending_jobs = []
+            for input_file, output_file in jobs:
+                entry = manifest.lookup(input_file, output_file, options)
+                if entry is None:
+                    pending_jobs.append((input_file, output_file))
+                    continue
+                
+                skipped_results[input_file] = ProcessingResult(
+                    success=True,
+                    input_file=input_file,
+                    output_file=output_file,
+                    tables_found=entry['tables_found'],
+                    errors=[],
+                    warnings=list(entry['warnings']),
+                    skipped=True
+                )
+        
+        if progress_callback is not None:
+            for skipped_result in skipped_results.values():
+                progress_callback(skipped_result)
+        
+        if max_workers > 1 and len(pending_jobs) > 1:
+            converted_results = self._process_files_parallel(
+                pending_jobs,
+                max_workers,
+                apply_formatting,
+                auto_adjust_width,
+                streaming,
+                use_mmap,
+                infer_types,
+                progress_callback,
+                manifest is not None
+            )
+        else:
+            # 各ファイルを変換
+            converted_results = []
+            for input_file, output_file in pending_jobs:
+                result = self.process_file(
+                    input_file,
+                    output_file,
+                    apply_formatting,
+                    auto_adjust_width,
+                    streaming,
+                    use_mmap,
+                    infer_types,
+                    manifest is not None
+                )
+                converted_results.append(result)
+                if progress_callback is not None:
+                    progress_callback(result)
+        
+        if manifest is not None:
+            self._update_manifest(manifest, converted_results, options)
+        
+        # 入力順に並べる
+        converted_iter = iter(converted_results)
+        for input_file, _ in jobs:
+            if input_file in skipped_results:
+                results.append(skipped_results[input_file])
+            else:
+                results.append(next(converted_iter))
+        
+        return results
+    
+    @staticmethod
+    def _input_state(input_file: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        入力ファイルのハッシュと状態を取得する
+        
+        Returns:
+            (内容のハッシュ, 状態の辞書) のタプル。ハッシュの計算中にファイルが
+            更新された場合、状態はNone（マニフェストに記録せず、次回も変換する）
+        """
+        before = os.stat(input_file)
+        digest = ConversionCache.file_digest(input_file)
+        after = os.stat(input_file)
+        
+        if (before.st_mtime_ns, before.st_size) != (after.st_mtime_ns, after.st_size):
+            return digest, None
+        return digest, {'mtime_ns': before.st_mtime_ns, 'size': before.st_size, 'sha256': digest}
+    
+    @staticmethod
+    def _infer_types(tables_data: List, stats: ConversionStats) -> List:
+        """テーブルごとに列の型を推定する（所要時間は 'infer' に記録）"""
+        # pandasは読み込みに時間がかかるため、型推定を行う場合のみ読み込む
+        from .inference import infer_types
+        
+        with stats.stage('infer'):
+            return infer_types(tables_data)
+    
+    def _update_manifest(
+        self,
+        manifest: BuildManifest,
+        results: List[ProcessingResult],
+        options: dict
+    ) -> None:
+        """
+        変換結果をマニフェストに反映して保存する
+        
+        Args:
+            manifest: 差分変換用マニフェスト
+            results: 今回変換したファイルの処理結果リスト
+            options: 変換オプション
+        """
+        try:
+            for result in results:
+                if result.success and result.input_state is not None:
+                    manifest.record(
+                        result.input_file,
+                        result.output_file,
+                        options,
+                        result.tables_found,
+                        result.warnings,
+                        result.input_state
+                    )
+                else:
+                    # 失敗したファイルと、変換中に更新されたファイルは次回必ず再変換する
+                    manifest.discard(result.input_file)
+            manifest.save()
+        except Exception as e:
+            # マニフェストの更新失敗は変換結果には影響させない
+            for result in results:
+                result.warnings.append(f"Failed to update build manifest: {str(e)}")
+    
+    def _process_files_parallel(
+        self,
+        jobs: List[Tuple[str, str]],
+        max_workers: int,
+        apply_formatting: bool,
+        auto_adjust_width: bool,
+        streaming: bool,
+        use_mmap: bool = False,
+        infer_types: bool = False,
+        progress_callback: Optional[Callable[[ProcessingResult], None]] = None,
+        record_input_state: bool = False
+    ) -> List[ProcessingResult]:
+        """
+        複数ファイルをプロセスプールで並列変換する
+        
+        Args:
+            jobs: (入力ファイルパス, 出力ファイルパス) のリスト
+            max_workers: 並列実行するプロセス数
+            apply_formatting: フォーマット適用フラグ
+            auto_adjust_width: 列幅自動調整フラグ
+            streaming: ストリーミング変換フラグ
+            use_mmap: 入力ファイルをメモリマップして読み込むフラグ
+            infer_types: 列の型推定フラグ
+            progress_callback: ファイルごとの処理結果を受け取るコールバック（完了順に呼び出す）
+            record_input_state: 変換前の入力ファイルの状態を処理結果に記録するフラグ
             
-            result = self.process_file(
-                str(md_file),
-                str(output_file),
+        Returns:
+            List[ProcessingResult]: 入力順に並んだ処理結果リスト
+        """
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        from concurrent.futures.process import BrokenProcessPool
+        
+        results = {}
+        
+        def record(input_file: str, result: ProcessingResult) -> None:
+            results[input_file] = result
+            if progress_callback is not None:
+                progress_callback(result)
+        
+        def worker_failure(input_file: str, output_file: str, error: Exception) -> ProcessingResult:
+            return ProcessingResult(
+                success=False,
+                input_file=input_file,
+                output_file=output_file,
+                tables_found=0,
+                errors=[f"Worker process failed: {str(error)}"],
+                warnings=[]
+            )
+        
+        def submit(executor, input_file: str, output_file: str):
+            return executor.submit(
+                self.process_file,
+                input_file,
+                output_file,
                 apply_formatting,
-                auto_adjust_width
+                auto_adjust_width,
+                streaming,
+                use_mmap,
+                infer_types,
+                record_input_state
             )
+        
+        # ワーカープロセスが異常終了するとプール全体が使えなくなり、
+        # 他のワーカーで実行中・実行待ちのファイルも失敗する
+        interrupted = []
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                submit(executor, input_file, output_file): (input_file, output_file)
+                for input_file, output_file in jobs
+            }
             
-            results.append(result)
+            for future in as_completed(futures):
+                input_file, output_file = futures[future]
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    interrupted.append((input_file, output_file))
+                    continue
+                except Exception as e:
+                    result = worker_failure(input_file, output_file, e)
+                record(input_file, result)
         
-        return results
+        # 巻き込まれたファイルは1件ずつ別のプロセスで再実行し、
+        # 再び異常終了したファイルだけを失敗として扱う
+        order = {input_file: index for index, (input_file, _) in enumerate(jobs)}
+        interrupted.sort(key=lambda job: order[job[0]])
+        executor = None
+        try:
+            for input_file, output_file in interrupted:
+                if executor is None:
+                    executor = ProcessPoolExecutor(max_workers=1)
+                try:
+                    result = submit(executor, input_file, output_file).result()
+                except BrokenProcessPool as e:
+                    result = worker_failure(input_file, output_file, e)
+                    executor.shutdown()
+                    executor = None
+                except Exception as e:
+                    result = worker_failure(input_file, output_file, e)
+                record(input_file, result)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        return [results[input_file] for input_file, _ in jobs]
     
     def validate_input(self, file_path: str) -> List[str]:
         """
@@ -302,26 +1214,37 @@ class MarkdownToExcelProcessor:
             results: 処理結果のリスト
             
         Returns:
-            dict: 統計情報
+            dict: 統計情報。処理時間と段階別の所要時間は合計に加えて
+                p50/p95/p99 を含む
         """
         if not results:
             return {
                 'total_files': 0,
                 'successful_files': 0,
                 'failed_files': 0,
+                'skipped_files': 0,
                 'total_tables': 0,
                 'total_processing_time': 0.0,
-                'average_processing_time': 0.0
+                'average_processing_time': 0.0,
+                'processing_time_percentiles': self._percentiles([]),
+                'stages': {},
+                'total_input_bytes': 0,
+                'total_lines_scanned': 0,
+                'total_rows': 0,
+                'total_cells_written': 0,
+                'total_output_bytes': 0
             }
         
-        successful_results = [r for r in results if r.success]
+        # 差分変換でスキップしたファイルは変換したファイルとは別に集計する
+        skipped_results = [r for r in results if r.skipped]
+        successful_results = [r for r in results if r.success and not r.skipped]
         failed_results = [r for r in results if not r.success]
         
         total_tables = sum(r.tables_found for r in successful_results)
         
         processing_times = [
             r.processing_time_seconds for r in results 
-            if r.processing_time_seconds is not None
+            if r.processing_time_seconds is not None and not r.skipped
         ]
         total_processing_time = sum(processing_times)
         average_processing_time = (
@@ -329,11 +1252,37 @@ class MarkdownToExcelProcessor:
             if processing_times else 0.0
         )
         
+        # 段階別の所要時間と処理量
+        measured = [r.stats for r in results if r.stats is not None and not r.skipped]
+        stages = {}
+        for stage in STAGES:
+            stage_times = [s.stage_seconds[stage] for s in measured if stage in s.stage_seconds]
+            if stage_times:
+                stages[stage] = {'total': sum(stage_times), **self._percentiles(stage_times)}
+        
         return {
             'total_files': len(results),
             'successful_files': len(successful_results),
             'failed_files': len(failed_results),
+            'skipped_files': len(skipped_results),
             'total_tables': total_tables,
             'total_processing_time': total_processing_time,
-            'average_processing_time': average_processing_time
+            'average_processing_time': average_processing_time,
+            'processing_time_percentiles': self._percentiles(processing_times),
+            'stages': stages,
+            'total_input_bytes': sum(s.input_bytes for s in measured),
+            'total_lines_scanned': sum(s.lines_scanned for s in measured),
+            'total_rows': sum(s.rows for s in measured),
+            'total_cells_written': sum(s.cells_written for s in measured),
+            'total_output_bytes': sum(s.output_bytes for s in measured)
+        }
+    
+    @staticmethod
+    def _percentiles(values: List[float]) -> dict:
+        """p50/p95/p99 を計算する"""
+        sorted_values = sorted(values)
+        return {
+            'p50': percentile(sorted_values, 50),
+            'p95': percentile(sorted_values, 95),
+            'p99': percentile(sorted_values, 99)
         }
\ No newline at end of file
@@ -0,0 +1,152 @@
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from . import __version__
+from .cache import ConversionCache
+
+
+class BuildManifest:
+    """
+    一括変換の入出力状態を記録するマニフェスト
+
+    入力ファイルごとに更新時刻・サイズ・内容のハッシュ、変換オプション、
+    出力ファイルの状態を保存し、次回の変換時に出力が最新かどうかを判定する。
+    更新時刻だけが変わった場合は内容のハッシュで比較する。
+    """
+
+    FILENAME = '.md2excel-manifest.json'
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: マニフェストファイルパス
+        """
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self.load()
+
+    @classmethod
+    def for_directory(cls, output_dir: str) -> 'BuildManifest':
+        """出力ディレクトリに置かれるマニフェストを開く"""
+        return cls(os.path.join(output_dir, cls.FILENAME))
+
+    def load(self) -> None:
+        """マニフェストを読み込む（存在しない・壊れている場合は空として扱う）"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get('version') == __version__:
+            self.entries = data.get('entries', {})
+
+    def save(self) -> None:
+        """変更があればマニフェストを保存する"""
+        if not self._dirty:
+            return
+
+        data = {'version': __version__, 'entries': self.entries}
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._dirty = False
+
+    def lookup(
+        self,
+        input_file: str,
+        output_file: str,
+        options: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        出力ファイルが最新であればそのエントリを返す
+
+        Args:
+            input_file: 入力Markdownファイルパス
+            output_file: 出力Excelファイルパス
+            options: 変換オプション
+
+        Returns:
+            最新の場合はエントリ（tables_found, warnings を含む）、それ以外はNone
+        """
+        entry = self.entries.get(self._key(input_file))
+        if entry is None or entry['options'] != options or entry['output'] != output_file:
+            return None
+
+        try:
+            input_stat = os.stat(input_file)
+            output_stat = os.stat(output_file)
+        except OSError:
+            return None
+
+        # 出力ファイルが差し替えられていないか確認
+        if (output_stat.st_size != entry['output_size'] or
+                output_stat.st_mtime_ns != entry['output_mtime_ns']):
+            return None
+
+        if input_stat.st_size != entry['size']:
+            return None
+
+        if input_stat.st_mtime_ns != entry['mtime_ns']:
+            # 更新時刻のみ変わった場合は内容で比較する
+            if ConversionCache.file_digest(input_file) != entry['sha256']:
+                return None
+            entry['mtime_ns'] = input_stat.st_mtime_ns
+            self._dirty = True
+
+        return entry
+
+    def record(
+        self,
+        input_file: str,
+        output_file: str,
+        options: Dict[str, Any],
+        tables_found: int,
+        warnings: List[str],
+        input_state: Dict[str, Any]
+    ) -> None:
+        """
+        変換に成功したファイルの状態を記録する
+
+        Args:
+            input_file: 入力Markdownファイルパス
+            output_file: 出力Excelファイルパス
+            options: 変換オプション
+            tables_found: 検出したテーブル数
+            warnings: 変換時の警告
+            input_state: 変換前に取得した入力ファイルの状態（mtime_ns, size, sha256）。
+                変換後に取得すると、変換中の更新を変換済みとして記録してしまう
+        """
+        output_stat = os.stat(output_file)
+
+        self.entries[self._key(input_file)] = {
+            'mtime_ns': input_state['mtime_ns'],
+            'size': input_state['size'],
+            'sha256': input_state['sha256'],
+            'options': options,
+            'output': output_file,
+            'output_mtime_ns': output_stat.st_mtime_ns,
+            'output_size': output_stat.st_size,
+            'tables_found': tables_found,
+            'warnings': list(warnings)
+        }
+        self._dirty = True
+
+    def discard(self, input_file: str) -> None:
+        """ファイルの記録を削除する（変換失敗時など）"""
+        if self.entries.pop(self._key(input_file), None) is not None:
+            self._dirty = True
+
+    @staticmethod
+    def _key(input_file: str) -> str:
+        """エントリのキー（入力ファイルの絶対パス）"""
+        return os.path.abspath(input_file)
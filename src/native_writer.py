@@ -0,0 +1,397 @@
+import datetime
+import re
+import zipfile
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
+
+
+# SpreadsheetMLの名前空間
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PACKAGE_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+CONTENT_TYPES_NS = 'http://schemas.openxmlformats.org/package/2006/content-types'
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# XMLに書き込めない制御文字（openpyxlと同じ範囲）
+ILLEGAL_CHARACTERS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# セルスタイル（cellXfs）のインデックス
+# 0: 既定、1〜4: ヘッダー、5〜8: データ行（アライメント指定なし/left/center/right の順）
+# 表示形式を指定したスタイルは9以降に、使われた組み合わせだけを追加する
+ALIGNMENT_OFFSETS = {None: 0, 'left': 1, 'center': 2, 'right': 3}
+HEADER_STYLE_BASE = 1
+BODY_STYLE_BASE = 5
+
+# 既定のスタイルの (フォントID, アライメント) の組
+BASE_STYLES = [(0, None)] + [
+    (font_id, horizontal)
+    for font_id in (1, 2)
+    for horizontal in ALIGNMENT_OFFSETS
+]
+
+# ユーザー定義の表示形式に割り当てるIDの開始値（163以下は組み込みの表示形式）
+CUSTOM_NUMBER_FORMAT_ID = 164
+
+# Excelの日付シリアル値の基準日（1900年3月1日以降の日付で正しい値になる）
+EXCEL_EPOCH = datetime.datetime(1899, 12, 30)
+
+# ワークシートXMLを書き出す単位（行数）
+ROWS_PER_WRITE = 1000
+
+
+def column_letter(col_idx: int) -> str:
+    """列番号（1始まり）を列名（A, B, ..., AA, ...）に変換する"""
+    letters = ''
+    while col_idx > 0:
+        col_idx, remainder = divmod(col_idx - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def escape_xml(text: str, quote: bool = False) -> str:
+    """XMLの特殊文字をエスケープする"""
+    text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    if quote:
+        text = text.replace('"', '&quot;')
+    return text
+
+
+class NativeXlsxWriter:
+    """
+    openpyxlを使わずにxlsxファイルを書き出すクラス
+    
+    セルオブジェクトを作らず、ワークシートのXMLを行ごとに組み立てて
+    zipファイルへ直接書き込む。文字列はopenpyxlの書き込み専用モードと同様に
+    セルへ直接（インライン文字列として）書き込み、共有文字列テーブルは作らない
+    （行数・文字列の種類が増えてもメモリ使用量が増えないようにするため）。
+    対応するのは値・太字のヘッダー・アライメント・列ごとの表示形式・列幅のみ。
+    """
+    
+    def __init__(self, target: Union[str, BinaryIO]):
+        """
+        Args:
+            target: 出力ファイルパス、または書き込み先のバイナリストリーム
+        """
+        self._zip = zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._sheet_titles: List[str] = []
+        # 表示形式 -> numFmtId、(既定のスタイル, numFmtId) -> cellXfsのインデックス
+        self._number_formats: Dict[str, int] = {}
+        self._number_format_styles: Dict[Tuple[int, int], int] = {}
+        self._closed = False
+    
+    def __enter__(self) -> 'NativeXlsxWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # 書きかけの内容は保存せずにzipだけ閉じる
+            self._closed = True
+            self._zip.close()
+    
+    @property
+    def sheet_count(self) -> int:
+        """書き出したシート数"""
+        return len(self._sheet_titles)
+    
+    def rename_sheet(self, index: int, title: str) -> None:
+        """シート名を変更する（シート名はclose()時に書き出すため、書き込み後でも変更できる）"""
+        self._sheet_titles[index] = title
+    
+    def write_sheet(
+        self,
+        title: str,
+        headers: List[str],
+        rows: Iterable[List[Any]],
+        alignment: Optional[List[str]] = None,
+        apply_formatting: bool = False,
+        column_widths: Optional[List[float]] = None,
+        number_formats: Optional[List[Optional[str]]] = None
+    ) -> Tuple[int, int]:
+        """
+        ワークシートを1枚書き出す
+        
+        Args:
+            title: シート名
+            headers: ヘッダーリスト（空の場合は空のシートになる）
+            rows: データ行のイテラブル（逐次書き出すためイテレータでもよい）
+            alignment: アライメント情報
+            apply_formatting: フォーマット（太字のヘッダー・アライメント）を適用するか
+            column_widths: 列幅のリスト（Noneの場合は既定の幅）
+            number_formats: データ行の列ごとの表示形式（Noneの要素は既定の表示形式）
+            
+        Returns:
+            (書き出したデータ行数, 書き出したセル数) のタプル
+        """
+        self._sheet_titles.append(title)
+        alignment = alignment or []
+        
+        # 列ごとのセル参照の接頭辞とスタイル属性を事前に作成
+        column_count = max(len(headers), len(alignment), len(column_widths or []))
+        letters = [column_letter(col_idx) for col_idx in range(1, column_count + 1)]
+        if apply_formatting:
+            header_styles, body_styles = (
+                [
+                    base + ALIGNMENT_OFFSETS[self._horizontal(alignment, col_idx)]
+                    for col_idx in range(column_count)
+                ]
+                for base in (HEADER_STYLE_BASE, BODY_STYLE_BASE)
+            )
+        else:
+            header_styles = body_styles = [0] * column_count
+        if number_formats:
+            body_styles = [
+                self._number_format_style(
+                    body_styles[col_idx],
+                    number_formats[col_idx] if col_idx < len(number_formats) else None
+                )
+                for col_idx in range(column_count)
+            ]
+        header_styles = [f' s="{style}"' if style else '' for style in header_styles]
+        body_styles = [f' s="{style}"' if style else '' for style in body_styles]
+        
+        # 書き出すまでサイズが分からないため、2GiBを超えてもよいようにZIP64のヘッダーで書き込む
+        sheet_file = self._zip.open(
+            f'xl/worksheets/sheet{self.sheet_count}.xml', 'w', force_zip64=True
+        )
+        try:
+            sheet_file.write(
+                (XML_DECLARATION + f'<worksheet xmlns="{MAIN_NS}">').encode('utf-8')
+            )
+            cols = self._cols_xml(column_widths, alignment if apply_formatting else None)
+            sheet_file.write((cols + '<sheetData>').encode('utf-8'))
+            
+            row_count = 0
+            cell_count = 0
+            if headers:
+                chunk = [self._row_xml(1, headers, letters, header_styles)]
+                cell_count += len(headers)
+                for row_idx, row_data in enumerate(rows, 2):
+                    chunk.append(self._row_xml(row_idx, row_data, letters, body_styles))
+                    row_count += 1
+                    cell_count += len(row_data)
+                    if len(chunk) >= ROWS_PER_WRITE:
+                        sheet_file.write(''.join(chunk).encode('utf-8'))
+                        chunk = []
+                sheet_file.write(''.join(chunk).encode('utf-8'))
+            
+            sheet_file.write(b'</sheetData></worksheet>')
+        finally:
+            sheet_file.close()
+        
+        return row_count, cell_count
+    
+    def close(self) -> None:
+        """スタイル・ブック情報を書き出してファイルを閉じる"""
+        if self._closed:
+            return
+        self._closed = True
+        
+        try:
+            if not self._sheet_titles:
+                self.write_sheet('Sheet1', [], [])
+            
+            sheet_count = self.sheet_count
+            self._zip.writestr('[Content_Types].xml', self._content_types_xml(sheet_count))
+            self._zip.writestr(
+                '_rels/.rels',
+                XML_DECLARATION +
+                f'<Relationships xmlns="{PACKAGE_REL_NS}">'
+                f'<Relationship Id="rId1" Type="{REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+                '</Relationships>'
+            )
+            self._zip.writestr('xl/workbook.xml', self._workbook_xml())
+            self._zip.writestr('xl/_rels/workbook.xml.rels', self._workbook_rels_xml(sheet_count))
+            self._zip.writestr('xl/styles.xml', self._styles_xml())
+        finally:
+            self._zip.close()
+    
+    def _row_xml(
+        self,
+        row_idx: int,
+        values: List[Any],
+        letters: List[str],
+        styles: List[str]
+    ) -> str:
+        """1行分のXMLを作成する（空のセルは書き出さない）"""
+        row_number = str(row_idx)
+        column_count = len(letters)
+        cells = []
+        
+        for col_idx, value in enumerate(values):
+            if value is None or value == '':
+                continue
+            if col_idx < column_count:
+                reference = letters[col_idx] + row_number
+                style = styles[col_idx]
+            else:
+                reference = column_letter(col_idx + 1) + row_number
+                style = ''
+            
+            if isinstance(value, bool):
+                cells.append(f'<c r="{reference}"{style} t="b"><v>{int(value)}</v></c>')
+            elif isinstance(value, (int, float)):
+                cells.append(f'<c r="{reference}"{style}><v>{value!r}</v></c>')
+            elif isinstance(value, datetime.date):
+                cells.append(f'<c r="{reference}"{style}><v>{self._date_serial(value)!r}</v></c>')
+            else:
+                text = value if isinstance(value, str) else str(value)
+                cells.append(f'<c r="{reference}"{style} t="inlineStr">{self._inline_string_xml(text)}</c>')
+        
+        return f'<row r="{row_number}">{"".join(cells)}</row>'
+    
+    def _number_format_style(self, base: int, number_format: Optional[str]) -> int:
+        """既定のスタイルに表示形式を加えたスタイルのインデックスを取得する"""
+        if number_format is None:
+            return base
+        format_id = self._number_formats.get(number_format)
+        if format_id is None:
+            format_id = self._number_formats[number_format] = (
+                CUSTOM_NUMBER_FORMAT_ID + len(self._number_formats)
+            )
+        index = self._number_format_styles.get((base, format_id))
+        if index is None:
+            index = self._number_format_styles[(base, format_id)] = (
+                len(BASE_STYLES) + len(self._number_format_styles)
+            )
+        return index
+    
+    @staticmethod
+    def _date_serial(value: datetime.date) -> Union[int, float]:
+        """日付・日時をExcelの日付シリアル値に変換する"""
+        if isinstance(value, datetime.datetime):
+            return (value.replace(tzinfo=None) - EXCEL_EPOCH).total_seconds() / 86400
+        return (value - EXCEL_EPOCH.date()).days
+    
+    @staticmethod
+    def _horizontal(alignment: List[str], col_idx: int) -> Optional[str]:
+        """列のアライメント（指定外の値は左寄せ、指定のない列はNone）"""
+        if col_idx >= len(alignment):
+            return None
+        align_type = alignment[col_idx]
+        return align_type if align_type in ('center', 'right') else 'left'
+    
+    def _cols_xml(self, column_widths: Optional[List[float]], alignment: Optional[List[str]]) -> str:
+        """列幅と列全体のスタイルのXMLを作成する"""
+        column_count = max(len(column_widths or []), len(alignment or []))
+        cols = []
+        for col_idx in range(column_count):
+            attributes = f'min="{col_idx + 1}" max="{col_idx + 1}"'
+            if column_widths and col_idx < len(column_widths):
+                attributes += f' width="{column_widths[col_idx]}" customWidth="1"'
+            if alignment and col_idx < len(alignment):
+                style = BODY_STYLE_BASE + ALIGNMENT_OFFSETS[self._horizontal(alignment, col_idx)]
+                attributes += f' style="{style}"'
+            cols.append(f'<col {attributes}/>')
+        return f'<cols>{"".join(cols)}</cols>' if cols else ''
+    
+    def _styles_xml(self) -> str:
+        """スタイル（フォント・表示形式・cellXfs）のXMLを作成する"""
+        styles = [(font_id, horizontal, 0) for font_id, horizontal in BASE_STYLES]
+        styles.extend(
+            BASE_STYLES[base] + (format_id,)
+            for base, format_id in self._number_format_styles
+        )
+        
+        xfs = []
+        for font_id, horizontal, format_id in styles:
+            attributes = f'numFmtId="{format_id}" fontId="{font_id}" fillId="0" borderId="0" xfId="0"'
+            if font_id:
+                attributes += ' applyFont="1"'
+            if format_id:
+                attributes += ' applyNumberFormat="1"'
+            if horizontal is None:
+                xfs.append(f'<xf {attributes}/>')
+            else:
+                xfs.append(
+                    f'<xf {attributes} applyAlignment="1"><alignment horizontal="{horizontal}"/></xf>'
+                )
+        
+        number_formats = ''
+        if self._number_formats:
+            number_formats = (
+                f'<numFmts count="{len(self._number_formats)}">' +
+                ''.join(
+                    f'<numFmt numFmtId="{format_id}" formatCode="{escape_xml(code, quote=True)}"/>'
+                    for code, format_id in self._number_formats.items()
+                ) +
+                '</numFmts>'
+            )
+        
+        return (
+            XML_DECLARATION +
+            f'<styleSheet xmlns="{MAIN_NS}">' +
+            number_formats +
+            '<fonts count="3">'
+            '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+            '<font><b/><sz val="10"/><name val="Arial"/></font>'
+            '<font><sz val="10"/><name val="Arial"/></font>'
+            '</fonts>'
+            '<fills count="2"><fill><patternFill/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+            '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            f'<cellXfs count="{len(xfs)}">{"".join(xfs)}</cellXfs>'
+            '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+            '</styleSheet>'
+        )
+    
+    @staticmethod
+    def _inline_string_xml(text: str) -> str:
+        """インライン文字列のXMLを作成する"""
+        text = escape_xml(ILLEGAL_CHARACTERS_RE.sub('', text))
+        if text != text.strip():
+            # 前後の空白・改行を保持する
+            return f'<is><t xml:space="preserve">{text}</t></is>'
+        return f'<is><t>{text}</t></is>'
+    
+    def _workbook_xml(self) -> str:
+        """ブック（シート一覧）のXMLを作成する"""
+        sheets = ''.join(
+            f'<sheet name="{escape_xml(title, quote=True)}" sheetId="{i}" r:id="rId{i}"/>'
+            for i, title in enumerate(self._sheet_titles, 1)
+        )
+        return (
+            XML_DECLARATION +
+            f'<workbook xmlns="{MAIN_NS}" xmlns:r="{REL_NS}">'
+            f'<sheets>{sheets}</sheets>'
+            '</workbook>'
+        )
+    
+    @staticmethod
+    def _workbook_rels_xml(sheet_count: int) -> str:
+        """ブックのリレーションシップのXMLを作成する"""
+        relationships = [
+            f'<Relationship Id="rId{i}" Type="{REL_NS}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, sheet_count + 1)
+        ]
+        relationships.append(
+            f'<Relationship Id="rId{sheet_count + 1}" Type="{REL_NS}/styles" Target="styles.xml"/>'
+        )
+        return (
+            XML_DECLARATION +
+            f'<Relationships xmlns="{PACKAGE_REL_NS}">' +
+            ''.join(relationships) +
+            '</Relationships>'
+        )
+    
+    @staticmethod
+    def _content_types_xml(sheet_count: int) -> str:
+        """パッケージのコンテンツタイプのXMLを作成する"""
+        spreadsheetml = 'application/vnd.openxmlformats-officedocument.spreadsheetml'
+        overrides = [
+            f'<Override PartName="/xl/workbook.xml" ContentType="{spreadsheetml}.sheet.main+xml"/>',
+            f'<Override PartName="/xl/styles.xml" ContentType="{spreadsheetml}.styles+xml"/>'
+        ]
+        overrides.extend(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="{spreadsheetml}.worksheet+xml"/>'
+            for i in range(1, sheet_count + 1)
+        )
+        return (
+            XML_DECLARATION +
+            f'<Types xmlns="{CONTENT_TYPES_NS}">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>' +
+            ''.join(overrides) +
+            '</Types>'
+        )
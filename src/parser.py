@@ -1,5 +1,34 @@
+import mmap
+import os
 import re
-from typing import List, Dict, Any
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterable, Iterator, Tuple, Union
+
+from .table import Table
+
+
+@contextmanager
+def map_file(file_path: str) -> Iterator[Union[mmap.mmap, bytes]]:
+    """
+    ファイルを読み取り専用でメモリマップする
+    
+    同じファイルをマップした複数のプロセスはページキャッシュを共有する。
+    
+    Args:
+        file_path: ファイルパス
+        
+    Yields:
+        マップしたファイル内容（空のファイルは空のバイト列）
+    """
+    with open(file_path, 'rb') as f:
+        # 長さ0のファイルはマップできない
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, 'madvise'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            yield mapped
 
 
 class MarkdownTableParser:
@@ -9,16 +38,32 @@ class MarkdownTableParser:
         # テーブル行を識別する正規表現パターン
         self.table_row_pattern = re.compile(r'^\s*\|.*\|\s*$')
         self.separator_pattern = re.compile(r'^\s*\|[\s\-\:\|]*\|\s*$')
+        
+        # テキスト全体を走査する際のパターン（上記の複数行版）
+        # 行をまたいで一致しないよう、空白には改行を除いた [^\S\n] を使う
+        self.table_start_pattern = re.compile(
+            r'^(?P<header>[^\S\n]*\|[^\n]*\|[^\S\n]*)\n'
+            r'(?P<separator>[^\S\n]*\|(?:[-:|]|[^\S\n])*\|[^\S\n]*)$',
+            re.MULTILINE
+        )
+        self.table_body_row_pattern = re.compile(r'[^\S\n]*\|[^\n]*\|[^\S\n]*$', re.MULTILINE)
     
-    def parse(self, markdown_content: str) -> List[Dict[str, Any]]:
+    def parse(
+        self,
+        markdown_content: str,
+        as_table: bool = False
+    ) -> List[Union[Dict[str, Any], Table]]:
         """
         Markdownコンテンツからテーブルを抽出して解析する
         
         Args:
             markdown_content: 解析対象のMarkdownテキスト
+            as_table: Trueの場合、列ごとに保持したTableを返す（変換処理で使う。
+                辞書と同じように参照できるが、読み取り専用で、'rows' は参照のたびに
+                行を組み立てるビューになる）
             
         Returns:
-            テーブル情報のリスト。各テーブルは以下の構造:
+            テーブル情報のリスト:
             {
                 'headers': List[str],  # カラムヘッダー
                 'rows': List[List[str]],  # データ行
@@ -28,81 +73,210 @@ class MarkdownTableParser:
         if not markdown_content.strip():
             return []
         
-        lines = markdown_content.split('\n')
-        tables = []
-        i = 0
+        tables = self._scan_tables(markdown_content)
+        if as_table:
+            return list(tables)
+        return [table.to_dict() for table in tables]
+    
+    def iter_tables(
+        self,
+        fp: Iterable[str],
+        stream_rows: bool = False,
+        as_table: bool = False
+    ) -> Iterator[Union[Dict[str, Any], Table]]:
+        """
+        テキストストリームを1行ずつ読み、テーブルが確定するたびに返す
         
-        while i < len(lines):
-            table_data = self._extract_table_at_position(lines, i)
-            if table_data:
-                tables.append(table_data['table'])
-                i = table_data['next_index']
-            else:
-                i += 1
+        Args:
+            fp: テキストストリーム（ファイルオブジェクトや行のイテラブル）
+            stream_rows: Trueの場合、'rows' を行ごとに返すイテレータにする。
+                このイテレータは次のテーブルを取得する前に消費する必要がある
+                （消費されなかった行は読み飛ばされる）
+            as_table: Trueの場合、列ごとに保持したTableを返す（stream_rows=True の
+                場合は使わない）
+                
+        Yields:
+            parse() と同じ構造のテーブル情報（stream_rows=True の場合は 'rows' が
+            イテレータの辞書）
+        """
+        lines = iter(fp)
+        # 直前のテーブル行（ヘッダー候補）
+        pending_header = None
         
-        return tables
+        for line in lines:
+            line = line.rstrip('\n')
+            
+            if pending_header is not None and self._is_separator_row(line):
+                headers = self._parse_table_row(pending_header)
+                alignment = self._parse_alignment(line)
+                pending_header = None
+                
+                rows = self._iter_table_body(lines, len(headers))
+                if stream_rows:
+                    yield {
+                        'headers': headers,
+                        'rows': rows,
+                        'alignment': alignment
+                    }
+                    # 呼び出し側が消費しなかった残りの行を読み飛ばす
+                    for _ in rows:
+                        pass
+                else:
+                    table = Table.from_rows(headers, rows, alignment)
+                    yield table if as_table else table.to_dict()
+                continue
+            
+            pending_header = line if self._is_table_row(line) else None
     
-    def _extract_table_at_position(self, lines: List[str], start_index: int) -> Dict[str, Any]:
+    def _scan_tables(self, markdown_content: str) -> Iterator[Table]:
         """
-        指定位置からテーブルを抽出する
+        テキスト全体を1度走査し、ヘッダー行とセパレーター行の組だけを解析する
+        
+        パイプを含まない行は str.find() で読み飛ばすため、処理時間は
+        行数ではなくテーブルの内容量にほぼ比例する。結果は iter_tables() と同じ。
         
         Args:
-            lines: 全行のリスト
-            start_index: 開始位置
+            markdown_content: 解析対象のMarkdownテキスト
             
-        Returns:
-            テーブルデータと次のインデックス、またはNone
+        Yields:
+            Table
+        """
+        position = 0
+        
+        def body_rows() -> Iterator[List[str]]:
+            # テーブル行が続く間データ行を返し、position を次の行へ進める
+            nonlocal position
+            while True:
+                row_match = self.table_body_row_pattern.match(markdown_content, position)
+                if row_match is None:
+                    return
+                position = row_match.end() + 1
+                yield self._parse_table_row(row_match.group())
+        
+        while True:
+            # パイプを含む行まで読み飛ばし、その行からヘッダー行とセパレーター行の組を照合
+            pipe_position = markdown_content.find('|', position)
+            if pipe_position < 0:
+                return
+            line_start = markdown_content.rfind('\n', 0, pipe_position) + 1
+            match = self.table_start_pattern.match(markdown_content, line_start)
+            if match is None:
+                next_line = markdown_content.find('\n', pipe_position)
+                if next_line < 0:
+                    return
+                position = next_line + 1
+                continue
+            
+            headers = self._parse_table_row(match.group('header'))
+            alignment = self._parse_alignment(match.group('separator'))
+            
+            # セパレーター行の直後から、テーブル行が続く限りデータ行として収集
+            position = match.end() + 1
+            yield Table.from_rows(headers, body_rows(), alignment)
+    
+    @contextmanager
+    def open_lines(self, file_path: str, use_mmap: bool = False) -> Iterator[Iterable[str]]:
+        """
+        ファイルを開き、iter_tables() に渡す行のイテラブルを返す
+        
+        Args:
+            file_path: 入力Markdownファイルパス（UTF-8）
+            use_mmap: メモリマップを使うか（Trueの場合はテーブルの候補行のみを返す）
+            
+        Yields:
+            行のイテラブル
         """
-        if start_index >= len(lines):
-            return None
-        
-        # 現在行がテーブル行かチェック
-        current_line = lines[start_index]
-        if not self._is_table_row(current_line):
-            return None
-        
-        # ヘッダー行を解析
-        headers = self._parse_table_row(current_line)
-        
-        # セパレーター行を探す
-        separator_index = start_index + 1
-        if separator_index >= len(lines):
-            return None
-        
-        separator_line = lines[separator_index]
-        if not self._is_separator_row(separator_line):
-            return None
-        
-        # アライメント情報を抽出
-        alignment = self._parse_alignment(separator_line)
-        
-        # データ行を収集
-        rows = []
-        current_index = separator_index + 1
-        
-        while current_index < len(lines):
-            line = lines[current_index]
-            if self._is_table_row(line):
-                row_data = self._parse_table_row(line)
-                # ヘッダー数に合わせて行データを調整
-                row_data = self._normalize_row_data(row_data, len(headers))
-                rows.append(row_data)
-                current_index += 1
+        if use_mmap:
+            with map_file(file_path) as mapped:
+                yield self.iter_mapped_lines(mapped)
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                yield f
+    
+    def iter_mapped_lines(
+        self,
+        buffer: Union[mmap.mmap, bytes],
+        encoding: str = 'utf-8'
+    ) -> Iterator[str]:
+        """
+        バイト列（マップしたファイルなど）からテーブルの候補となる行だけをデコードして返す
+        
+        パイプを含まない行はデコードせずに読み飛ばし、読み飛ばした区間は
+        空行1行として返す（iter_tables() ではテーブルの区切りになる）。
+        改行はテキストモードでファイルを読んだ場合と同じく \r\n と \r も扱う。
+        '|' と改行が複数バイト文字の一部にならないUTF-8などのエンコーディングに限る。
+        
+        Args:
+            buffer: ファイル内容（map_file() の結果など）
+            encoding: 文字エンコーディング
+            
+        Yields:
+            iter_tables() に渡す行
+        """
+        position = 0
+        size = len(buffer)
+        while position < size:
+            pipe_position = buffer.find(b'|', position)
+            if pipe_position < 0:
+                # 以降にテーブルはない
+                return
+            
+            newline = buffer.rfind(b'\n', position, pipe_position)
+            line_start = position if newline < 0 else newline + 1
+            if line_start > position:
+                yield ''
+            
+            line_end = buffer.find(b'\n', pipe_position)
+            if line_end < 0:
+                line_end = size
+            line = buffer[line_start:line_end].decode(encoding)
+            position = line_end + 1
+            
+            if line.endswith('\r'):
+                line = line[:-1]
+            if '\r' in line:
+                # 単独の \r も行の区切りとして扱う
+                yield from line.split('\r')
             else:
-                break
-        
-        return {
-            'table': {
-                'headers': headers,
-                'rows': rows,
-                'alignment': alignment
-            },
-            'next_index': current_index
-        }
+                yield line
+    
+    def iter_rows(self, fp: Iterable[str]) -> Iterator[Tuple[int, List[str]]]:
+        """
+        テキストストリームからデータ行を1行ずつ返す
+        
+        Args:
+            fp: テキストストリーム（ファイルオブジェクトや行のイテラブル）
+            
+        Yields:
+            (テーブル番号, 行データ) のタプル。テーブル番号は0始まり
+        """
+        for table_index, table in enumerate(self.iter_tables(fp, stream_rows=True)):
+            for row in table['rows']:
+                yield table_index, row
+    
+    def _iter_table_body(self, lines: Iterator[str], expected_columns: int) -> Iterator[List[str]]:
+        """
+        セパレーター行の直後からデータ行を収集する
+        
+        Args:
+            lines: 行イテレータ（テーブル外の行に達した時点で読み進めを止める）
+            expected_columns: ヘッダーのカラム数
+            
+        Yields:
+            ヘッダー数に合わせて正規化した行データ
+        """
+        for line in lines:
+            line = line.rstrip('\n')
+            if not self._is_table_row(line):
+                return
+            row_data = self._parse_table_row(line)
+            # ヘッダー数に合わせて行データを調整
+            yield self._normalize_row_data(row_data, expected_columns)
     
     def _is_table_row(self, line: str) -> bool:
         """行がテーブル行かどうかを判定"""
-        return bool(self.table_row_pattern.match(line))
+        # パイプを含まない行（大半の本文）は正規表現を使わずに除外
+        return '|' in line and bool(self.table_row_pattern.match(line))
     
     def _is_separator_row(self, line: str) -> bool:
         """行がセパレーター行かどうかを判定"""
@@ -0,0 +1,60 @@
+import math
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List
+
+
+# 計測対象の処理段階（処理順）
+STAGES = ('read', 'parse', 'infer', 'build', 'format', 'width', 'save')
+
+
+@dataclass
+class ConversionStats:
+    """
+    変換処理の段階別の計測値
+    
+    stage_seconds には STAGES の各段階の所要時間（秒）を記録する。
+    ストリーミング変換では読み込み・解析・書き込みが1パスで行われるため、
+    それらの時間は 'build' にまとめて記録する。メモリマップ入力では
+    lines_scanned はデコードした行（パイプを含む行と、読み飛ばした区間ごとの1行）を数える。
+    """
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    input_bytes: int = 0
+    lines_scanned: int = 0
+    rows: int = 0
+    cells_written: int = 0
+    output_bytes: int = 0
+    
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """with文のブロックの所要時間を指定した段階に加算する"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + elapsed
+    
+    def count_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """行を読み進めながら lines_scanned を数える"""
+        for line in lines:
+            self.lines_scanned += 1
+            yield line
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """
+    昇順にソート済みの値から最近傍順位法でパーセンタイルを求める
+    
+    Args:
+        sorted_values: 昇順にソートした値のリスト
+        percent: パーセンタイル（0〜100）
+        
+    Returns:
+        パーセンタイル値（値が空の場合は0.0）
+    """
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
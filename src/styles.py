@@ -0,0 +1,210 @@
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+from openpyxl.cell import Cell
+from openpyxl.styles import Font, Alignment
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.utils import get_column_letter
+
+
+# セルの役割
+HEADER = 'header'
+BODY = 'body'
+
+# Markdownのアライメント指定（それ以外は左寄せとして扱う）
+HORIZONTAL_ALIGNMENTS = ('left', 'center', 'right')
+
+
+class StyleEngine:
+    """
+    テーブルの書式を事前に登録したスタイルとして管理するクラス
+    
+    (ヘッダー/データ, アライメント) の組み合わせごとにスタイルを1度だけ
+    ワークブックに登録し、その後はセルにスタイルを複写するだけで書式を設定する。
+    Font / Alignment オブジェクトは変換をまたいで共有し、登録済みスタイルは
+    同じワークブックのシート間で再利用する。
+    """
+    
+    def __init__(self, body_font: Font, header_font: Font):
+        """
+        Args:
+            body_font: データ行のフォント
+            header_font: ヘッダー行のフォント
+        """
+        self.fonts = {HEADER: header_font, BODY: body_font}
+        self.alignments = {
+            horizontal: Alignment(horizontal=horizontal)
+            for horizontal in HORIZONTAL_ALIGNMENTS
+        }
+        # ワークブックごとの登録済みスタイル
+        self._registered = weakref.WeakKeyDictionary()
+    
+    def __getstate__(self):
+        # 並列変換でワーカープロセスに渡せるよう、登録済みスタイルは引き継がない
+        state = self.__dict__.copy()
+        del state['_registered']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._registered = weakref.WeakKeyDictionary()
+    
+    def column_styles(
+        self,
+        worksheet,
+        role: Optional[str],
+        alignment: List[str],
+        column_count: int,
+        number_formats: Optional[List[Optional[str]]] = None
+    ) -> List:
+        """
+        列ごとのスタイルを取得する
+        
+        Args:
+            worksheet: openpyxlワークシート
+            role: HEADER または BODY（Noneの場合はフォントを設定しない）
+            alignment: アライメント情報
+            column_count: 列数
+            number_formats: 列ごとの表示形式（Noneの要素は既定の表示形式）
+            
+        Returns:
+            列ごとのスタイル（StyleArray）のリスト
+        """
+        number_formats = number_formats or []
+        return [
+            self._style(
+                worksheet,
+                role,
+                alignment[col_idx] if col_idx < len(alignment) else None,
+                number_formats[col_idx] if col_idx < len(number_formats) else None
+            )
+            for col_idx in range(column_count)
+        ]
+    
+    def apply_column_defaults(
+        self,
+        worksheet,
+        alignment: List[str],
+        number_formats: Optional[List[Optional[str]]] = None
+    ) -> None:
+        """
+        列全体にデータ行のスタイルを設定する
+        
+        セルが存在しない位置（Excel上で後から入力されたセルなど）にも
+        フォントとアライメントが適用されるようにする。
+        
+        Args:
+            worksheet: openpyxlワークシート
+            alignment: アライメント情報
+            number_formats: 列ごとの表示形式（指定した列のみ設定する）
+        """
+        for col_idx, align_type in enumerate(alignment, 1):
+            dimension = worksheet.column_dimensions[get_column_letter(col_idx)]
+            dimension.font = self.fonts[BODY]
+            dimension.alignment = self._alignment(align_type)
+            if number_formats and col_idx <= len(number_formats) and number_formats[col_idx - 1]:
+                dimension.number_format = number_formats[col_idx - 1]
+    
+    def apply_row_defaults(self, worksheet, row_idx: int, role: str) -> None:
+        """
+        行全体にフォントを設定する（行の書式は列の書式より優先される）
+        
+        Args:
+            worksheet: openpyxlワークシート
+            row_idx: 行番号（1始まり）
+            role: HEADER または BODY
+        """
+        worksheet.row_dimensions[row_idx].font = self.fonts[role]
+    
+    @staticmethod
+    def styled_cells(worksheet, values: List, styles: List, sparse: bool = False) -> List[Cell]:
+        """
+        値とスタイルからセルのリストを作成する（空文字列はNoneとして書き込む）
+        
+        Args:
+            worksheet: openpyxlワークシート
+            values: セル値のリスト
+            styles: column_styles() で取得したスタイルのリスト
+            sparse: Trueの場合、空のセルにはスタイルを設定しない
+                （write-onlyワークシートではスタイルのない空のセルは書き出されない）
+                
+        Returns:
+            worksheet.append() に渡すセルのリスト（行番号は追記時に設定される）
+        """
+        column_count = len(styles)
+        return [
+            Cell(
+                worksheet,
+                row=1,
+                column=col_idx + 1,
+                value=value if value != '' else None,
+                style_array=(
+                    styles[col_idx]
+                    if col_idx < column_count and not (sparse and value == '')
+                    else None
+                )
+            )
+            for col_idx, value in enumerate(values)
+        ]
+    
+    @staticmethod
+    def set_sparse_row(
+        worksheet,
+        row_idx: int,
+        values: List,
+        styles: Optional[List] = None
+    ) -> None:
+        """
+        空でない値のセルだけを作成して1行分の値を設定する
+        
+        空のセルは作成しないため、書式は apply_column_defaults() などで
+        列・行全体に設定しておく。
+        
+        Args:
+            worksheet: openpyxlワークシート（write-onlyでないもの）
+            row_idx: 行番号（1始まり）
+            values: セル値のリスト
+            styles: column_styles() で取得したスタイルのリスト（Noneの場合は既定のスタイル）
+        """
+        column_count = len(styles) if styles else 0
+        for col_idx, value in enumerate(values):
+            if value is None or value == '':
+                continue
+            cell = worksheet.cell(row=row_idx, column=col_idx + 1)
+            if col_idx < column_count:
+                # スタイルを先に設定する（表示形式のない日付には値の設定時に日付の表示形式が補われる）
+                cell._style = StyleArray(styles[col_idx])
+            cell.value = value
+    
+    def _style(
+        self,
+        worksheet,
+        role: Optional[str],
+        align_type: Optional[str],
+        number_format: Optional[str] = None
+    ):
+        """(役割, アライメント, 表示形式) に対応する登録済みスタイルを取得する"""
+        workbook = worksheet.parent
+        registered: Dict[Tuple[Optional[str], Optional[str], Optional[str]], object] = (
+            self._registered.get(workbook)
+        )
+        if registered is None:
+            registered = self._registered[workbook] = {}
+        
+        key = (role, align_type, number_format)
+        style = registered.get(key)
+        if style is None:
+            # 雛形セルに書式を設定してワークブックに登録する
+            template = Cell(worksheet)
+            if role is not None:
+                template.font = self.fonts[role]
+            if align_type is not None:
+                template.alignment = self._alignment(align_type)
+            if number_format is not None:
+                template.number_format = number_format
+            style = registered[key] = template._style
+        return style
+    
+    def _alignment(self, align_type: str) -> Alignment:
+        """アライメント指定に対応するAlignmentを取得する"""
+        return self.alignments.get(align_type, self.alignments['left'])
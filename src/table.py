@@ -0,0 +1,177 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+# 辞書形式のテーブル情報と同じキー
+TABLE_KEYS = ('headers', 'rows', 'alignment')
+
+# 空のセル（すべての空セルで同じオブジェクトを共有する）
+EMPTY_CELL = ''
+
+
+class Table(Mapping):
+    """
+    解析したテーブルを列ごとに保持するクラス
+    
+    セルは列ごとのリストに格納し、行ごとのリストは作らない。
+    {'headers', 'rows', 'alignment'} の辞書と同じように参照でき、
+    'rows' は列から行を組み立てるビュー（RowsView）を返す。
+    
+    number_formats には列ごとのExcelの表示形式を保持する（型を推定した
+    テーブルのみ。辞書形式のキーには含めない）。
+    """
+    
+    __slots__ = ('headers', 'alignment', 'columns', 'row_count', 'number_formats')
+    
+    def __init__(
+        self,
+        headers: List[str],
+        columns: List[List[Any]],
+        alignment: List[str],
+        row_count: int,
+        number_formats: Optional[List[Optional[str]]] = None
+    ):
+        """
+        Args:
+            headers: カラムヘッダー
+            columns: 列ごとのセル値のリスト（各列の長さは row_count）
+            alignment: アライメント情報
+            row_count: データ行数
+            number_formats: 列ごとの表示形式（Noneの場合は指定なし）
+        """
+        self.headers = headers
+        self.columns = columns
+        self.alignment = alignment
+        self.row_count = row_count
+        self.number_formats = number_formats
+    
+    @classmethod
+    def from_rows(
+        cls,
+        headers: List[str],
+        rows: Iterable[List[Any]],
+        alignment: List[str]
+    ) -> 'Table':
+        """
+        行のイテラブルからテーブルを作成する
+        
+        各行はヘッダー数に合わせて、不足分を空セルで埋め、余分な列を切り捨てる。
+        
+        Args:
+            headers: カラムヘッダー
+            rows: データ行のイテラブル
+            alignment: アライメント情報
+            
+        Returns:
+            Table
+        """
+        columns = [[] for _ in headers]
+        appends = [column.append for column in columns]
+        row_count = 0
+        
+        for row_data in rows:
+            for append, value in zip(appends, row_data):
+                append(value)
+            for append in appends[len(row_data):]:
+                append(EMPTY_CELL)
+            row_count += 1
+        
+        return cls(headers, columns, alignment, row_count)
+    
+    @property
+    def rows(self) -> 'RowsView':
+        """行単位のビュー"""
+        return RowsView(self)
+    
+    def to_dict(self, offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        辞書形式（'rows' は行のリスト）に変換する
+        
+        Args:
+            offset: 'rows' に含める最初の行の位置
+            limit: 'rows' に含める最大行数（Noneの場合は最後の行まで）
+            
+        Returns:
+            辞書形式のテーブル情報（offset と limit の範囲の行だけを組み立てる）
+        """
+        if offset == 0 and limit is None:
+            rows = list(self.rows)
+        else:
+            end = self.row_count if limit is None else offset + limit
+            rows = self.rows[offset:end]
+        return {
+            'headers': self.headers,
+            'rows': rows,
+            'alignment': self.alignment
+        }
+    
+    def summary(self) -> Dict[str, Any]:
+        """セル値を含まない概要（ヘッダー・アライメント・行数）を辞書形式で返す"""
+        return {
+            'headers': self.headers,
+            'alignment': self.alignment,
+            'row_count': self.row_count
+        }
+    
+    def __getitem__(self, key: str) -> Any:
+        if key == 'headers':
+            return self.headers
+        if key == 'rows':
+            return self.rows
+        if key == 'alignment':
+            return self.alignment
+        raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(TABLE_KEYS)
+    
+    def __len__(self) -> int:
+        return len(TABLE_KEYS)
+    
+    def __repr__(self) -> str:
+        return (
+            f"Table(headers={self.headers!r}, alignment={self.alignment!r}, "
+            f"row_count={self.row_count})"
+        )
+
+
+class RowsView(Sequence):
+    """Tableの列から行を組み立てて返すビュー（行は参照のたびに作成する）"""
+    
+    __slots__ = ('_table',)
+    
+    def __init__(self, table: Table):
+        self._table = table
+    
+    @property
+    def columns(self) -> List[List[Any]]:
+        """元のテーブルの列ごとのセル値"""
+        return self._table.columns
+    
+    def __len__(self) -> int:
+        return self._table.row_count
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('row index out of range')
+        return [column[index] for column in self._table.columns]
+    
+    def __iter__(self) -> Iterator[List[Any]]:
+        columns = self._table.columns
+        if not columns:
+            return ([] for _ in range(len(self)))
+        return map(list, zip(*columns))
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (RowsView, list, tuple)):
+            return len(self) == len(other) and all(
+                row == list(other_row) for row, other_row in zip(self, other)
+            )
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return repr(list(self))
@@ -0,0 +1,103 @@
+import unicodedata
+from typing import Any, Iterable, List, Optional
+
+
+# 表示幅が2になる東アジアの文字幅の分類（全角・広い文字）
+WIDE_CHARACTERS = ('W', 'F')
+
+# 列幅の余白・最小幅・最大幅
+WIDTH_PADDING = 2
+MIN_COLUMN_WIDTH = 10
+MAX_COLUMN_WIDTH = 50
+
+
+def display_width(text: str) -> int:
+    """
+    文字列の表示幅を求める（全角文字は2、それ以外は1として数える）
+    
+    Args:
+        text: 文字列
+        
+    Returns:
+        表示幅
+    """
+    if text.isascii():
+        return len(text)
+    east_asian_width = unicodedata.east_asian_width
+    return len(text) + sum(1 for char in text if east_asian_width(char) in WIDE_CHARACTERS)
+
+
+class ColumnWidthTracker:
+    """
+    セルを書き込みながら列ごとの最大の表示幅を記録するクラス
+    
+    表示幅は文字数以上・文字数の2倍以下のため、文字数の2倍が記録済みの幅以下の
+    値は表示幅を求めずに読み飛ばす。sample_rows を指定した場合は先頭の行だけから
+    列幅を見積もる。
+    """
+    
+    __slots__ = ('max_widths', '_remaining')
+    
+    def __init__(self, headers: List[Any], sample_rows: Optional[int] = None):
+        """
+        Args:
+            headers: ヘッダーリスト（列数とヘッダーの表示幅の初期値に使う）
+            sample_rows: 列幅の算出に使う先頭行数（Noneの場合は全行）
+        """
+        self.max_widths = [display_width(str(header)) for header in headers]
+        self._remaining = sample_rows
+    
+    def update(self, row_data: List[Any]) -> None:
+        """1行分のセル値で列ごとの最大幅を更新する"""
+        if self._remaining is not None:
+            if self._remaining <= 0:
+                return
+            self._remaining -= 1
+        
+        max_widths = self.max_widths
+        for col_idx, value in zip(range(len(max_widths)), row_data):
+            if not value:
+                continue
+            text = value if isinstance(value, str) else str(value)
+            if len(text) * 2 <= max_widths[col_idx]:
+                continue
+            width = display_width(text)
+            if width > max_widths[col_idx]:
+                max_widths[col_idx] = width
+    
+    def update_rows(self, rows: Iterable[List[Any]]) -> None:
+        """複数行のセル値で列ごとの最大幅を更新する"""
+        for row_data in rows:
+            if self._remaining is not None and self._remaining <= 0:
+                return
+            self.update(row_data)
+    
+    def update_columns(self, columns: List[List[Any]]) -> None:
+        """
+        列ごとのセル値で最大幅を更新する（列単位で保持したテーブル向け）
+        
+        列内で重複する値の表示幅は1度だけ求める。
+        """
+        max_widths = self.max_widths
+        for col_idx, column in zip(range(len(max_widths)), columns):
+            if self._remaining is not None:
+                column = column[:self._remaining]
+            for value in set(column):
+                if not value:
+                    continue
+                text = value if isinstance(value, str) else str(value)
+                if len(text) * 2 <= max_widths[col_idx]:
+                    continue
+                width = display_width(text)
+                if width > max_widths[col_idx]:
+                    max_widths[col_idx] = width
+        if self._remaining is not None:
+            self._remaining = 0
+    
+    @property
+    def widths(self) -> List[int]:
+        """余白を加え、最小幅・最大幅の範囲に収めた列幅のリスト"""
+        return [
+            min(max(width + WIDTH_PADDING, MIN_COLUMN_WIDTH), MAX_COLUMN_WIDTH)
+            for width in self.max_widths
+        ]
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+from io import BytesIO
+from src.cache import ConversionCache, HashingReader
+
+
+class TestConversionCache:
+
+    def test_make_key_depends_on_content_and_options(self):
+        """キャッシュキーが入力内容とオプションに依存することのテスト"""
+        digest_a = ConversionCache.content_digest(b"| A |\n|---|\n")
+        digest_b = ConversionCache.content_digest(b"| B |\n|---|\n")
+        options = {'apply_formatting': False, 'auto_adjust_width': False}
+        
+        assert ConversionCache.make_key(digest_a, options) == ConversionCache.make_key(digest_a, dict(options))
+        assert ConversionCache.make_key(digest_a, options) != ConversionCache.make_key(digest_b, options)
+        assert ConversionCache.make_key(digest_a, options) != ConversionCache.make_key(
+            digest_a, {'apply_formatting': True, 'auto_adjust_width': False}
+        )
+    
+    def test_file_digest_matches_content_digest(self):
+        """ファイルのハッシュとバイト列のハッシュが一致することのテスト"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "input.md"
+            path.write_bytes(b"| A |\n|---|\n| 1 |\n")
+            
+            assert ConversionCache.file_digest(str(path)) == ConversionCache.content_digest(path.read_bytes())
+    
+    def test_hashing_reader_digest(self):
+        """ストリームを読み込みながら求めたハッシュがバイト列のハッシュと一致することのテスト"""
+        data = "| 名前 |\n|---|\n| テスト |\n".encode('utf-8') * 1000
+        reader = HashingReader(BytesIO(data))
+        
+        chunks = []
+        while True:
+            chunk = reader.read(4096)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        
+        assert b''.join(chunks) == data
+        assert reader.bytes_read == len(data)
+        assert reader.hexdigest() == ConversionCache.content_digest(data)
+    
+    def test_put_and_get(self):
+        """保存したエントリを取得・復元できることのテスト"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ConversionCache(os.path.join(temp_dir, 'cache'))
+            key = ConversionCache.make_key('digest', {})
+            
+            assert cache.get(key) is None
+            
+            cache.put(key, b'xlsx-bytes', {'tables_found': 2, 'warnings': []})
+            
+            data, metadata = cache.read(key)
+            assert data == b'xlsx-bytes'
+            assert metadata['tables_found'] == 2
+            
+            output_path = os.path.join(temp_dir, 'restored.xlsx')
+            assert cache.restore(key, output_path)['tables_found'] == 2
+            assert Path(output_path).read_bytes() == b'xlsx-bytes'
+    
+    def test_lru_eviction(self):
+        """合計サイズが上限を超えた場合に古いエントリから削除されることのテスト"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ConversionCache(temp_dir, max_bytes=2500)
+            
+            for name in ('first', 'second'):
+                cache.put(name, b'x' * 1000, {'tables_found': 1, 'warnings': []})
+            
+            # 'first' を参照して最終利用時刻を新しくする
+            past = time.time() - 100
+            os.utime(os.path.join(temp_dir, 'second.xlsx'), (past, past))
+            assert cache.get('first') is not None
+            
+            cache.put('third', b'x' * 1000, {'tables_found': 1, 'warnings': []})
+            
+            assert cache.get('second') is None
+            assert cache.get('first') is not None
+            assert cache.get('third') is not None
+            assert cache.size() <= 2500
@@ -1,6 +1,8 @@
 import pytest
 import tempfile
 import os
+import subprocess
+import sys
 from pathlib import Path
 from click.testing import CliRunner
 from unittest.mock import patch, MagicMock
@@ -94,6 +96,181 @@ class TestCLI:
             assert result.exit_code == 0
             assert output_file.exists()
     
+    def test_cli_streaming_option(self):
+        """ストリーミングオプション付きCLIテスト"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "test.md"
+            output_file = Path(temp_dir) / "streaming.xlsx"
+            
+            input_file.write_text("""
+| Name | Score |
+|------|-------|
+| Alice | 95.5 |
+""")
+            
+            result = self.runner.invoke(cli, [
+                str(input_file),
+                '--output', str(output_file),
+                '--streaming',
+                '--format',
+                '--auto-width'
+            ])
+            
+            assert result.exit_code == 0
+            assert output_file.exists()
+    
+    def test_cli_native_engine_option(self):
+        """nativeエンジン指定のCLIテスト"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "test.md"
+            output_file = Path(temp_dir) / "native.xlsx"
+            
+            input_file.write_text("""
+| Name | Score |
+|------|-------|
+| Alice | 95.5 |
+""")
+            
+            result = self.runner.invoke(cli, [
+                str(input_file),
+                '--output', str(output_file),
+                '--engine', 'native',
+                '--format',
+                '--auto-width'
+            ])
+            
+            assert result.exit_code == 0
+            from openpyxl import load_workbook
+            sheet = load_workbook(output_file).active
+            assert sheet['A2'].value == 'Alice'
+            assert sheet['A1'].font.bold == True
+    
+    def test_cli_mmap_option(self):
+        """メモリマップ入力オプション付きCLIテスト"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "test.md"
+            output_file = Path(temp_dir) / "mmap.xlsx"
+            
+            input_file.write_text("""
+| Name | Score |
+|------|-------|
+| Alice | 95.5 |
+""")
+            
+            for extra in ([], ['--streaming']):
+                result = self.runner.invoke(cli, [
+                    str(input_file),
+                    '--output', str(output_file),
+                    '--mmap'
+                ] + extra)
+                
+                assert result.exit_code == 0
+                from openpyxl import load_workbook
+                assert load_workbook(output_file).active['B2'].value == '95.5'
+    
+    def test_cli_infer_types_option(self):
+        """型推定オプション付きCLIテスト"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "test.md"
+            output_file = Path(temp_dir) / "typed.xlsx"
+            
+            input_file.write_text("""
+| Name | Score |
+|------|-------|
+| Alice | 95.5 |
+""")
+            
+            result = self.runner.invoke(cli, [
+                str(input_file),
+                '--output', str(output_file),
+                '--infer-types'
+            ])
+            
+            assert result.exit_code == 0
+            from openpyxl import load_workbook
+            assert load_workbook(output_file).active['B2'].value == 95.5
+            
+            result = self.runner.invoke(cli, [
+                str(input_file),
+                '--output', str(output_file),
+                '--infer-types',
+                '--streaming'
+            ])
+            assert result.exit_code != 0
+    
+    def test_cli_width_sample_rows_option(self):
+        """列幅算出行数オプション付きCLIテスト"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "test.md"
+            output_file = Path(temp_dir) / "width.xlsx"
+            
+            input_file.write_text("""
+| Name | Note |
+|------|------|
+| Alice | short |
+| Bob | 東京都千代田区丸の内一丁目 |
+""", encoding='utf-8')
+            
+            result = self.runner.invoke(cli, [
+                str(input_file),
+                '--output', str(output_file),
+                '--auto-width',
+                '--width-sample-rows', '1'
+            ])
+            
+            assert result.exit_code == 0
+            from openpyxl import load_workbook
+            assert load_workbook(output_file).active.column_dimensions['B'].width == 10
+    
+    def test_cli_sparse_option(self):
+        """空のセルを作成しないオプション付きCLIテスト"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "test.md"
+            output_file = Path(temp_dir) / "sparse.xlsx"
+            
+            input_file.write_text("""
+| Name | Score |
+|------|------:|
+| Alice | |
+| | 80 |
+""")
+            
+            result = self.runner.invoke(cli, [
+                str(input_file),
+                '--output', str(output_file),
+                '--sparse',
+                '--format'
+            ])
+            
+            assert result.exit_code == 0
+            from openpyxl import load_workbook
+            sheet = load_workbook(output_file).active
+            assert sheet['A2'].value == 'Alice'
+            assert sheet['B3'].value == '80'
+            assert sheet['B2'].value is None
+    
+    def test_cli_cache_dir_option(self):
+        """キャッシュディレクトリ指定時に2回目の変換がキャッシュから出力されることのテスト"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "test.md"
+            cache_dir = Path(temp_dir) / "cache"
+            
+            input_file.write_text("""
+| Name | Score |
+|------|-------|
+| Alice | 95.5 |
+""")
+            
+            args = [str(input_file), '--cache-dir', str(cache_dir), '--verbose']
+            first = self.runner.invoke(cli, args + ['--output', str(Path(temp_dir) / "first.xlsx")])
+            second = self.runner.invoke(cli, args + ['--output', str(Path(temp_dir) / "second.xlsx")])
+            
+            assert first.exit_code == 0
+            assert second.exit_code == 0
+            assert 'キャッシュ' not in first.output
+            assert 'キャッシュ' in second.output
+            assert (Path(temp_dir) / "second.xlsx").exists()
+    
     def test_cli_help_command(self):
         """ヘルプコマンドのテスト"""
         result = self.runner.invoke(cli, ['--help'])
@@ -197,6 +374,28 @@ class TestCLIUtilityFunctions:
             
             assert output_file.exists()
     
+    def test_convert_file_cache_matches_processor(self):
+        """キャッシュの保存が一括変換と同じ内容になり、保存の失敗で中断しないことのテスト"""
+        from src.cache import ConversionCache
+        from src.integration import MarkdownToExcelProcessor
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "blank.md"
+            input_file.write_text("   \n\n")
+            cache = ConversionCache(str(Path(temp_dir) / "cache"))
+            
+            convert_file(str(input_file), str(Path(temp_dir) / "first.xlsx"), False, False, False, cache=cache)
+            key = cache.make_key(
+                cache.file_digest(str(input_file)), MarkdownToExcelProcessor.cache_options(False, False)
+            )
+            _, metadata = cache.read(key)
+            assert metadata['warnings'] == ["Input file is empty", "No tables found in the input file"]
+            
+            input_file.write_text("| A |\n|---|\n| 1 |\n")
+            with patch.object(ConversionCache, 'put', side_effect=OSError('disk full')):
+                convert_file(str(input_file), str(Path(temp_dir) / "second.xlsx"), False, False, False, cache=cache)
+            assert (Path(temp_dir) / "second.xlsx").exists()
+    
     def test_convert_directory_function(self):
         """convert_directory関数の単体テスト"""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -224,6 +423,48 @@ class TestCLIUtilityFunctions:
             assert (output_dir / "test2.xlsx").exists()
             assert not (output_dir / "readme.xlsx").exists()
     
+    def test_convert_directory_parallel(self):
+        """並列プロセス数を指定したconvert_directory関数のテスト"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_dir = Path(temp_dir) / "input"
+            output_dir = Path(temp_dir) / "output"
+            input_dir.mkdir()
+            
+            for i in range(4):
+                (input_dir / f"test{i}.md").write_text(f"| A | B |\n|---|---|\n| {i} | 2 |")
+            
+            runner = CliRunner()
+            result = runner.invoke(cli, [
+                str(input_dir),
+                '--output', str(output_dir),
+                '--batch',
+                '--jobs', '2',
+                '--verbose'
+            ])
+            
+            assert result.exit_code == 0
+            for i in range(4):
+                assert (output_dir / f"test{i}.xlsx").exists()
+    
+    def test_convert_directory_incremental(self):
+        """差分変換オプション付きの一括変換テスト"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_dir = Path(temp_dir) / "input"
+            output_dir = Path(temp_dir) / "output"
+            input_dir.mkdir()
+            (input_dir / "test1.md").write_text("| A | B |\n|---|---|\n| 1 | 2 |")
+            
+            runner = CliRunner()
+            args = [str(input_dir), '--output', str(output_dir), '--incremental', '--verbose']
+            first = runner.invoke(cli, args)
+            second = runner.invoke(cli, args)
+            
+            assert first.exit_code == 0
+            assert second.exit_code == 0
+            assert '変更なし' not in first.output
+            assert '変更なし' in second.output
+            assert (output_dir / "test1.xlsx").exists()
+    
     def test_empty_markdown_file_handling(self):
         """空のMarkdownファイルの処理テスト"""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -267,4 +508,53 @@ This is just regular text without any tables.
             )
             
             # 空のExcelファイルが作成されることを確認
-            assert output_file.exists()
\ No newline at end of file
+            assert output_file.exists()
+
+class TestCLIStartup:
+    """CLI起動時に重いモジュールを読み込まないことのテスト（別プロセスで計測）"""
+    
+    PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+    
+    # 指定したCLI引数で実行し、読み込まれたモジュール名と所要時間を出力するスクリプト
+    SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from click.testing import CliRunner
+from src.cli import cli
+result = CliRunner().invoke(cli, sys.argv[1:])
+assert result.exit_code == 0, result.output
+print(time.perf_counter() - start)
+print(' '.join(name for name in ('pandas', 'openpyxl') if name in sys.modules))
+"""
+    
+    def run_cli(self, *args):
+        """CLIを別プロセスで実行し、(所要時間, 読み込まれた重いモジュール) を返す"""
+        completed = subprocess.run(
+            [sys.executable, '-c', self.SCRIPT, *args],
+            cwd=self.PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        elapsed, modules = (completed.stdout.splitlines() + [''])[:2]
+        return float(elapsed), modules.split()
+    
+    def test_help_does_not_import_heavy_modules(self):
+        """--help でpandas・openpyxlを読み込まないことのテスト"""
+        elapsed, modules = self.run_cli('--help')
+        
+        assert modules == []
+        # 目安: pandas/openpyxlを読み込んでいた頃は約0.8秒
+        assert elapsed < 5.0
+    
+    def test_small_conversion_does_not_import_pandas(self):
+        """小さなファイルの変換でpandasを読み込まないことのテスト"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "small.md"
+            input_file.write_text("| A | B |\n|---|---|\n| 1 | 2 |\n", encoding='utf-8')
+            output_file = Path(temp_dir) / "small.xlsx"
+            
+            _, modules = self.run_cli(str(input_file), '-o', str(output_file), '--format', '--auto-width')
+            
+            assert 'pandas' not in modules
+            assert output_file.exists()
@@ -1,10 +1,14 @@
 import pytest
 import pandas as pd
+import datetime
+import zipfile
 import tempfile
 import os
+from io import BytesIO
 from pathlib import Path
 from openpyxl import load_workbook
 from src.converter import ExcelConverter
+from src.stats import ConversionStats
 
 
 class TestExcelConverter:
@@ -223,6 +227,76 @@ class TestExcelConverter:
                 if os.path.exists(tmp_file.name):
                     os.unlink(tmp_file.name)
     
+    @pytest.mark.parametrize('engine', ['openpyxl', 'native'])
+    def test_auto_adjust_column_width_east_asian(self, engine):
+        """全角文字を2文字分の幅として列幅を調整するテスト"""
+        tables_data = [{
+            'headers': ['住所', 'Code'],
+            'rows': [['東京都千代田区丸の内一丁目', 'A-1'], ['大阪府', 'B-22']],
+            'alignment': ['left', 'left']
+        }]
+        
+        sheet = load_workbook(BytesIO(
+            ExcelConverter(engine=engine).convert_to_bytes(tables_data, auto_adjust_width=True)
+        )).active
+        assert sheet.column_dimensions['A'].width == 28
+        assert sheet.column_dimensions['B'].width == 10
+        
+        # 先頭の行だけから見積もる
+        sheet = load_workbook(BytesIO(
+            ExcelConverter(engine=engine, width_sample_rows=0).convert_to_bytes(tables_data, auto_adjust_width=True)
+        )).active
+        assert sheet.column_dimensions['A'].width == 10
+    
+    def test_sparse_mode(self):
+        """空のセルを作成しないモードで値と書式が同じになることのテスト"""
+        tables_data = [{
+            'headers': ['名前', '', '備考'],
+            'rows': [['りんご', '', ''], ['', '120', 'メモ']],
+            'alignment': ['left', 'right', 'center']
+        }]
+        
+        results = {}
+        for sparse in (False, True):
+            converter = ExcelConverter(sparse=sparse)
+            workbook = converter._build_workbook(tables_data, True, False, ConversionStats())
+            results[sparse] = workbook.active
+        
+        dense, sparse_sheet = results[False], results[True]
+        assert len(sparse_sheet._cells) == 5
+        assert len(dense._cells) == 9
+        assert [[c.value for c in row] for row in sparse_sheet.iter_rows()] == \
+            [[c.value for c in row] for row in dense.iter_rows()]
+        assert sparse_sheet['A2'].font.bold == False
+        assert sparse_sheet['B3'].alignment.horizontal == 'right'
+        # 空のセルの書式は列・行全体の書式で補う
+        assert sparse_sheet.row_dimensions[1].font.bold == True
+        assert sparse_sheet.column_dimensions['B'].alignment.horizontal == 'right'
+        assert sparse_sheet.column_dimensions['B'].font.name == 'Arial'
+    
+    def test_sparse_mode_streaming(self):
+        """ストリーミング変換で空のセルが書き出されないことのテスト"""
+        converter = ExcelConverter(sparse=True)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_file = os.path.join(temp_dir, "sparse.xlsx")
+            tables = iter([{'headers': ['A', 'B'], 'rows': iter([['1', ''], ['', '2']]), 'alignment': ['left', 'right']}])
+            converter.convert_to_excel_streaming(tables, output_file, apply_formatting=True)
+            
+            with zipfile.ZipFile(output_file) as archive:
+                sheet_xml = archive.read('xl/worksheets/sheet1.xml').decode('utf-8')
+            assert 'r="B2"' not in sheet_xml
+            assert 'r="A3"' not in sheet_xml
+            
+            sheet = load_workbook(output_file).active
+            assert sheet['B3'].value == '2'
+            assert sheet['B3'].alignment.horizontal == 'right'
+    
+    def test_invalid_width_sample_rows(self):
+        """負の列幅算出行数がエラーになることのテスト"""
+        with pytest.raises(ValueError):
+            ExcelConverter(width_sample_rows=-1)
+    
     def test_invalid_output_path(self):
         """無効な出力パスのエラーハンドリングテスト"""
         table_data = {
@@ -237,4 +311,202 @@ class TestExcelConverter:
         invalid_path = '/nonexistent/directory/output.xlsx'
         
         with pytest.raises(Exception):
-            converter.convert_to_excel([table_data], invalid_path)
\ No newline at end of file
+            converter.convert_to_excel([table_data], invalid_path)
+    
+    def test_convert_to_excel_streaming(self):
+        """write-onlyモードでの逐次変換テスト"""
+        def rows():
+            for i in range(250):
+                yield [f'Item{i}', str(i), '']
+        
+        tables_data = iter([
+            {
+                'headers': ['Name', 'Value', 'Note'],
+                'rows': rows(),
+                'alignment': ['left', 'right', 'center']
+            },
+            {
+                'headers': ['Country', 'Capital'],
+                'rows': iter([['Japan', 'Tokyo']]),
+                'alignment': ['left', 'left']
+            }
+        ])
+        
+        converter = ExcelConverter()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_file = os.path.join(temp_dir, 'streaming.xlsx')
+            table_count = converter.convert_to_excel_streaming(
+                tables_data,
+                output_file,
+                apply_formatting=True,
+                auto_adjust_width=True
+            )
+            
+            assert table_count == 2
+            
+            workbook = load_workbook(output_file)
+            assert workbook.sheetnames == ['Table1', 'Table2']
+            
+            sheet1 = workbook['Table1']
+            assert sheet1['A1'].value == 'Name'
+            assert sheet1['A1'].font.bold == True
+            assert sheet1['B2'].alignment.horizontal == 'right'
+            assert sheet1['A251'].value == 'Item249'
+            assert sheet1['C2'].value is None
+            assert sheet1.column_dimensions['A'].width > 8.43
+            
+            assert workbook['Table2']['B2'].value == 'Tokyo'
+    
+    def test_convert_to_excel_streaming_sheet_names(self):
+        """逐次変換時のシート名が通常変換と一致することのテスト"""
+        converter = ExcelConverter()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            single_file = os.path.join(temp_dir, 'single.xlsx')
+            converter.convert_to_excel_streaming(
+                [{'headers': ['A'], 'rows': iter([['1']]), 'alignment': ['left']}],
+                single_file
+            )
+            assert load_workbook(single_file).sheetnames == ['Sheet1']
+            
+            empty_file = os.path.join(temp_dir, 'empty.xlsx')
+            assert converter.convert_to_excel_streaming([], empty_file) == 0
+            assert load_workbook(empty_file).sheetnames == ['Sheet1']
+    
+    def test_convert_to_bytes(self):
+        """メモリ上でのxlsxバイト列への変換テスト"""
+        table_data = {
+            'headers': ['Name', 'Age'],
+            'rows': [['Alice', '25']],
+            'alignment': ['left', 'right']
+        }
+        
+        converter = ExcelConverter()
+        excel_bytes = converter.convert_to_bytes([table_data], apply_formatting=True)
+        
+        # xlsx（ZIP）形式であることを確認
+        assert excel_bytes[:2] == b'PK'
+        
+        workbook = load_workbook(BytesIO(excel_bytes))
+        sheet = workbook.active
+        assert sheet['A1'].value == 'Name'
+        assert sheet['A1'].font.bold == True
+        assert sheet['B2'].value == '25'
+    
+    def test_convert_to_stream(self):
+        """バイナリストリームへの変換テスト"""
+        table_data = {
+            'headers': ['Product', 'Price'],
+            'rows': [['Apple', '100']],
+            'alignment': ['left', 'right']
+        }
+        
+        converter = ExcelConverter()
+        stream = BytesIO()
+        converter.convert_to_stream([table_data], stream)
+        
+        stream.seek(0)
+        workbook = load_workbook(stream)
+        assert workbook.active['A2'].value == 'Apple'
+    
+    def test_formatting_shares_registered_styles(self):
+        """書式設定でスタイルが組み合わせごとに1つだけ登録されることのテスト"""
+        table_data = {
+            'headers': ['Name', 'Score', 'Note'],
+            'rows': [[f'name{i}', str(i), ''] for i in range(200)],
+            'alignment': ['left', 'right', 'center']
+        }
+        
+        converter = ExcelConverter()
+        excel_bytes = converter.convert_to_bytes([table_data, table_data], apply_formatting=True)
+        
+        workbook = load_workbook(BytesIO(excel_bytes))
+        # 既定スタイル + (ヘッダー/データ) × アライメント3種
+        assert len(workbook._cell_styles) == 7
+        for sheet in workbook.worksheets:
+            assert sheet['B1'].font.bold == True
+            assert sheet['B201'].alignment.horizontal == 'right'
+            assert sheet['C201'].alignment.horizontal == 'center'
+            assert sheet['C201'].font.bold == False
+            assert sheet.column_dimensions['B'].alignment.horizontal == 'right'
+    
+    def test_native_engine_matches_openpyxl(self):
+        """nativeエンジンの出力がopenpyxlエンジンと同じ内容になることのテスト"""
+        tables_data = [
+            {
+                'headers': ['名前', '価格', '備考'],
+                'rows': [['りんご', '120', ''], ['A & B', '<1>', 'メモ']],
+                'alignment': ['left', 'right', 'center']
+            },
+            {
+                'headers': ['X'],
+                'rows': [['1']],
+                'alignment': ['left']
+            }
+        ]
+        
+        results = {}
+        for engine in ('openpyxl', 'native'):
+            converter = ExcelConverter(engine=engine)
+            excel_bytes = converter.convert_to_bytes(tables_data, apply_formatting=True, auto_adjust_width=True)
+            results[engine] = load_workbook(BytesIO(excel_bytes))
+        
+        expected, actual = results['openpyxl'], results['native']
+        assert actual.sheetnames == expected.sheetnames
+        for expected_sheet, actual_sheet in zip(expected.worksheets, actual.worksheets):
+            assert [[c.value for c in row] for row in actual_sheet.iter_rows()] == \
+                [[c.value for c in row] for row in expected_sheet.iter_rows()]
+            assert actual_sheet.column_dimensions['A'].width == expected_sheet.column_dimensions['A'].width
+        
+        sheet = actual['Table1']
+        assert sheet['A1'].font.bold == True
+        assert sheet['B2'].alignment.horizontal == 'right'
+    
+    def test_native_engine_streaming(self):
+        """nativeエンジンでのストリーミング変換テスト"""
+        converter = ExcelConverter(engine='native')
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_file = os.path.join(temp_dir, "native.xlsx")
+            tables = iter([{'headers': ['A'], 'rows': iter([['1'], ['2']]), 'alignment': ['left']}])
+            
+            assert converter.convert_to_excel_streaming(tables, output_file, auto_adjust_width=True) == 1
+            
+            sheet = load_workbook(output_file)['Sheet1']
+            assert sheet['A3'].value == '2'
+    
+    @pytest.mark.parametrize('engine', ['openpyxl', 'native'])
+    @pytest.mark.parametrize('apply_formatting', [False, True])
+    def test_typed_values_with_number_formats(self, engine, apply_formatting):
+        """型推定したテーブルが数値・日付と表示形式付きで書き出されることのテスト"""
+        from src.inference import infer_types
+        
+        tables_data = infer_types([{
+            'headers': ['数量', '割合', '日付', '名前'],
+            'rows': [['1,200', '12.5%', '2024-01-05', 'りんご'], ['3', '', '2024-12-31', '']],
+            'alignment': ['right', 'right', 'center', 'left']
+        }])
+        
+        converter = ExcelConverter(engine=engine)
+        excel_bytes = converter.convert_to_bytes(tables_data, apply_formatting=apply_formatting)
+        sheet = load_workbook(BytesIO(excel_bytes)).active
+        
+        assert sheet['A2'].value == 1200
+        assert sheet['A2'].number_format == '#,##0'
+        assert sheet['B2'].value == 0.125
+        assert sheet['B2'].number_format == '0.0%'
+        assert sheet['C3'].value.date() == datetime.date(2024, 12, 31)
+        assert sheet['C3'].number_format == 'yyyy-mm-dd'
+        assert sheet['D2'].value == 'りんご'
+        assert sheet['D2'].number_format == 'General'
+        assert sheet['A1'].value == '数量'
+        if apply_formatting:
+            assert sheet['A1'].font.bold == True
+            assert sheet['A2'].alignment.horizontal == 'right'
+            assert sheet['A2'].font.name == 'Arial'
+    
+    def test_unknown_engine(self):
+        """未対応のエンジン指定がエラーになることのテスト"""
+        with pytest.raises(ValueError):
+            ExcelConverter(engine='xlsxwriter')
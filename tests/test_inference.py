@@ -0,0 +1,78 @@
+import datetime
+
+import pytest
+from src.inference import infer_column, infer_table_types, infer_types
+from src.table import Table
+
+
+class TestInferColumn:
+    """列の型推定のテスト"""
+    
+    @pytest.mark.parametrize('values, expected_values, expected_format', [
+        (['1', '-2', ''], [1, -2, ''], '0'),
+        (['1,234', '5'], [1234, 5], '#,##0'),
+        (['1.5', '2'], [1.5, 2.0], '0.0'),
+        (['1e3', '2.5'], [1000.0, 2.5], '0.00E+00'),
+        (['10%', '12.5%'], [0.1, 0.125], '0.0%'),
+        (['¥1,000', '-¥20'], [1000.0, -20.0], '"¥"#,##0'),
+        (['$1.50', '$2'], [1.5, 2.0], '"$"#,##0.00'),
+        (['2024-01-05', ''], [datetime.date(2024, 1, 5), ''], 'yyyy-mm-dd'),
+        (['true', 'FALSE'], [True, False], None),
+    ])
+    def test_typed_columns(self, values, expected_values, expected_format):
+        """型ごとの値の変換と表示形式のテスト"""
+        typed_values, number_format = infer_column(values)
+        
+        assert typed_values == expected_values
+        assert [type(value) for value in typed_values] == [type(value) for value in expected_values]
+        assert number_format == expected_format
+    
+    @pytest.mark.parametrize('values', [
+        ['a', '1'],
+        ['007', '1'],
+        ['1234567890123456'],
+        ['$1', '€2'],
+        ['2024-02-30'],
+        ['', ''],
+        ['1.0e400', '2'],
+        ['-1e309'],
+    ])
+    def test_untyped_columns(self, values):
+        """型を推定できない列が文字列のまま残ることのテスト"""
+        assert infer_column(values) == (values, None)
+    
+    def test_repeated_values(self):
+        """重複する値を含む列が元の位置に展開されることのテスト"""
+        values = ['3', '', '1', '3', '1'] * 1000
+        
+        typed_values, _ = infer_column(values)
+        
+        assert typed_values == [3, '', 1, 3, 1] * 1000
+
+
+class TestInferTableTypes:
+    """テーブルの型推定のテスト"""
+    
+    def test_infer_table_types(self):
+        """列ごとに型と表示形式が設定されることのテスト"""
+        table = Table.from_rows(
+            ['名前', '数量', '日付'],
+            [['りんご', '3', '2024-01-05'], ['みかん', '10', '']],
+            ['left', 'right', 'center']
+        )
+        
+        typed = infer_table_types(table)
+        
+        assert typed.headers == ['名前', '数量', '日付']
+        assert typed.alignment == ['left', 'right', 'center']
+        assert typed['rows'] == [['りんご', 3, datetime.date(2024, 1, 5)], ['みかん', 10, '']]
+        assert typed.number_formats == [None, '0', 'yyyy-mm-dd']
+        # 元のテーブルは変更しない
+        assert table['rows'][0] == ['りんご', '3', '2024-01-05']
+    
+    def test_infer_types_from_dicts(self):
+        """辞書形式のテーブルデータも変換できることのテスト"""
+        tables = infer_types([{'headers': ['A'], 'rows': [['1'], ['2']], 'alignment': ['left']}])
+        
+        assert tables[0]['rows'] == [[1], [2]]
+        assert tables[0].number_formats == ['0']
@@ -1,11 +1,21 @@
 import pytest
 import tempfile
 import os
+from io import BytesIO
 from pathlib import Path
 from openpyxl import load_workbook
 from src.integration import MarkdownToExcelProcessor
 
 
+class CrashingProcessor(MarkdownToExcelProcessor):
+    """特定のファイルでワーカープロセスを異常終了させるプロセッサ（並列処理のテスト用）"""
+    
+    def process_file(self, input_file, output_file, *args, **kwargs):
+        if os.path.basename(input_file) == 'crash.md':
+            os._exit(1)
+        return super().process_file(input_file, output_file, *args, **kwargs)
+
+
 class TestMarkdownToExcelIntegration:
     """Parser + Converter + CLIの統合テスト"""
     
@@ -359,4 +369,499 @@ class TestMarkdownToExcelIntegration:
             
             assert sheet['A6'].value == 'العربية'
             assert sheet['B6'].value == 'مرحبا'
-            assert sheet['C6'].value == '🇸🇦'
\ No newline at end of file
+            assert sheet['C6'].value == '🇸🇦'
+    
+    def test_end_to_end_streaming_conversion(self):
+        """ストリーミングモードのエンドツーエンド変換テスト"""
+        markdown_content = """# 在庫
+
+| 商品名 | 在庫数 |
+|--------|-------:|
+| りんご | 50 |
+| みかん | 30 |
+
+説明文
+
+| 店舗 | 地域 |
+|------|------|
+| 本店 | 東京 |
+"""
+        
+        processor = MarkdownToExcelProcessor()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "stock.md"
+            output_file = Path(temp_dir) / "stock.xlsx"
+            
+            input_file.write_text(markdown_content, encoding='utf-8')
+            
+            result = processor.process_file(
+                str(input_file),
+                str(output_file),
+                apply_formatting=True,
+                auto_adjust_width=True,
+                streaming=True
+            )
+            
+            assert result.success == True
+            assert result.tables_found == 2
+            assert result.warnings == []
+            
+            workbook = load_workbook(output_file)
+            assert workbook.sheetnames == ['Table1', 'Table2']
+            assert workbook['Table1']['A3'].value == 'みかん'
+            assert workbook['Table1']['B2'].alignment.horizontal == 'right'
+            assert workbook['Table2']['B2'].value == '東京'
+    
+    def test_end_to_end_streaming_no_tables(self):
+        """ストリーミングモードでテーブルがない場合の警告テスト"""
+        processor = MarkdownToExcelProcessor()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "prose.md"
+            output_file = Path(temp_dir) / "prose.xlsx"
+            
+            input_file.write_text("# タイトル\n\n本文のみ\n", encoding='utf-8')
+            
+            result = processor.process_file(
+                str(input_file),
+                str(output_file),
+                streaming=True
+            )
+            
+            assert result.success == True
+            assert result.tables_found == 0
+            assert "No tables found in the input file" in result.warnings
+            assert output_file.exists()
+    
+    def test_end_to_end_parallel_batch_processing(self):
+        """プロセスプールによる並列バッチ処理のテスト"""
+        processor = MarkdownToExcelProcessor()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_dir = Path(temp_dir) / "input"
+            output_dir = Path(temp_dir) / "output"
+            input_dir.mkdir()
+            
+            for i in range(6):
+                (input_dir / f"file{i}.md").write_text(
+                    f"| ID | 値 |\n|----|----|\n| {i} | {i * 10} |\n",
+                    encoding='utf-8'
+                )
+            # 不正なUTF-8のファイル（このファイルだけ失敗する）
+            (input_dir / "broken.md").write_bytes(b"| A |\n|---|\n| \xff\xfe |\n")
+            
+            sequential = processor.process_directory(str(input_dir), str(output_dir))
+            results = processor.process_directory(
+                str(input_dir),
+                str(output_dir),
+                max_workers=3
+            )
+            
+            # 入力順に結果が返ることを確認
+            assert [r.input_file for r in results] == [r.input_file for r in sequential]
+            assert len(results) == 7
+            
+            # 失敗は該当ファイルのみに閉じていることを確認
+            failed = [r for r in results if not r.success]
+            assert len(failed) == 1
+            assert failed[0].input_file.endswith("broken.md")
+            assert failed[0].errors
+            
+            workbook = load_workbook(output_dir / "file5.xlsx")
+            assert workbook.active['B2'].value == '50'
+    
+    def test_parallel_batch_processing_worker_crash(self):
+        """ワーカープロセスの異常終了が原因のファイルの失敗だけに閉じていることのテスト"""
+        processor = CrashingProcessor()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_dir = Path(temp_dir) / "input"
+            output_dir = Path(temp_dir) / "output"
+            input_dir.mkdir()
+            
+            for i in range(7):
+                (input_dir / f"file{i}.md").write_text(f"| ID |\n|----|\n| {i} |\n", encoding='utf-8')
+            (input_dir / "crash.md").write_text("| ID |\n|----|\n| x |\n", encoding='utf-8')
+            
+            reported = []
+            results = processor.process_directory(
+                str(input_dir),
+                str(output_dir),
+                max_workers=2,
+                progress_callback=reported.append
+            )
+            
+            assert len(results) == 8
+            assert len(reported) == 8
+            failed = [r for r in results if not r.success]
+            assert len(failed) == 1
+            assert failed[0].input_file.endswith("crash.md")
+            assert failed[0].errors[0].startswith("Worker process failed")
+            assert all((output_dir / f"file{i}.xlsx").exists() for i in range(7))
+    
+    def test_batch_processing_progress_callback(self):
+        """一括変換の進捗コールバックがファイルごとに呼び出されることのテスト"""
+        processor = MarkdownToExcelProcessor()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_dir = Path(temp_dir) / "input"
+            output_dir = Path(temp_dir) / "output"
+            input_dir.mkdir()
+            
+            for i in range(3):
+                (input_dir / f"file{i}.md").write_text(f"| A |\n|---|\n| {i} |\n", encoding='utf-8')
+            
+            for max_workers in (1, 2):
+                reported = []
+                results = processor.process_directory(
+                    str(input_dir),
+                    str(output_dir),
+                    max_workers=max_workers,
+                    progress_callback=reported.append
+                )
+                
+                assert len(reported) == 3
+                assert sorted(r.input_file for r in reported) == sorted(r.input_file for r in results)
+                assert all(r.success for r in reported)
+    
+    def test_process_string_in_memory(self):
+        """Markdown文字列のメモリ上での変換テスト"""
+        markdown_content = """| 商品名 | 価格 |
+|--------|------|
+| りんご | 120 |
+"""
+        processor = MarkdownToExcelProcessor()
+        excel_bytes, result = processor.process_string(markdown_content, apply_formatting=True)
+        
+        assert result.success == True
+        assert result.tables_found == 1
+        assert result.processing_time_seconds is not None
+        
+        workbook = load_workbook(BytesIO(excel_bytes))
+        sheet = workbook.active
+        assert sheet['A1'].value == '商品名'
+        assert sheet['B2'].value == '120'
+    
+    def test_process_string_without_tables(self):
+        """テーブルを含まない文字列の変換テスト"""
+        processor = MarkdownToExcelProcessor()
+        excel_bytes, result = processor.process_string("# 見出しのみ\n")
+        
+        assert result.success == True
+        assert result.tables_found == 0
+        assert "No tables found in the input file" in result.warnings
+        assert load_workbook(BytesIO(excel_bytes)).sheetnames == ['Sheet1']
+    
+    def test_process_string_rejects_non_string(self):
+        """文字列以外の入力が例外ではなく失敗の処理結果になることのテスト"""
+        excel_bytes, result = MarkdownToExcelProcessor().process_string(5)
+        
+        assert excel_bytes is None
+        assert result.success == False
+        assert result.errors == ["Markdown content must be a string, not int"]
+    
+    def test_process_file_with_cache(self):
+        """キャッシュ有効時に2回目の変換がキャッシュから返ることのテスト"""
+        from src.cache import ConversionCache
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            processor = MarkdownToExcelProcessor(cache=ConversionCache(os.path.join(temp_dir, 'cache')))
+            input_file = Path(temp_dir) / "data.md"
+            input_file.write_text("| 名前 | 値 |\n|------|----|\n| A | 1 |\n", encoding='utf-8')
+            
+            first = processor.process_file(str(input_file), str(Path(temp_dir) / "first.xlsx"))
+            second = processor.process_file(str(input_file), str(Path(temp_dir) / "second.xlsx"))
+            formatted = processor.process_file(
+                str(input_file),
+                str(Path(temp_dir) / "formatted.xlsx"),
+                apply_formatting=True
+            )
+            
+            assert first.success and not first.cache_hit
+            assert second.success and second.cache_hit
+            assert second.tables_found == 1
+            assert formatted.success and not formatted.cache_hit
+            assert (Path(temp_dir) / "second.xlsx").read_bytes() == (Path(temp_dir) / "first.xlsx").read_bytes()
+    
+    def test_process_string_with_cache(self):
+        """process_string() のキャッシュ利用テスト"""
+        from src.cache import ConversionCache
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            processor = MarkdownToExcelProcessor(cache=ConversionCache(temp_dir))
+            
+            first_bytes, first = processor.process_string("# 見出し\n")
+            second_bytes, second = processor.process_string("# 見出し\n")
+            
+            assert not first.cache_hit
+            assert second.cache_hit
+            assert second_bytes == first_bytes
+            assert second.warnings == first.warnings
+    
+    def test_process_stream_in_memory(self):
+        """バイナリストリームのメモリ上での変換テスト"""
+        markdown_content = "| 商品名 | 価格 |\n|--------|------|\n| りんご | 120 |\n"
+        processor = MarkdownToExcelProcessor()
+        
+        excel_bytes, result = processor.process_stream(
+            BytesIO(markdown_content.encode('utf-8')), input_name='data.md'
+        )
+        
+        assert result.success == True
+        assert result.input_file == 'data.md'
+        assert result.output_file == ''
+        assert result.tables_found == 1
+        assert result.stats.input_bytes == len(markdown_content.encode('utf-8'))
+        
+        sheet = load_workbook(BytesIO(excel_bytes)).active
+        assert sheet['A1'].value == '商品名'
+        assert sheet['B2'].value == '120'
+    
+    def test_process_stream_to_file_shares_cache(self):
+        """ファイルに出力するストリーム変換が process_file() とキャッシュを共有することのテスト"""
+        from src.cache import ConversionCache
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            processor = MarkdownToExcelProcessor(cache=ConversionCache(os.path.join(temp_dir, 'cache')))
+            input_file = Path(temp_dir) / "data.md"
+            input_file.write_text("| 名前 | 値 |\n|------|----|\n| A | 1 |\n", encoding='utf-8')
+            
+            first = processor.process_file(str(input_file), str(Path(temp_dir) / "first.xlsx"))
+            output_file = Path(temp_dir) / "out" / "stream.xlsx"
+            with open(input_file, 'rb') as stream:
+                excel_bytes, second = processor.process_stream(stream, str(output_file))
+            
+            assert first.success and not first.cache_hit
+            assert second.success and second.cache_hit
+            assert excel_bytes is None
+            assert second.output_file == str(output_file)
+            assert output_file.read_bytes() == (Path(temp_dir) / "first.xlsx").read_bytes()
+    
+    def test_whitespace_only_input_warnings(self):
+        """空白文字のみの入力がどの入力方法でも同じ警告になることのテスト"""
+        from src.cache import ConversionCache
+        
+        expected = ["Input file is empty", "No tables found in the input file"]
+        content = "   \n\n\u3000\n"
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "blank.md"
+            input_file.write_text(content, encoding='utf-8')
+            
+            processor = MarkdownToExcelProcessor()
+            _, streamed = processor.process_stream(BytesIO(content.encode('utf-8')))
+            assert streamed.warnings == expected
+            for streaming, use_mmap in ((False, True), (True, False), (True, True)):
+                result = processor.process_file(
+                    str(input_file),
+                    str(Path(temp_dir) / f"out_{streaming}_{use_mmap}.xlsx"),
+                    streaming=streaming,
+                    use_mmap=use_mmap
+                )
+                assert result.warnings == expected
+            
+            # ストリームの変換で作成したキャッシュを process_file() で使っても警告は同じ
+            cached = MarkdownToExcelProcessor(cache=ConversionCache(os.path.join(temp_dir, 'cache')))
+            cached.process_stream(BytesIO(content.encode('utf-8')))
+            result = cached.process_file(str(input_file), str(Path(temp_dir) / "cached.xlsx"))
+            assert result.cache_hit
+            assert result.warnings == expected
+    
+    def test_process_stream_invalid_utf8(self):
+        """UTF-8として読めないストリームの変換が失敗することのテスト"""
+        processor = MarkdownToExcelProcessor()
+        
+        excel_bytes, result = processor.process_stream(BytesIO(b"| A |\n|---|\n| \xff\xfe |\n"))
+        
+        assert excel_bytes is None
+        assert result.success == False
+        assert result.errors[0].startswith("Failed to read input file")
+    
+    def test_incremental_batch_processing(self):
+        """差分変換で変更のないファイルがスキップされることのテスト"""
+        processor = MarkdownToExcelProcessor()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_dir = Path(temp_dir) / "input"
+            output_dir = Path(temp_dir) / "output"
+            input_dir.mkdir()
+            
+            (input_dir / "file1.md").write_text("| A |\n|---|\n| 1 |\n", encoding='utf-8')
+            (input_dir / "file2.md").write_text("| B |\n|---|\n| 2 |\n", encoding='utf-8')
+            
+            first = processor.process_directory(str(input_dir), str(output_dir), incremental=True)
+            assert all(r.success and not r.skipped for r in first)
+            
+            second = processor.process_directory(str(input_dir), str(output_dir), incremental=True)
+            assert all(r.success and r.skipped for r in second)
+            assert [r.tables_found for r in second] == [1, 1]
+            
+            # 1ファイルだけ変更
+            (input_dir / "file2.md").write_text("| B |\n|---|\n| 2 |\n| 3 |\n", encoding='utf-8')
+            third = processor.process_directory(str(input_dir), str(output_dir), incremental=True)
+            
+            stats = processor.get_statistics(third)
+            assert stats['successful_files'] == 1
+            assert stats['skipped_files'] == 1
+            assert stats['failed_files'] == 0
+            
+            changed = [r for r in third if not r.skipped]
+            assert changed[0].input_file.endswith("file2.md")
+            assert load_workbook(output_dir / "file2.xlsx").active['A3'].value == '3'
+            
+            # オプションが変わった場合は再変換
+            formatted = processor.process_directory(
+                str(input_dir),
+                str(output_dir),
+                apply_formatting=True,
+                incremental=True
+            )
+            assert not any(r.skipped for r in formatted)
+    
+    def test_incremental_input_changed_during_conversion(self):
+        """変換中に更新された入力が、次回の差分変換で変換済みとして扱われないことのテスト"""
+        processor = MarkdownToExcelProcessor()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_dir = Path(temp_dir) / "input"
+            output_dir = Path(temp_dir) / "output"
+            input_dir.mkdir()
+            input_file = input_dir / "file1.md"
+            input_file.write_text("| A |\n|---|\n| 1 |\n", encoding='utf-8')
+            
+            # 解析中（読み込み後）に入力を書き換える
+            original_parse = processor.parser.parse
+            
+            def parse_and_modify(markdown_content, **kwargs):
+                input_file.write_text("| A |\n|---|\n| 1 |\n| 2 |\n", encoding='utf-8')
+                return original_parse(markdown_content, **kwargs)
+            
+            processor.parser.parse = parse_and_modify
+            first = processor.process_directory(str(input_dir), str(output_dir), incremental=True)
+            processor.parser.parse = original_parse
+            assert first[0].success and not first[0].skipped
+            
+            second = processor.process_directory(str(input_dir), str(output_dir), incremental=True)
+            assert not second[0].skipped
+            assert load_workbook(output_dir / "file1.xlsx").active['A3'].value == '2'
+    
+    def test_processing_stats(self):
+        """段階別の所要時間と処理量が記録されることのテスト"""
+        processor = MarkdownToExcelProcessor()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "data.md"
+            input_file.write_text(
+                "# 見出し\n\n| 名前 | 値 |\n|------|----|\n| A | 1 |\n| B | 2 |\n",
+                encoding='utf-8'
+            )
+            output_file = Path(temp_dir) / "data.xlsx"
+            
+            result = processor.process_file(
+                str(input_file),
+                str(output_file),
+                apply_formatting=True,
+                auto_adjust_width=True
+            )
+            streamed = processor.process_file(
+                str(input_file),
+                str(Path(temp_dir) / "streamed.xlsx"),
+                streaming=True
+            )
+            
+            stats = result.stats
+            assert set(stats.stage_seconds) == {'read', 'parse', 'build', 'format', 'width', 'save'}
+            assert stats.input_bytes == input_file.stat().st_size
+            assert stats.lines_scanned == 7
+            assert stats.rows == 2
+            assert stats.cells_written == 6
+            assert stats.output_bytes == output_file.stat().st_size
+            
+            assert streamed.stats.lines_scanned == 6
+            assert streamed.stats.rows == 2
+            assert streamed.stats.cells_written == 6
+            
+            summary = processor.get_statistics([result, streamed])
+            assert summary['total_rows'] == 4
+            assert summary['total_cells_written'] == 12
+            assert summary['stages']['build']['total'] >= summary['stages']['build']['p50']
+            assert set(summary['processing_time_percentiles']) == {'p50', 'p95', 'p99'}
+    
+    def test_process_file_with_mmap(self):
+        """メモリマップ入力での変換テスト"""
+        processor = MarkdownToExcelProcessor()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "log.md"
+            input_file.write_text(
+                "ログ行\n" * 100 + "| 名前 | 値 |\n|------|----|\n| A | 1 |\n" + "ログ行\n" * 100,
+                encoding='utf-8'
+            )
+            
+            for streaming in (False, True):
+                output_file = Path(temp_dir) / f"out_{streaming}.xlsx"
+                result = processor.process_file(
+                    str(input_file),
+                    str(output_file),
+                    streaming=streaming,
+                    use_mmap=True
+                )
+                
+                assert result.success == True
+                assert result.tables_found == 1
+                assert result.stats.input_bytes == input_file.stat().st_size
+                assert load_workbook(output_file).active['A2'].value == 'A'
+            
+            empty_file = Path(temp_dir) / "empty.md"
+            empty_file.write_text("", encoding='utf-8')
+            result = processor.process_file(str(empty_file), str(Path(temp_dir) / "empty.xlsx"), use_mmap=True)
+            assert result.success == True
+            assert "Input file is empty" in result.warnings
+    
+    def test_process_file_with_type_inference(self):
+        """型推定を有効にした変換テスト"""
+        processor = MarkdownToExcelProcessor()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "sales.md"
+            output_file = Path(temp_dir) / "sales.xlsx"
+            input_file.write_text(
+                "| 商品 | 価格 | 在庫 |\n|------|-----:|------|\n| りんご | ¥120 | true |\n| みかん | ¥80 | false |\n",
+                encoding='utf-8'
+            )
+            
+            result = processor.process_file(str(input_file), str(output_file), infer_types=True)
+            
+            assert result.success == True
+            assert 'infer' in result.stats.stage_seconds
+            sheet = load_workbook(output_file).active
+            assert sheet['B2'].value == 120
+            assert sheet['B2'].number_format == '"¥"#,##0'
+            assert sheet['C3'].value == False
+            
+            # 型推定なしの場合は文字列のまま
+            processor.process_file(str(input_file), str(output_file))
+            assert load_workbook(output_file).active['B2'].value == '¥120'
+            
+            excel_data, string_result = processor.process_string(input_file.read_text(encoding='utf-8'), infer_types=True)
+            assert string_result.success == True
+            assert load_workbook(BytesIO(excel_data)).active['B3'].value == 80
+    
+    def test_type_inference_not_supported_in_streaming(self):
+        """ストリーミング変換で型推定を指定するとエラーになることのテスト"""
+        processor = MarkdownToExcelProcessor()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "test.md"
+            input_file.write_text("| A |\n|---|\n| 1 |\n", encoding='utf-8')
+            
+            result = processor.process_file(
+                str(input_file),
+                str(Path(temp_dir) / "test.xlsx"),
+                streaming=True,
+                infer_types=True
+            )
+            
+            assert result.success == False
+            assert "Type inference is not supported in streaming mode" in result.errors
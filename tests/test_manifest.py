@@ -0,0 +1,67 @@
+import os
+import tempfile
+from pathlib import Path
+from src.cache import ConversionCache
+from src.manifest import BuildManifest
+
+
+class TestBuildManifest:
+
+    def setup_method(self):
+        """各テストメソッドの前に実行される初期化"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_file = Path(self.temp_dir.name) / "input.md"
+        self.output_file = Path(self.temp_dir.name) / "input.xlsx"
+        self.input_file.write_text("| A |\n|---|\n| 1 |\n")
+        self.output_file.write_bytes(b"xlsx")
+        self.options = {'apply_formatting': False}
+    
+    def teardown_method(self):
+        """各テストメソッドの後に実行される後処理"""
+        self.temp_dir.cleanup()
+    
+    def _record(self, manifest):
+        stat = os.stat(self.input_file)
+        input_state = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': ConversionCache.file_digest(str(self.input_file))
+        }
+        manifest.record(str(self.input_file), str(self.output_file), self.options, 1, [], input_state)
+    
+    def test_record_and_lookup_persisted(self):
+        """記録したエントリが保存・再読み込み後も有効であることのテスト"""
+        manifest = BuildManifest.for_directory(self.temp_dir.name)
+        assert manifest.lookup(str(self.input_file), str(self.output_file), self.options) is None
+        
+        self._record(manifest)
+        manifest.save()
+        
+        reloaded = BuildManifest.for_directory(self.temp_dir.name)
+        entry = reloaded.lookup(str(self.input_file), str(self.output_file), self.options)
+        assert entry is not None
+        assert entry['tables_found'] == 1
+    
+    def test_touched_input_with_same_content_is_up_to_date(self):
+        """更新時刻のみ変わった入力は内容のハッシュで最新と判定されることのテスト"""
+        manifest = BuildManifest.for_directory(self.temp_dir.name)
+        self._record(manifest)
+        
+        stat = os.stat(self.input_file)
+        os.utime(self.input_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        
+        assert manifest.lookup(str(self.input_file), str(self.output_file), self.options) is not None
+    
+    def test_changes_invalidate_entry(self):
+        """内容・オプション・出力の変更でエントリが無効になることのテスト"""
+        manifest = BuildManifest.for_directory(self.temp_dir.name)
+        self._record(manifest)
+        
+        assert manifest.lookup(str(self.input_file), str(self.output_file), {'apply_formatting': True}) is None
+        
+        self.output_file.write_bytes(b"replaced xlsx")
+        assert manifest.lookup(str(self.input_file), str(self.output_file), self.options) is None
+        
+        self._record(manifest)
+        self.input_file.write_text("| B |\n|---|\n| 2 |\n")
+        assert manifest.lookup(str(self.input_file), str(self.output_file), self.options) is None
@@ -0,0 +1,96 @@
+import zipfile
+from io import BytesIO
+from openpyxl import load_workbook
+from src.native_writer import NativeXlsxWriter, column_letter
+
+
+class TestNativeXlsxWriter:
+    """NativeXlsxWriter のテスト"""
+    
+    def test_column_letter(self):
+        """列番号から列名への変換テスト"""
+        assert column_letter(1) == 'A'
+        assert column_letter(26) == 'Z'
+        assert column_letter(27) == 'AA'
+        assert column_letter(703) == 'AAA'
+    
+    def test_write_sheets(self):
+        """複数シートの書き出しテスト"""
+        buffer = BytesIO()
+        with NativeXlsxWriter(buffer) as writer:
+            assert writer.write_sheet('Table1', ['名前', '値'], iter([['A', '1'], ['B', '']])) == (2, 6)
+            writer.write_sheet('Table2', ['X'], [['A']])
+        
+        workbook = load_workbook(buffer)
+        assert workbook.sheetnames == ['Table1', 'Table2']
+        sheet = workbook['Table1']
+        assert [[cell.value for cell in row] for row in sheet.iter_rows()] == [
+            ['名前', '値'], ['A', '1'], ['B', None]
+        ]
+        assert workbook['Table2']['A2'].value == 'A'
+        # 文字列はセルに直接書き込み、共有文字列テーブルは作らない
+        with zipfile.ZipFile(buffer) as archive:
+            assert 'xl/sharedStrings.xml' not in archive.namelist()
+            assert archive.read('xl/worksheets/sheet1.xml').count(b't="inlineStr"') == 5
+    
+    def test_sheet_entries_use_zip64(self):
+        """サイズの分からないワークシートをZIP64のヘッダーで書き込むことのテスト"""
+        buffer = BytesIO()
+        with NativeXlsxWriter(buffer) as writer:
+            writer.write_sheet('Sheet1', ['A'], iter([['x']]))
+        
+        with zipfile.ZipFile(buffer) as archive:
+            assert archive.getinfo('xl/worksheets/sheet1.xml').extract_version >= zipfile.ZIP64_VERSION
+        assert load_workbook(buffer).active['A2'].value == 'x'
+    
+    def test_special_characters(self):
+        """XMLの特殊文字・前後の空白・数値の書き出しテスト"""
+        buffer = BytesIO()
+        with NativeXlsxWriter(buffer) as writer:
+            writer.write_sheet('A & "B"', ['<tag>', ' 空白 '], [['a&b', 1.5], [True, 3]])
+        
+        sheet = load_workbook(buffer).active
+        assert sheet.title == 'A & "B"'
+        assert sheet['A1'].value == '<tag>'
+        assert sheet['B1'].value == ' 空白 '
+        assert sheet['A2'].value == 'a&b'
+        assert sheet['B2'].value == 1.5
+        assert sheet['A3'].value is True
+        assert sheet['B3'].value == 3
+    
+    def test_formatting_and_widths(self):
+        """ヘッダーの太字・アライメント・列幅の書き出しテスト"""
+        buffer = BytesIO()
+        with NativeXlsxWriter(buffer) as writer:
+            writer.write_sheet(
+                'Sheet1',
+                ['Name', 'Price', 'Note'],
+                [['Apple', '100', 'x']],
+                alignment=['left', 'right', 'center'],
+                apply_formatting=True,
+                column_widths=[12, 10, 20]
+            )
+        
+        sheet = load_workbook(buffer).active
+        assert sheet['A1'].font.bold == True
+        assert sheet['B1'].alignment.horizontal == 'right'
+        assert sheet['B2'].font.bold == False
+        assert sheet['B2'].alignment.horizontal == 'right'
+        assert sheet['C2'].alignment.horizontal == 'center'
+        assert sheet.column_dimensions['C'].width == 20
+    
+    def test_empty_workbook(self):
+        """シートを書き出さなかった場合に空のシートが作成されることのテスト"""
+        buffer = BytesIO()
+        NativeXlsxWriter(buffer).close()
+        
+        assert load_workbook(buffer).sheetnames == ['Sheet1']
+    
+    def test_rename_sheet(self):
+        """書き出し後のシート名変更テスト"""
+        buffer = BytesIO()
+        with NativeXlsxWriter(buffer) as writer:
+            writer.write_sheet('Table1', ['A'], [])
+            writer.rename_sheet(0, 'Sheet1')
+        
+        assert load_workbook(buffer).sheetnames == ['Sheet1']
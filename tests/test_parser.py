@@ -1,5 +1,8 @@
+import io
+import json
 import pytest
 from src.parser import MarkdownTableParser
+from src.table import Table
 
 
 class TestMarkdownTableParser:
@@ -139,4 +142,189 @@ This is just text with no tables.
         assert table['rows'] == [
             ['Alice', '', 'Tokyo'],
             ['', '30', '']
-        ]
\ No newline at end of file
+        ]
+    
+    def test_iter_tables_from_stream(self):
+        """ファイルオブジェクトからテーブルを逐次取得するテスト"""
+        stream = io.StringIO("""# First
+
+| Product | Price |
+|---------|------:|
+| Apple | 100 |
+
+| Country | Capital |
+|---------|---------|
+| Japan | Tokyo |
+""")
+        parser = MarkdownTableParser()
+        tables = parser.iter_tables(stream)
+        
+        first = next(tables)
+        assert first['headers'] == ['Product', 'Price']
+        assert first['rows'] == [['Apple', '100']]
+        assert first['alignment'] == ['left', 'right']
+        
+        second = next(tables)
+        assert second['headers'] == ['Country', 'Capital']
+        assert second['rows'] == [['Japan', 'Tokyo']]
+        
+        with pytest.raises(StopIteration):
+            next(tables)
+    
+    def test_iter_tables_stream_rows(self):
+        """行を逐次返すモードのテスト（未消費の行は読み飛ばされる）"""
+        markdown_content = """| A | B |
+|---|---|
+| 1 | 2 |
+| 3 |
+
+| C |
+|---|
+| 4 |
+"""
+        parser = MarkdownTableParser()
+        tables = parser.iter_tables(io.StringIO(markdown_content), stream_rows=True)
+        
+        first = next(tables)
+        assert first['headers'] == ['A', 'B']
+        assert next(first['rows']) == ['1', '2']
+        
+        # 残りの行を消費せずに次のテーブルへ進む
+        second = next(tables)
+        assert second['headers'] == ['C']
+        assert list(second['rows']) == [['4']]
+    
+    def test_iter_rows(self):
+        """テーブル番号付きで行を逐次取得するテスト"""
+        markdown_content = """| A | B |
+|---|---|
+| 1 | 2 |
+
+| C |
+|---|
+| 3 |
+| 4 |
+"""
+        parser = MarkdownTableParser()
+        rows = list(parser.iter_rows(io.StringIO(markdown_content)))
+        
+        assert rows == [(0, ['1', '2']), (1, ['3']), (1, ['4'])]
+    
+    def test_parse_matches_iter_tables(self):
+        """parse() と iter_tables() の結果が一致することのテスト"""
+        markdown_content = """| Name | Age |
+|:-----|:---:|
+| Alice | 25 | Extra |
+| Bob |
+not a table
+| X | Y |
+| Z | W |
+|---|---|
+| 1 | 2 |"""
+        parser = MarkdownTableParser()
+        expected = parser.parse(markdown_content)
+        
+        assert list(parser.iter_tables(markdown_content.split('\n'))) == expected
+        assert len(expected) == 2
+        assert expected[1]['headers'] == ['Z', 'W']
+    
+    def test_parse_returns_plain_dicts(self):
+        """既定の解析結果がJSONに変換でき、変更できる辞書であることのテスト"""
+        markdown_content = "| Name | Age |\n|------|-----|\n| Alice | 25 |\n"
+        parser = MarkdownTableParser()
+        
+        for tables in (parser.parse(markdown_content), list(parser.iter_tables(io.StringIO(markdown_content)))):
+            assert type(tables[0]) is dict
+            assert json.loads(json.dumps(tables)) == tables
+            tables[0]['rows'].append(['Bob', '30'])
+            tables[0]['rows'][0][0] = 'Carol'
+            assert tables[0]['rows'] == [['Carol', '25'], ['Bob', '30']]
+    
+    def test_parse_returns_columnar_tables(self):
+        """as_table=True の解析結果が列ごとに保持したTableであることのテスト"""
+        markdown_content = """| Name | Age |
+|------|-----|
+| Alice | 25 |
+| Bob | 30 |"""
+        parser = MarkdownTableParser()
+        
+        for tables in (
+            parser.parse(markdown_content, as_table=True),
+            list(parser.iter_tables(io.StringIO(markdown_content), as_table=True))
+        ):
+            assert isinstance(tables[0], Table)
+            assert tables[0].columns == [['Alice', 'Bob'], ['25', '30']]
+            assert tables[0] == {
+                'headers': ['Name', 'Age'],
+                'rows': [['Alice', '25'], ['Bob', '30']],
+                'alignment': ['left', 'left']
+            }
+    
+    def test_parse_skips_prose_with_pipes(self):
+        """本文中のパイプやテーブル行に似た行を誤検出しないことのテスト"""
+        markdown_content = (
+            "本文 a | b の説明\n"
+            "| ヘッダーのみ |\n"
+            "本文\n"
+            "|---|\n"
+            "\n"
+            "  | A | B |\r\n"
+            "  |:--|--:|\r\n"
+            "| 1 | 2 |\r\n"
+            "| 3 |\n"
+            "a | b\n"
+            "| 4 | 5 |\n"
+        )
+        parser = MarkdownTableParser()
+        tables = parser.parse(markdown_content)
+        
+        assert tables == [{
+            'headers': ['A', 'B'],
+            'rows': [['1', '2'], ['3', '']],
+            'alignment': ['left', 'right']
+        }]
+        assert list(parser.iter_tables(io.StringIO(markdown_content))) == tables
+    
+    def test_parse_large_prose_document(self):
+        """本文が大半を占める文書でもテーブルを正しく抽出することのテスト"""
+        prose = "これは本文の段落です。テーブルではありません。\n" * 1000
+        table = "| a | b |\n|---|---|\n| 1 | 2 |\n"
+        markdown_content = (prose + table) * 5 + prose
+        
+        parser = MarkdownTableParser()
+        tables = parser.parse(markdown_content)
+        
+        assert len(tables) == 5
+        assert all(t['rows'] == [['1', '2']] for t in tables)
+        assert list(parser.iter_tables(io.StringIO(markdown_content))) == tables
+    
+    def test_iter_mapped_lines(self):
+        """バイト列からテーブルの候補行だけを取り出すことのテスト"""
+        data = "本文\r\n| A | B |\r\n|---|---|\r\n| 1 | 2 |\r\n本文\r\n本文\n| X |".encode('utf-8')
+        parser = MarkdownTableParser()
+        
+        lines = list(parser.iter_mapped_lines(data))
+        
+        assert lines == ['', '| A | B |', '|---|---|', '| 1 | 2 |', '', '| X |']
+        assert list(parser.iter_tables(lines)) == parser.parse(data.decode('utf-8').replace('\r\n', '\n'))
+    
+    def test_open_lines_with_mmap(self):
+        """メモリマップ入力とテキスト入力の結果が一致することのテスト"""
+        import tempfile
+        from pathlib import Path
+        
+        markdown_content = "# 見出し\n\n| 名前 | 値 |\n|:--|--:|\n| りんご | 120 |\n\n本文\n"
+        parser = MarkdownTableParser()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "input.md"
+            input_file.write_text(markdown_content, encoding='utf-8')
+            empty_file = Path(temp_dir) / "empty.md"
+            empty_file.write_text("", encoding='utf-8')
+            
+            with parser.open_lines(str(input_file), use_mmap=True) as lines:
+                tables = list(parser.iter_tables(lines))
+            with parser.open_lines(str(empty_file), use_mmap=True) as lines:
+                assert list(parser.iter_tables(lines)) == []
+        
+        assert tables == parser.parse(markdown_content)
@@ -0,0 +1,47 @@
+import pytest
+from src.stats import ConversionStats, percentile
+
+
+class TestConversionStats:
+    """ConversionStats のテスト"""
+    
+    def test_stage_accumulates_time(self):
+        """同じ段階の計測時間が加算されることのテスト"""
+        stats = ConversionStats()
+        
+        with stats.stage('parse'):
+            pass
+        first = stats.stage_seconds['parse']
+        with stats.stage('parse'):
+            pass
+        
+        assert stats.stage_seconds['parse'] >= first
+        assert list(stats.stage_seconds) == ['parse']
+    
+    def test_stage_records_time_on_error(self):
+        """例外発生時も所要時間が記録されることのテスト"""
+        stats = ConversionStats()
+        
+        with pytest.raises(ValueError):
+            with stats.stage('build'):
+                raise ValueError("error")
+        
+        assert 'build' in stats.stage_seconds
+    
+    def test_count_lines(self):
+        """読み進めた行数が数えられることのテスト"""
+        stats = ConversionStats()
+        
+        assert list(stats.count_lines(["a\n", "b\n", "c"])) == ["a\n", "b\n", "c"]
+        assert stats.lines_scanned == 3
+    
+    def test_percentile(self):
+        """最近傍順位法によるパーセンタイルのテスト"""
+        values = [float(v) for v in range(1, 101)]
+        
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile(values, 99) == 99.0
+        assert percentile(values, 0) == 1.0
+        assert percentile([3.0], 99) == 3.0
+        assert percentile([], 50) == 0.0
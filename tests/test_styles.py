@@ -0,0 +1,78 @@
+import datetime
+import pickle
+import openpyxl
+from openpyxl.styles import Font
+from src.styles import StyleEngine, HEADER, BODY
+
+
+class TestStyleEngine:
+    """StyleEngine のテスト"""
+    
+    def setup_method(self):
+        self.engine = StyleEngine(Font(name='Arial', size=10), Font(name='Arial', size=10, bold=True))
+    
+    def test_styles_are_registered_once_per_workbook(self):
+        """同じ組み合わせのスタイルがシート間で再利用されることのテスト"""
+        workbook = openpyxl.Workbook()
+        first = workbook.active
+        second = workbook.create_sheet("Table2")
+        
+        first_styles = self.engine.column_styles(first, BODY, ['left', 'right', 'left'], 3)
+        second_styles = self.engine.column_styles(second, BODY, ['right'], 1)
+        
+        assert first_styles[0] is first_styles[2]
+        assert second_styles[0] is first_styles[1]
+        
+        # 別のワークブックでは改めて登録する
+        other = openpyxl.Workbook().active
+        assert self.engine.column_styles(other, BODY, ['right'], 1)[0] is not first_styles[1]
+    
+    def test_styled_cells(self):
+        """スタイル付きセルの作成テスト"""
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        
+        header_styles = self.engine.column_styles(sheet, HEADER, ['center'], 2)
+        body_styles = self.engine.column_styles(sheet, BODY, ['center'], 2)
+        sheet.append(self.engine.styled_cells(sheet, ['A', 'B'], header_styles))
+        sheet.append(self.engine.styled_cells(sheet, ['1', ''], body_styles))
+        
+        assert sheet['A1'].font.bold == True
+        assert sheet['A1'].alignment.horizontal == 'center'
+        assert sheet['B1'].font.bold == True
+        assert sheet['B1'].alignment.horizontal is None
+        assert sheet['A2'].font.bold == False
+        assert sheet['A2'].alignment.horizontal == 'center'
+        assert sheet['B2'].value is None
+    
+    def test_apply_column_defaults(self):
+        """列全体へのスタイル設定テスト"""
+        sheet = openpyxl.Workbook().active
+        
+        self.engine.apply_column_defaults(sheet, ['left', 'right'])
+        
+        assert sheet.column_dimensions['B'].alignment.horizontal == 'right'
+        assert sheet.column_dimensions['B'].font.name == 'Arial'
+    
+    def test_set_sparse_row(self):
+        """空でない値のセルだけが作成されることのテスト"""
+        sheet = openpyxl.Workbook().active
+        styles = self.engine.column_styles(sheet, BODY, ['left', 'right', 'left'], 3, [None, '0', None])
+        
+        self.engine.set_sparse_row(sheet, 2, ['a', 5, '', datetime.date(2024, 1, 5)], styles)
+        
+        assert sorted(sheet._cells) == [(2, 1), (2, 2), (2, 4)]
+        assert sheet['B2'].number_format == '0'
+        assert sheet['B2'].alignment.horizontal == 'right'
+        # 表示形式のない列の日付には日付の表示形式が補われる
+        assert sheet['D2'].is_date
+    
+    def test_pickle(self):
+        """並列変換のためにpickle化できることのテスト"""
+        sheet = openpyxl.Workbook().active
+        self.engine.column_styles(sheet, BODY, ['left'], 1)
+        
+        restored = pickle.loads(pickle.dumps(self.engine))
+        
+        assert restored.fonts[HEADER].bold == True
+        assert restored.column_styles(openpyxl.Workbook().active, BODY, ['left'], 1)
@@ -0,0 +1,95 @@
+import pickle
+
+import pytest
+from src.table import Table
+
+
+class TestTable:
+    """Table のテスト"""
+    
+    def setup_method(self):
+        """テストメソッドごとのセットアップ"""
+        self.table = Table.from_rows(
+            ['名前', '年齢'],
+            [['田中', '25'], ['佐藤']],
+            ['left', 'right']
+        )
+    
+    def test_from_rows_stores_columns(self):
+        """行が列ごとに格納されることのテスト"""
+        assert self.table.columns == [['田中', '佐藤'], ['25', '']]
+        assert self.table.row_count == 2
+    
+    def test_from_rows_normalizes_row_length(self):
+        """行の長さがヘッダー数に合わせて調整されることのテスト"""
+        table = Table.from_rows(['A', 'B'], [['1'], ['1', '2', '3']], ['left', 'left'])
+        
+        assert table['rows'] == [['1', ''], ['1', '2']]
+    
+    def test_dict_compatibility(self):
+        """辞書形式のテーブル情報と同じように参照できることのテスト"""
+        expected = {
+            'headers': ['名前', '年齢'],
+            'rows': [['田中', '25'], ['佐藤', '']],
+            'alignment': ['left', 'right']
+        }
+        
+        assert self.table == expected
+        assert dict(self.table) == expected
+        assert self.table.get('headers') == ['名前', '年齢']
+        assert self.table.get('missing', []) == []
+        assert list(self.table) == ['headers', 'rows', 'alignment']
+        with pytest.raises(KeyError):
+            self.table['missing']
+    
+    def test_rows_view(self):
+        """行ビューの参照のテスト"""
+        rows = self.table['rows']
+        
+        assert len(rows) == 2
+        assert rows[0] == ['田中', '25']
+        assert rows[-1] == ['佐藤', '']
+        assert rows[1:] == [['佐藤', '']]
+        assert list(rows) == [['田中', '25'], ['佐藤', '']]
+        with pytest.raises(IndexError):
+            rows[2]
+    
+    def test_to_dict(self):
+        """辞書への変換のテスト"""
+        data = self.table.to_dict()
+        
+        assert type(data) is dict
+        assert type(data['rows']) is list
+        assert data['rows'] == [['田中', '25'], ['佐藤', '']]
+    
+    def test_to_dict_page(self):
+        """offset と limit で指定した範囲の行だけを変換することのテスト"""
+        table = Table.from_rows(['A'], [[str(i)] for i in range(5)], ['left'])
+        
+        assert table.to_dict(offset=1, limit=2)['rows'] == [['1'], ['2']]
+        assert table.to_dict(offset=3)['rows'] == [['3'], ['4']]
+        assert table.to_dict(offset=4, limit=10)['rows'] == [['4']]
+        assert table.to_dict(offset=10, limit=10)['rows'] == []
+    
+    def test_summary(self):
+        """概要にセル値を含まないことのテスト"""
+        assert self.table.summary() == {
+            'headers': ['名前', '年齢'],
+            'alignment': ['left', 'right'],
+            'row_count': 2
+        }
+    
+    def test_empty_table(self):
+        """データ行とヘッダーが空のテーブルのテスト"""
+        assert Table.from_rows(['A'], [], ['left'])['rows'] == []
+        assert list(Table([], [], [], 2)['rows']) == [[], []]
+    
+    def test_slots(self):
+        """インスタンス辞書を持たないことのテスト"""
+        assert not hasattr(self.table, '__dict__')
+    
+    def test_pickle(self):
+        """並列変換でプロセス間に渡せることのテスト"""
+        restored = pickle.loads(pickle.dumps(self.table))
+        
+        assert restored == self.table
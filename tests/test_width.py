@@ -0,0 +1,73 @@
+import random
+
+from src.width import ColumnWidthTracker, display_width
+
+
+class TestDisplayWidth:
+    """display_width のテスト"""
+    
+    def test_ascii(self):
+        """ASCII文字列は文字数と同じ幅になることのテスト"""
+        assert display_width('Alice') == 5
+        assert display_width('') == 0
+    
+    def test_east_asian_wide(self):
+        """全角文字が2文字分の幅になることのテスト"""
+        assert display_width('東京都') == 6
+        assert display_width('ＡＢ') == 4
+        assert display_width('りんご 3個') == 10
+        # 半角カナは1文字分
+        assert display_width('ｱｲｳ') == 3
+
+
+class TestColumnWidthTracker:
+    """ColumnWidthTracker のテスト"""
+    
+    def test_widths(self):
+        """列幅に余白と最小幅・最大幅が適用されることのテスト"""
+        tracker = ColumnWidthTracker(['名前', 'Note', 'X'])
+        tracker.update(['東京都千代田区丸の内', 'a' * 100, ''])
+        
+        assert tracker.max_widths == [20, 100, 1]
+        assert tracker.widths == [22, 50, 10]
+    
+    def test_matches_full_scan(self):
+        """読み飛ばしを行っても全セルを調べた場合と同じ幅になることのテスト"""
+        random.seed(0)
+        alphabet = 'abcあいう漢字ｱ1 '
+        rows = [
+            [''.join(random.choice(alphabet) for _ in range(random.randint(0, 12))) for _ in range(3)]
+            for _ in range(200)
+        ]
+        
+        tracker = ColumnWidthTracker(['A', 'B', 'C'])
+        for row_data in rows:
+            tracker.update(row_data)
+        column_tracker = ColumnWidthTracker(['A', 'B', 'C'])
+        column_tracker.update_columns([list(column) for column in zip(*rows)])
+        
+        expected = [
+            max([1] + [display_width(row_data[col_idx]) for row_data in rows])
+            for col_idx in range(3)
+        ]
+        assert tracker.max_widths == expected
+        assert column_tracker.max_widths == expected
+    
+    def test_sample_rows(self):
+        """先頭の行だけから列幅を見積もることのテスト"""
+        rows = [['short'], ['a much longer value']]
+        
+        tracker = ColumnWidthTracker(['A'], sample_rows=1)
+        tracker.update_rows(rows)
+        column_tracker = ColumnWidthTracker(['A'], sample_rows=1)
+        column_tracker.update_columns([['short', 'a much longer value']])
+        
+        assert tracker.max_widths == [5]
+        assert column_tracker.max_widths == [5]
+    
+    def test_non_string_values(self):
+        """数値などの文字列以外の値も文字列表現の幅で数えることのテスト"""
+        tracker = ColumnWidthTracker(['A', 'B'])
+        tracker.update([1234567890123, 0])
+        
+        assert tracker.max_widths == [13, 1]
@@ -12,18 +12,46 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../'))
 from web.app import create_app
 
 
+@pytest.fixture
+def make_app():
+    """
+    テスト用Flaskアプリケーションを作成する関数
+    
+    アップロードフォルダとキャッシュフォルダは一時フォルダに作成し、テストの終了時に
+    スレッドプールを停止してから削除する。
+    """
+    import shutil
+    
+    created = []
+    
+    def make():
+        temp_dir = tempfile.mkdtemp()
+        app = create_app(
+            testing=True,
+            upload_folder=os.path.join(temp_dir, 'uploads'),
+            cache_folder=os.path.join(temp_dir, 'cache')
+        )
+        created.append((app, temp_dir))
+        return app
+    
+    yield make
+    
+    for app, temp_dir in created:
+        app.conversions.shutdown()
+        app.job_queue.shutdown()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
 class TestWebApp:
     """Web アプリケーションのテストクラス"""
     
     @pytest.fixture
-    def app(self):
+    def app(self, make_app):
         """テスト用Flaskアプリケーション"""
-        app = create_app(testing=True)
+        app = make_app()
         app.config['TESTING'] = True
         app.config['WTF_CSRF_ENABLED'] = False
-        with tempfile.TemporaryDirectory() as temp_dir:
-            app.config['UPLOAD_FOLDER'] = temp_dir
-            yield app
+        return app
     
     @pytest.fixture
     def client(self, app):
@@ -65,6 +93,20 @@ class TestWebApp:
         assert response.status_code == 200
         assert b'success' in response.data.lower() or b'converted' in response.data.lower()
     
+    def test_upload_does_not_stage_input(self, app, client):
+        """単一ファイルの変換で入力ファイルを保存せず、出力ファイルだけが残ることのテスト"""
+        data = {
+            'file': (BytesIO(b"| A | B |\n|---|---|\n| 1 | 2 |\n"), 'staged.md')
+        }
+        
+        response = client.post('/upload', data=data)
+        assert response.status_code == 302
+        
+        names = os.listdir(app.config['UPLOAD_FOLDER'])
+        assert len(names) == 1
+        assert names[0].endswith('_staged.xlsx')
+        assert response.headers['Location'].endswith(names[0])
+    
     def test_upload_no_file_error(self, client):
         """ファイル未選択エラーテスト"""
         data = {
@@ -134,6 +176,55 @@ class TestWebApp:
         response = client.post('/batch', data=data, follow_redirects=True)
         assert response.status_code == 200
     
+    def test_batch_upload_streams_zip(self, app, client):
+        """バッチ変換のZIPがディスクに保存されずにストリーミングで返ることのテスト"""
+        import zipfile
+        from openpyxl import load_workbook
+        
+        data = {
+            'files': [
+                (BytesIO(b"| Product | Price |\n|---|---|\n| Apple | 100 |\n"), 'products.md'),
+                (BytesIO(b"| A |\n|---|\n| \xff\xfe |\n"), 'broken.md')
+            ],
+            'apply_formatting': True
+        }
+        
+        response = client.post('/batch', data=data, buffered=False)
+        assert response.status_code == 200
+        assert response.mimetype == 'application/zip'
+        assert response.is_streamed
+        
+        archive_bytes = b''.join(response.response)
+        with zipfile.ZipFile(BytesIO(archive_bytes)) as archive:
+            assert archive.namelist() == ['products.xlsx', 'errors.txt']
+            assert b'broken.md' in archive.read('errors.txt')
+            workbook = load_workbook(BytesIO(archive.read('products.xlsx')))
+            assert workbook.active['A2'].value == 'Apple'
+        
+        assert os.listdir(app.config['UPLOAD_FOLDER']) == []
+    
+    def test_batch_upload_unique_entry_names(self, client):
+        """同じ名前になるファイルのZIP内のファイル名に番号が付くことのテスト"""
+        import zipfile
+        import warnings
+        
+        table = b"| A |\n|---|\n| 1 |\n"
+        data = {
+            'files': [
+                (BytesIO(table), 'a.md'),
+                (BytesIO(table), 'a.markdown'),
+                (BytesIO(table), 'a.md')
+            ]
+        }
+        
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            response = client.post('/batch', data=data)
+            archive_bytes = response.get_data()
+        
+        with zipfile.ZipFile(BytesIO(archive_bytes)) as archive:
+            assert archive.namelist() == ['a.xlsx', 'a_1.xlsx', 'a_2.xlsx']
+    
     def test_download_endpoint_exists(self, client):
         """ダウンロードエンドポイント存在確認"""
         # 無効なファイル名でテスト（404になるはず）
@@ -158,6 +249,74 @@ class TestWebApp:
         # API エンドポイントが実装されている場合
         assert response.status_code in [200, 404, 501]  # 実装済み、未実装、またはメソッド未許可
     
+    def test_api_convert_in_memory(self, app, client):
+        """API変換がUPLOAD_FOLDERにファイルを残さずに完了することのテスト"""
+        import base64
+        from openpyxl import load_workbook
+        
+        data = {
+            'markdown_content': "| API | Test |\n|-----|------|\n| POST | /api/convert |\n"
+        }
+        
+        response = client.post('/api/convert', json=data)
+        assert response.status_code == 200
+        
+        payload = response.get_json()
+        assert payload['success'] == True
+        assert payload['tables_found'] == 1
+        
+        workbook = load_workbook(BytesIO(base64.b64decode(payload['excel_data'])))
+        assert workbook.active['A2'].value == 'POST'
+        assert os.listdir(app.config['UPLOAD_FOLDER']) == []
+    
+    def test_api_convert_binary_response(self, client):
+        """Acceptヘッダーでxlsxを要求した場合にバイナリを直接返すことのテスト"""
+        from openpyxl import load_workbook
+        
+        data = {
+            'markdown_content': "| API | Test |\n|-----|------|\n| POST | /api/convert |\n"
+        }
+        
+        response = client.post(
+            '/api/convert',
+            json=data,
+            headers={'Accept': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'}
+        )
+        assert response.status_code == 200
+        assert response.mimetype == 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        assert response.headers['X-Tables-Found'] == '1'
+        assert response.headers['X-Warnings'] == '[]'
+        assert float(response.headers['X-Processing-Time']) >= 0
+        
+        workbook = load_workbook(BytesIO(response.data))
+        assert workbook.active['A2'].value == 'POST'
+    
+    def test_api_convert_defaults_to_json(self, client):
+        """Acceptヘッダーが無い場合は従来どおりJSONを返すことのテスト"""
+        data = {'markdown_content': "| A |\n|---|\n| 1 |\n"}
+        
+        response = client.post('/api/convert', json=data, headers={'Accept': '*/*'})
+        assert response.status_code == 200
+        assert response.is_json
+        assert 'excel_data' in response.get_json()
+    
+    def test_api_convert_rejects_non_string_content(self, client):
+        """markdown_content が文字列でない場合は400を返すことのテスト"""
+        response = client.post('/api/convert', json={'markdown_content': 5})
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'markdown_content must be a string'
+    
+    def test_api_convert_cache_hit(self, client):
+        """同じ内容の再変換がキャッシュから返ることのテスト"""
+        data = {'markdown_content': "| Cache | Test |\n|-------|------|\n| 1 | 2 |\n"}
+        
+        first = client.post('/api/convert', json=data).get_json()
+        second = client.post('/api/convert', json=data).get_json()
+        
+        assert first['cache_hit'] == False
+        assert second['cache_hit'] == True
+        assert second['excel_data'] == first['excel_data']
+    
     def test_status_endpoint(self, client):
         """ステータスエンドポイントテスト"""
         response = client.get('/status')
@@ -176,6 +335,629 @@ class TestWebApp:
         assert response.status_code in [200, 404]
 
 
+class TestJobsApi:
+    """バッチ変換ジョブAPIのテストクラス"""
+    
+    @pytest.fixture
+    def app(self, make_app):
+        """テスト用Flaskアプリケーション"""
+        app = make_app()
+        app.config['TESTING'] = True
+        return app
+    
+    @pytest.fixture
+    def client(self, app):
+        """テストクライアント"""
+        return app.test_client()
+    
+    @staticmethod
+    def wait_for_job(client, job_id, timeout=30):
+        """ジョブが完了または失敗するまでポーリングする"""
+        import time
+        
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            payload = client.get(f'/api/jobs/{job_id}').get_json()
+            if payload['status'] in ('completed', 'failed'):
+                return payload
+            time.sleep(0.05)
+        raise AssertionError('job did not finish')
+    
+    def test_submit_poll_download(self, client):
+        """ジョブの登録・進捗の取得・結果のダウンロードのテスト"""
+        import zipfile
+        
+        data = {
+            'files': [
+                (BytesIO(b"| A | B |\n|---|---|\n| 1 | 2 |\n"), 'first.md'),
+                (BytesIO(b"| C |\n|---|\n| 3 |\n"), 'second.md'),
+                (BytesIO(b"not markdown"), 'ignored.txt')
+            ],
+            'apply_formatting': 'true'
+        }
+        
+        response = client.post('/api/jobs', data=data, content_type='multipart/form-data')
+        assert response.status_code == 202
+        submitted = response.get_json()
+        assert response.headers['Location'] == submitted['status_url']
+        
+        payload = self.wait_for_job(client, submitted['job_id'])
+        assert payload['status'] == 'completed'
+        assert payload['total_files'] == 2
+        assert payload['processed_files'] == 2
+        assert payload['successful_files'] == 2
+        assert sorted(r['input_file'] for r in payload['results']) == ['first.md', 'second.md']
+        
+        download = client.get(submitted['download_url'])
+        assert download.status_code == 200
+        assert download.mimetype == 'application/zip'
+        with zipfile.ZipFile(BytesIO(download.data)) as archive:
+            assert sorted(archive.namelist()) == ['first.xlsx', 'second.xlsx']
+    
+    def test_markdown_extension_uploads_are_converted(self, client):
+        """.markdown のファイルも変換され、同名のファイルが上書きされないことのテスト"""
+        import zipfile
+        
+        data = {
+            'files': [
+                (BytesIO(b"| A |\n|---|\n| 1 |\n"), 'notes.markdown'),
+                (BytesIO(b"| B |\n|---|\n| 2 |\n"), 'notes.md')
+            ]
+        }
+        
+        submitted = client.post('/api/jobs', data=data, content_type='multipart/form-data').get_json()
+        payload = self.wait_for_job(client, submitted['job_id'])
+        
+        assert payload['status'] == 'completed'
+        assert payload['total_files'] == 2
+        assert payload['successful_files'] == 2
+        with zipfile.ZipFile(BytesIO(client.get(submitted['download_url']).data)) as archive:
+            assert sorted(archive.namelist()) == ['notes.xlsx', 'notes_1.xlsx']
+    
+    def test_job_without_markdown_files_fails(self, app):
+        """変換するファイルがないジョブは完了ではなく失敗になることのテスト"""
+        job = app.job_queue.create(app.config['UPLOAD_FOLDER'])
+        app.job_queue.submit(job)
+        app.job_queue.shutdown()
+        
+        payload = job.to_dict()
+        assert payload['status'] == 'failed'
+        assert payload['successful_files'] == 0
+        assert payload['results'] == []
+        assert 'No Markdown files' in payload['error']
+    
+    def test_failed_submit_discards_job(self, app, client, monkeypatch):
+        """ジョブの登録に失敗した場合に記録と作業ディレクトリを残さないことのテスト"""
+        created = []
+        create = app.job_queue.create
+        
+        def recording_create(base_dir):
+            job = create(base_dir)
+            created.append(job)
+            return job
+        
+        def failing_submit(job, **kwargs):
+            raise RuntimeError('executor is shut down')
+        
+        monkeypatch.setattr(app.job_queue, 'create', recording_create)
+        monkeypatch.setattr(app.job_queue, 'submit', failing_submit)
+        
+        data = {'files': [(BytesIO(b"| A |\n|---|\n| 1 |\n"), 'table.md')]}
+        response = client.post('/api/jobs', data=data, content_type='multipart/form-data')
+        assert response.status_code == 500
+        
+        job = created[0]
+        assert client.get(f'/api/jobs/{job.job_id}').status_code == 404
+        assert not os.path.exists(job.job_dir)
+        assert app.janitor.usage()['in_use'] == 0
+    
+    def test_finished_jobs_are_pruned(self, app):
+        """保持期間を過ぎたジョブと作業ディレクトリが削除されたジョブの記録を破棄することのテスト"""
+        import shutil
+        
+        queue = app.job_queue
+        expired = queue.create(app.config['UPLOAD_FOLDER'])
+        evicted = queue.create(app.config['UPLOAD_FOLDER'])
+        running = queue.create(app.config['UPLOAD_FOLDER'])
+        for job in (expired, evicted):
+            job.fail('done')
+        expired.finished_at -= queue.max_age_seconds + 1
+        shutil.rmtree(evicted.job_dir)
+        
+        assert queue.prune() == 2
+        assert queue.get(expired.job_id) is None
+        assert queue.get(evicted.job_id) is None
+        assert queue.get(running.job_id) is running
+    
+    def test_submit_without_valid_files(self, client):
+        """有効なファイルがない場合は400を返すことのテスト"""
+        data = {'files': [(BytesIO(b"text"), 'notes.txt')]}
+        
+        response = client.post('/api/jobs', data=data, content_type='multipart/form-data')
+        assert response.status_code == 400
+    
+    def test_unknown_job(self, client):
+        """存在しないジョブIDは404を返すことのテスト"""
+        assert client.get('/api/jobs/unknown').status_code == 404
+        assert client.get('/api/jobs/unknown/download').status_code == 404
+    
+    def test_download_before_completion(self, app, client):
+        """完了前のジョブのダウンロードは409を返すことのテスト"""
+        job = app.job_queue.create(app.config['UPLOAD_FOLDER'])
+        
+        response = client.get(f'/api/jobs/{job.job_id}/download')
+        assert response.status_code == 409
+        assert response.get_json()['status'] == 'queued'
+
+
+class TestUploadJanitor:
+    """アップロードフォルダの削除処理のテストクラス"""
+    
+    @staticmethod
+    def make_entry(folder, name, size, mtime):
+        """指定したサイズ・更新時刻のファイルを作成する"""
+        path = os.path.join(folder, name)
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+        os.utime(path, (mtime, mtime))
+        return path
+    
+    def test_expired_entries_are_removed(self):
+        """保持期間を過ぎたエントリが削除されることのテスト"""
+        from web.cleanup import UploadJanitor
+        
+        with tempfile.TemporaryDirectory() as folder:
+            self.make_entry(folder, 'old.xlsx', 10, 1000)
+            self.make_entry(folder, 'new.xlsx', 10, 1900)
+            
+            janitor = UploadJanitor(folder, max_age_seconds=500)
+            assert janitor.run(now=2000) == 1
+            assert os.listdir(folder) == ['new.xlsx']
+    
+    def test_size_bound_evicts_least_recently_used(self):
+        """合計サイズの上限を超えた分が最終利用時刻の古いものから削除されることのテスト"""
+        from web.cleanup import UploadJanitor
+        
+        with tempfile.TemporaryDirectory() as folder:
+            self.make_entry(folder, 'a.xlsx', 100, 1000)
+            self.make_entry(folder, 'b.xlsx', 100, 1001)
+            job_dir = os.path.join(folder, 'job_1')
+            os.mkdir(job_dir)
+            self.make_entry(job_dir, 'converted_files.zip', 100, 1002)
+            
+            janitor = UploadJanitor(folder, max_age_seconds=10 ** 9, max_bytes=150)
+            janitor.touch('a.xlsx')
+            assert janitor.run() == 2
+            assert os.listdir(folder) == ['a.xlsx']
+            
+            usage = janitor.usage()
+            assert usage['entries'] == 1
+            assert usage['bytes'] == 100
+            assert usage['evicted_bytes'] == 200
+    
+    def test_entries_in_use_are_kept(self):
+        """使用中のエントリは削除されないことのテスト"""
+        from web.cleanup import UploadJanitor
+        
+        with tempfile.TemporaryDirectory() as folder:
+            self.make_entry(folder, 'serving.xlsx', 10, 1000)
+            
+            janitor = UploadJanitor(folder, max_age_seconds=1)
+            with janitor.in_use('serving.xlsx'):
+                assert janitor.run() == 0
+                assert os.listdir(folder) == ['serving.xlsx']
+            
+            assert janitor.run() == 1
+            assert os.listdir(folder) == []
+    
+    def test_download_survives_eviction(self, make_app):
+        """送信中のファイルが削除されてもダウンロードが完了することのテスト"""
+        import time
+        
+        app = make_app()
+        folder = app.config['UPLOAD_FOLDER']
+        self.make_entry(folder, 'result.xlsx', 10, 1000)
+        app.janitor.max_age_seconds = 1
+        
+        client = app.test_client()
+        response = client.get('/download/result.xlsx', buffered=False)
+        assert response.status_code == 200
+        assert app.janitor.usage()['in_use'] == 0
+        
+        # ダウンロードで最終利用時刻が更新されるため、保持期間を過ぎた時刻で実行する
+        assert app.janitor.run(now=time.time() + 10) == 1
+        assert not os.path.exists(os.path.join(folder, 'result.xlsx'))
+        assert response.get_data() == b'x' * 10
+        response.close()
+        
+        status = client.get('/status').get_json()
+        assert status['uploads']['entries'] == 0
+        assert status['uploads']['evicted_entries'] == 1
+
+
+class TestMetrics:
+    """メトリクスのテストクラス"""
+    
+    @pytest.fixture
+    def client(self, make_app):
+        """テストクライアント"""
+        return make_app().test_client()
+    
+    @staticmethod
+    def sample(text, name):
+        """メトリクスのテキストから指定したサンプルの値を取得する"""
+        for line in text.splitlines():
+            if line.startswith(name + ' '):
+                return float(line.rsplit(' ', 1)[1])
+        raise AssertionError(f'{name} not found')
+    
+    def test_metrics_after_conversion(self, client):
+        """変換後のメトリクスにリクエスト数・段階別の所要時間・処理量が含まれることのテスト"""
+        data = {'markdown_content': "| A | B |\n|---|---|\n| 1 | 2 |\n| 3 | 4 |\n"}
+        assert client.post('/api/convert', json=data).status_code == 200
+        assert client.post('/api/convert', json={}).status_code == 400
+        
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        text = response.get_data(as_text=True)
+        
+        assert self.sample(text, 'md2excel_http_requests_total{endpoint="api_convert",outcome="success"}') == 1
+        assert self.sample(text, 'md2excel_http_requests_total{endpoint="api_convert",outcome="client_error"}') == 1
+        assert self.sample(text, 'md2excel_conversions_total{outcome="success"}') == 1
+        assert self.sample(text, 'md2excel_tables_total') == 1
+        assert self.sample(text, 'md2excel_rows_total') == 2
+        assert self.sample(text, 'md2excel_cells_written_total') == 6
+        assert self.sample(text, 'md2excel_output_bytes_total') > 0
+        assert self.sample(text, 'md2excel_conversions_in_flight') == 0
+        assert self.sample(text, 'md2excel_upload_folder_entries') == 0
+        for stage in ('upload', 'parse', 'build', 'save'):
+            assert self.sample(text, f'md2excel_stage_duration_seconds_count{{stage="{stage}"}}') >= 1
+        assert '# TYPE md2excel_stage_duration_seconds histogram' in text
+    
+    def test_histogram_buckets_are_cumulative(self):
+        """ヒストグラムのバケットが累積値で出力されることのテスト"""
+        from web.metrics import Histogram
+        
+        histogram = Histogram('latency_seconds', 'Latency.', ('stage',), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value, stage='parse')
+        
+        lines = histogram.render()
+        assert lines[1] == '# TYPE latency_seconds histogram'
+        assert lines[2:] == [
+            'latency_seconds_bucket{stage="parse",le="0.1"} 1',
+            'latency_seconds_bucket{stage="parse",le="1"} 2',
+            'latency_seconds_bucket{stage="parse",le="+Inf"} 3',
+            'latency_seconds_sum{stage="parse"} 5.55',
+            'latency_seconds_count{stage="parse"} 3'
+        ]
+    
+    def test_label_values_are_escaped(self):
+        """ラベル値の特殊文字がエスケープされることのテスト"""
+        from web.metrics import Counter
+        
+        counter = Counter('requests_total', 'Requests.', ('endpoint',))
+        counter.inc(endpoint='a"b\\c\nd')
+        
+        assert counter.render()[2] == 'requests_total{endpoint="a\\"b\\\\c\\nd"} 1'
+
+
+class TestAdmissionControl:
+    """変換の受け付け制御のテストクラス"""
+    
+    def test_executor_rejects_when_saturated(self):
+        """実行数と待ち数が上限に達すると待たずに拒否することのテスト"""
+        import threading
+        from web.admission import AdmissionRejected, ConversionExecutor
+        
+        executor = ConversionExecutor(max_concurrency=1, max_queue=1)
+        release = threading.Event()
+        workers = [threading.Thread(target=executor.run, args=(release.wait,)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        
+        try:
+            while not executor.saturated():
+                release.wait(0.01)
+            with pytest.raises(AdmissionRejected) as excinfo:
+                executor.run(lambda: None)
+            assert excinfo.value.retry_after >= 1
+            assert executor.usage()['running'] == 1
+            assert executor.usage()['queued'] == 1
+            assert executor.usage()['rejected'] == 1
+        finally:
+            release.set()
+            for worker in workers:
+                worker.join()
+        
+        assert executor.run(lambda: 'done') == 'done'
+        executor.shutdown()
+    
+    def test_executor_deadline(self):
+        """期限を過ぎた変換は結果を待たずに送出し、実行待ちの変換は実行しないことのテスト"""
+        import threading
+        from web.admission import ConversionExecutor, DeadlineExceeded
+        
+        executor = ConversionExecutor(max_concurrency=1, max_queue=1)
+        release = threading.Event()
+        queued_calls = []
+        
+        with pytest.raises(DeadlineExceeded):
+            executor.run(release.wait, timeout=0.05)
+        with pytest.raises(DeadlineExceeded):
+            executor.run(queued_calls.append, 'called', timeout=0.05)
+        
+        release.set()
+        executor.shutdown()
+        assert queued_calls == []
+        assert executor.usage()['timed_out'] == 2
+        assert executor.usage()['running'] == 0
+    
+    def test_api_convert_returns_503_when_saturated(self, make_app, monkeypatch):
+        """変換の枠が埋まっている場合は503とRetry-Afterを返し、/status は応答することのテスト"""
+        import threading
+        
+        monkeypatch.setenv('MD2EXCEL_CONVERSION_CONCURRENCY', '1')
+        monkeypatch.setenv('MD2EXCEL_CONVERSION_QUEUE', '1')
+        app = make_app()
+        release = threading.Event()
+        
+        # 実行数・待ち数の上限まで変換を受け付けた状態にする
+        workers = [threading.Thread(target=app.conversions.run, args=(release.wait,)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        
+        try:
+            while not app.conversions.saturated():
+                release.wait(0.01)
+            client = app.test_client()
+            
+            response = client.post('/api/convert', json={'markdown_content': "| A |\n|---|\n| 1 |\n"})
+            assert response.status_code == 503
+            assert int(response.headers['Retry-After']) >= 1
+            assert response.get_json()['retry_after'] >= 1
+            
+            status = client.get('/status')
+            assert status.status_code == 200
+            assert status.get_json()['conversions']['rejected'] == 1
+        finally:
+            release.set()
+            for worker in workers:
+                worker.join()
+    
+    def test_api_convert_request_timeout(self, make_app):
+        """X-Request-Timeout の期限までに変換が終わらない場合は504を返すことのテスト"""
+        import time
+        
+        app = make_app()
+        original = app.processor.process_string
+        
+        def slow_process_string(*args, **kwargs):
+            time.sleep(0.5)
+            return original(*args, **kwargs)
+        
+        app.processor.process_string = slow_process_string
+        response = app.test_client().post(
+            '/api/convert',
+            json={'markdown_content': "| A |\n|---|\n| 1 |\n"},
+            headers={'X-Request-Timeout': '0.05'}
+        )
+        assert response.status_code == 504
+    
+    def test_executor_map_unordered(self):
+        """並行実行の結果が終わった順に返り、期限を過ぎた変換は例外として返ることのテスト"""
+        import threading
+        from web.admission import ConversionExecutor, DeadlineExceeded
+        
+        executor = ConversionExecutor(max_concurrency=2, max_queue=2)
+        release = threading.Event()
+        
+        def convert(value):
+            if value == 'slow':
+                release.wait()
+            return value.upper()
+        
+        arguments = [(('slow',), {}), (('a',), {}), (('b',), {})]
+        results = list(executor.map_unordered(convert, arguments, timeout=0.2))
+        release.set()
+        executor.shutdown()
+        
+        assert [index for index, _, _ in results][-1] == 0
+        assert {index: value for index, value, error in results if error is None} == {1: 'A', 2: 'B'}
+        assert isinstance(results[-1][2], DeadlineExceeded)
+        assert executor.usage()['running'] == 0
+
+
+class TestBatchConvertApi:
+    """一括変換API（/api/convert/batch）のテストクラス"""
+    
+    @pytest.fixture
+    def client(self, make_app):
+        """テストクライアント"""
+        return make_app().test_client()
+    
+    def items(self):
+        """変換する項目（成功・テーブルなし・入力不正を含む）"""
+        return [
+            {'id': 'first', 'markdown_content': "| A | B |\n|---|---|\n| 1 | 2 |\n"},
+            {'id': 'second', 'markdown_content': "# 見出しのみ\n", 'options': {'apply_formatting': True}},
+            {'id': 'broken'}
+        ]
+    
+    def test_batch_convert_ndjson(self, client):
+        """各項目の結果がNDJSONで1行ずつ返ることのテスト"""
+        import base64
+        import json
+        from openpyxl import load_workbook
+        
+        response = client.post('/api/convert/batch', json={'items': self.items()})
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        
+        lines = {}
+        for line in response.data.decode('utf-8').splitlines():
+            item = json.loads(line)
+            lines[item['id']] = item
+        
+        assert set(lines) == {'first', 'second', 'broken'}
+        assert lines['first']['success'] == True
+        assert lines['first']['tables_found'] == 1
+        assert lines['first']['index'] == 0
+        sheet = load_workbook(BytesIO(base64.b64decode(lines['first']['excel_data']))).active
+        assert sheet['A1'].value == 'A'
+        assert 'No tables found in the input file' in lines['second']['warnings']
+        assert lines['broken']['success'] == False
+        assert lines['broken']['errors'] == ['markdown_content is required']
+        assert 'excel_data' not in lines['broken']
+    
+    def test_batch_convert_zip(self, client):
+        """Acceptヘッダーでzipを要求した場合にZIPで返ることのテスト"""
+        import json
+        import zipfile
+        
+        response = client.post(
+            '/api/convert/batch',
+            json=self.items(),
+            headers={'Accept': 'application/zip'}
+        )
+        assert response.status_code == 200
+        assert response.mimetype == 'application/zip'
+        
+        with zipfile.ZipFile(BytesIO(response.data)) as archive:
+            assert sorted(archive.namelist()) == ['first.xlsx', 'results.json', 'second.xlsx']
+            results = json.loads(archive.read('results.json'))
+        assert [item['id'] for item in results] == ['first', 'second', 'broken']
+        assert [item['success'] for item in results] == [True, True, False]
+    
+    def test_batch_convert_invalid_request(self, client):
+        """項目の配列がない場合と、項目数が上限を超えた場合は400を返すことのテスト"""
+        assert client.post('/api/convert/batch', json={'items': []}).status_code == 400
+        assert client.post('/api/convert/batch', json={'markdown_content': 'x'}).status_code == 400
+        
+        client.application.config['API_BATCH_MAX_ITEMS'] = 2
+        response = client.post('/api/convert/batch', json=self.items())
+        assert response.status_code == 400
+        assert 'Too many items' in response.get_json()['error']
+
+
+class TestParseApi:
+    """解析のみのプレビューAPI（/api/parse）のテストクラス"""
+    
+    @pytest.fixture
+    def app(self, make_app):
+        """テスト用Flaskアプリケーション"""
+        return make_app()
+    
+    @pytest.fixture
+    def client(self, app):
+        """テストクライアント"""
+        return app.test_client()
+    
+    def markdown(self):
+        """2つのテーブルを含むMarkdown（2つ目は25行）"""
+        rows = ''.join(f"| {i} | item{i} |\n" for i in range(25))
+        return (
+            "| 名前 | 値 |\n|:-----|----:|\n| A | 1 |\n\n"
+            f"| No | Item |\n|----|------|\n{rows}"
+        )
+    
+    def test_parse_preview_first_page(self, client):
+        """全テーブルの概要と、指定したテーブルの最初のページを返すことのテスト"""
+        response = client.post('/api/parse', json={
+            'markdown_content': self.markdown(),
+            'table': 1,
+            'limit': 10
+        })
+        assert response.status_code == 200
+        data = response.get_json()
+        
+        assert data['tables_found'] == 2
+        assert data['cache_hit'] == False
+        assert data['tables'][0] == {
+            'index': 0,
+            'headers': ['名前', '値'],
+            'alignment': ['left', 'right'],
+            'row_count': 1
+        }
+        assert data['tables'][1]['row_count'] == 25
+        assert data['table'] == 1
+        assert data['rows'] == [[str(i), f'item{i}'] for i in range(10)]
+        assert data['next_offset'] == 10
+    
+    def test_parse_preview_paging_uses_cache(self, app, client):
+        """content_hash を指定したページ送りで再解析しないことのテスト"""
+        first = client.post('/api/parse', json={'markdown_content': self.markdown(), 'table': 1}).get_json()
+        
+        def fail(*args, **kwargs):
+            raise AssertionError('parse should not be called')
+        
+        app.processor.parser.parse = fail
+        last = client.post('/api/parse', json={
+            'content_hash': first['content_hash'],
+            'table': 1,
+            'offset': 20,
+            'limit': 10
+        }).get_json()
+        again = client.post('/api/parse', json={'markdown_content': self.markdown()}).get_json()
+        
+        assert last['rows'] == [[str(i), f'item{i}'] for i in range(20, 25)]
+        assert last['next_offset'] is None
+        assert again['cache_hit'] == True
+        assert again['content_hash'] == first['content_hash']
+        assert app.parse_cache.usage()['entries'] == 1
+    
+    def test_parse_preview_errors(self, client):
+        """入力・ページ指定が不正な場合のエラーのテスト"""
+        assert client.post('/api/parse', json={}).status_code == 400
+        assert client.post('/api/parse', json={'markdown_content': 'x', 'offset': -1}).status_code == 400
+        assert client.post('/api/parse', json={'markdown_content': 'x', 'limit': '10'}).status_code == 400
+        # limit=0 では next_offset が進まず、ページングが終わらない
+        assert client.post('/api/parse', json={'markdown_content': 'x', 'limit': 0}).status_code == 400
+        assert client.post('/api/parse', json={'content_hash': 'unknown'}).status_code == 404
+        
+        response = client.post('/api/parse', json={'markdown_content': self.markdown(), 'table': 2})
+        assert response.status_code == 400
+        
+        no_tables = client.post('/api/parse', json={'markdown_content': '# 見出しのみ\n'}).get_json()
+        assert no_tables['tables_found'] == 0
+        assert 'rows' not in no_tables
+    
+    def test_parse_cache_eviction(self):
+        """合計サイズが上限を超えた場合に最後の参照が古いものから削除することのテスト"""
+        from web.preview import ParseCache
+        
+        cache = ParseCache(max_bytes=100)
+        cache.put('first', [], 40)
+        cache.put('second', [], 40)
+        assert cache.get('first') == []
+        cache.put('third', [], 40)
+        cache.put('too_large', [], 101)
+        
+        assert cache.get('second') is None
+        assert cache.get('first') == []
+        assert cache.get('third') == []
+        assert cache.get('too_large') is None
+        assert cache.usage()['bytes'] == 80
+    
+    def test_parse_cache_counts_parsed_cells(self):
+        """キャッシュのサイズを入力ではなく解析結果のセル数から見積もることのテスト"""
+        from src.table import Table
+        from web.preview import CELL_OVERHEAD_BYTES, ParseCache
+        
+        table = Table.from_rows(['A', 'B'], [['1', '2'], ['3', '4']], ['left', 'left'])
+        cache = ParseCache(max_bytes=1000)
+        
+        assert cache.estimate_size([table], 30) == 30 + 6 * CELL_OVERHEAD_BYTES
+        cache.put('small', [table], 30)
+        assert cache.usage()['bytes'] == 30 + 6 * CELL_OVERHEAD_BYTES
+        
+        # 入力は上限より小さくても、解析結果の見積もりが上限を超えるものは保存しない
+        many_rows = Table.from_rows(['A'], [[str(i)] for i in range(20)], ['left'])
+        cache.put('large', [many_rows], 100)
+        assert cache.get('large') is None
+
+
 class TestWebAppUtilities:
     """Web アプリケーションのユーティリティ関数テスト"""
     
@@ -213,9 +995,9 @@ class TestWebAppSecurity:
     """Web アプリケーションのセキュリティテスト"""
     
     @pytest.fixture
-    def app(self):
+    def app(self, make_app):
         """セキュリティテスト用アプリ"""
-        app = create_app(testing=True)
+        app = make_app()
         app.config['WTF_CSRF_ENABLED'] = True  # CSRF保護有効
         yield app
     
@@ -0,0 +1,278 @@
+import math
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+)
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+
+class AdmissionRejected(Exception):
+    """変換の実行数と待ち数が上限に達しているため、変換を受け付けなかったことを表す例外"""
+    
+    def __init__(self, retry_after: int):
+        super().__init__(f"Conversion capacity exhausted, retry after {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(Exception):
+    """期限までに変換が終わらなかったことを表す例外"""
+
+
+class ConversionExecutor:
+    """
+    同時実行数と待ち数に上限を設けて変換を実行するクラス
+    
+    変換はリクエスト処理スレッドとは別のスレッドプールで max_concurrency 件まで
+    同時に実行し、さらに max_queue 件まで実行待ちにする。それ以上の変換は待たずに
+    AdmissionRejected を送出する。変換に使うスレッド数を制限するため、ヘルスチェックや
+    ダウンロードのリクエストは変換の実行中も処理できる。
+    
+    期限を過ぎた変換は、実行待ちであれば実行せずに取り消し、実行中であれば
+    結果を待たずに DeadlineExceeded を送出する（実行中のスレッドは止められないため、
+    枠は変換が終わるまで解放しない）。
+    """
+    
+    # Retry-After の見積もりに使う所要時間の指数移動平均の重み
+    EWMA_WEIGHT = 0.2
+    
+    def __init__(self, max_concurrency: int = 2, max_queue: int = 8):
+        """
+        Args:
+            max_concurrency: 同時に実行する変換数
+            max_queue: 実行待ちにできる変換数
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must be 0 or greater")
+        
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.rejected = 0
+        self.timed_out = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix='md2excel-convert'
+        )
+        self._slots = threading.BoundedSemaphore(max_concurrency + max_queue)
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._average_seconds = 0.0
+    
+    def run(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        timeout: Optional[float] = None,
+        block: bool = False,
+        **kwargs
+    ) -> Any:
+        """
+        変換を実行して結果を返す
+        
+        Args:
+            fn: 実行する関数
+            *args: fn の位置引数
+            timeout: 期限までの秒数（Noneの場合は期限なし。実行待ちの時間を含む）
+            block: 上限に達している場合に、送出せずに枠が空くまで待つフラグ
+                （待つ時間も timeout に含む）
+            **kwargs: fn のキーワード引数
+            
+        Returns:
+            fn の戻り値
+            
+        Raises:
+            AdmissionRejected: 上限に達している場合（block=False）
+            DeadlineExceeded: 期限までに変換が終わらなかった場合
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        future = self.submit(fn, *args, timeout=timeout, block=block, **kwargs)
+        
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+        try:
+            return future.result(timeout=remaining)
+        except FutureTimeoutError:
+            self.cancel(future)
+            raise DeadlineExceeded("Conversion did not finish before the deadline")
+    
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        timeout: Optional[float] = None,
+        block: bool = False,
+        **kwargs
+    ) -> Future:
+        """
+        変換を受け付けて、結果を待たずに Future を返す
+        
+        引数は run() と同じ。期限までに実行を始められなかった変換は実行せず、
+        Future は DeadlineExceeded で完了する。
+        
+        Returns:
+            fn の戻り値を結果とする Future
+            
+        Raises:
+            AdmissionRejected: 上限に達している場合（block=False）
+            DeadlineExceeded: 期限までに枠が空かなかった場合（block=True）
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        if block:
+            acquired = self._slots.acquire(timeout=timeout)
+        else:
+            acquired = self._slots.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                if block:
+                    self.timed_out += 1
+                else:
+                    self.rejected += 1
+            if block:
+                raise DeadlineExceeded("Timed out waiting for conversion capacity")
+            raise AdmissionRejected(self.retry_after())
+        
+        with self._lock:
+            self._admitted += 1
+        
+        try:
+            future = self._executor.submit(self._execute, deadline, fn, args, kwargs)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+    
+    def cancel(self, future: Future) -> None:
+        """
+        期限を過ぎた変換の結果を待つのをやめる（timed_out に数える）
+        
+        実行待ちであれば取り消す。実行中の場合は止められないため、完了時に枠を解放する。
+        """
+        future.cancel()
+        with self._lock:
+            self.timed_out += 1
+    
+    def map_unordered(
+        self,
+        fn: Callable[..., Any],
+        arguments: Iterable[Tuple[tuple, Dict[str, Any]]],
+        timeout: Optional[float] = None,
+        window: Optional[int] = None
+    ) -> Iterator[Tuple[int, Any, Optional[BaseException]]]:
+        """
+        複数の変換を並行して実行し、終わった順に結果を返すジェネレーター
+        
+        同時に受け付ける変換は window 件まで（他のリクエストの変換と合わせて上限に
+        達している場合は枠が空くまで待つ）とし、1回の呼び出しで枠を使い切らない。
+        期限までに終わらなかった変換は DeadlineExceeded を例外として返す。
+        
+        Args:
+            fn: 実行する関数
+            arguments: 変換ごとの (位置引数, キーワード引数) のイテラブル
+            timeout: すべての変換で共有する期限までの秒数（Noneの場合は期限なし）
+            window: 同時に受け付ける変換数（Noneの場合は max_concurrency）
+            
+        Yields:
+            (arguments 内の位置, fn の戻り値, 送出された例外) のタプル
+            （例外がない場合は None、例外がある場合の戻り値は None）
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        window = window or self.max_concurrency
+        
+        def remaining() -> Optional[float]:
+            return None if deadline is None else max(deadline - time.monotonic(), 0)
+        
+        pending: Dict[Future, int] = {}
+        calls = enumerate(arguments)
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < window:
+                    try:
+                        index, (args, kwargs) = next(calls)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    try:
+                        future = self.submit(fn, *args, timeout=remaining(), block=True, **kwargs)
+                    except DeadlineExceeded as e:
+                        yield index, None, e
+                        continue
+                    pending[future] = index
+                
+                if not pending:
+                    break
+                
+                done, _ = wait(pending, timeout=remaining(), return_when=FIRST_COMPLETED)
+                if not done:
+                    # 期限切れ（残りの変換は submit() で期限切れとして扱われる）
+                    for future, index in list(pending.items()):
+                        del pending[future]
+                        self.cancel(future)
+                        yield index, None, DeadlineExceeded("Conversion did not finish before the deadline")
+                    continue
+                
+                for future in done:
+                    index = pending.pop(future)
+                    error = future.exception()
+                    yield index, None if error is not None else future.result(), error
+        finally:
+            # 途中で閉じられた場合（クライアントの切断など）は実行待ちの変換を取り消す
+            for future in pending:
+                future.cancel()
+    
+    def saturated(self) -> bool:
+        """実行数と待ち数が上限に達しているか"""
+        with self._lock:
+            return self._admitted >= self.max_concurrency + self.max_queue
+    
+    def retry_after(self) -> int:
+        """
+        枠が空くまでのおおよその秒数（Retry-After ヘッダーの値、1以上）
+        
+        変換の所要時間の移動平均と、受け付け済みの変換数から見積もる。
+        """
+        with self._lock:
+            waves = math.ceil(self._admitted / self.max_concurrency)
+            return max(1, math.ceil(self._average_seconds * waves))
+    
+    def usage(self) -> Dict[str, Any]:
+        """実行状況を辞書形式で返す"""
+        with self._lock:
+            admitted = self._admitted
+            return {
+                'running': min(admitted, self.max_concurrency),
+                'queued': max(admitted - self.max_concurrency, 0),
+                'max_concurrency': self.max_concurrency,
+                'max_queue': self.max_queue,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out
+            }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """スレッドプールを停止する"""
+        self._executor.shutdown(wait=wait)
+    
+    def _execute(self, deadline: Optional[float], fn: Callable[..., Any], args, kwargs) -> Any:
+        """スレッドプールで変換を実行する（実行待ちの間に期限を過ぎた変換は実行しない）"""
+        if deadline is not None and time.monotonic() >= deadline:
+            raise DeadlineExceeded("Conversion deadline passed while queued")
+        
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                if self._average_seconds == 0.0:
+                    self._average_seconds = elapsed
+                else:
+                    self._average_seconds += self.EWMA_WEIGHT * (elapsed - self._average_seconds)
+    
+    def _release(self) -> None:
+        """変換1件分の枠を解放する"""
+        with self._lock:
+            self._admitted -= 1
+        self._slots.release()
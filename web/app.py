@@ -1,39 +1,135 @@
+import io
+import json
 import os
 import uuid
-import zipfile
 from pathlib import Path
-from flask import Flask, render_template, request, redirect, url_for, flash, send_file, jsonify
+from flask import (
+    Flask, Request, Response, current_app, g, make_response, render_template, request, redirect, url_for,
+    flash, send_file, jsonify, stream_with_context
+)
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
 import tempfile
+import time
 import sys
 
 # プロジェクトルートをパスに追加
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../'))
 
 from src.integration import MarkdownToExcelProcessor
+from src.cache import ConversionCache
+from web.admission import AdmissionRejected, ConversionExecutor, DeadlineExceeded
+from web.cleanup import UploadJanitor
+from web.jobs import JobQueue, JOB_COMPLETED
+from web.metrics import AppMetrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from web.preview import ParseCache
+from web.zipstream import iter_zip
 
+# xlsxファイルのMIMEタイプ
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
 
-def create_app(testing=False):
-    """Flaskアプリケーションファクトリ"""
+# /api/convert/batch のレスポンス形式（1行1件のJSON、またはZIP）
+NDJSON_MIMETYPE = 'application/x-ndjson'
+ZIP_MIMETYPE = 'application/zip'
+
+
+class InMemoryUploadRequest(Request):
+    """
+    アップロードされたファイルを一時ファイルに書き出さずにメモリ上に保持するリクエスト
+    
+    Werkzeug は500KBを超えるアップロードを一時ファイルに書き出すが、
+    変換はリクエストのストリームから直接行うため、ディスクを経由させない。
+    リクエスト全体のサイズは MAX_CONTENT_LENGTH で制限される。
+    """
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return io.BytesIO()
+
+
+def create_app(testing=False, upload_folder=None, cache_folder=None):
+    """
+    Flaskアプリケーションファクトリ
+    
+    Args:
+        testing: テスト用の設定にするか（フォルダを指定しない場合は一時フォルダを作成する）
+        upload_folder: アップロードフォルダ（Noneの場合は既定のフォルダ）
+        cache_folder: 変換結果のキャッシュフォルダ（Noneの場合は既定のフォルダ）
+    """
     app = Flask(__name__, 
                 template_folder=os.path.join(os.path.dirname(__file__), 'templates'),
                 static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+    app.request_class = InMemoryUploadRequest
     
     # 設定
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB制限
     
+    app.config['CACHE_MAX_BYTES'] = int(os.environ.get('MD2EXCEL_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+    app.config['JOB_WORKERS'] = int(os.environ.get('MD2EXCEL_JOB_WORKERS', 2))
+    app.config['API_BATCH_MAX_ITEMS'] = int(os.environ.get('MD2EXCEL_API_BATCH_MAX_ITEMS', 1000))
+    
+    # /api/parse の1ページの行数（既定値・上限、1以上）と、解析結果のキャッシュの最大サイズ
+    # （キャッシュのサイズは入力ではなく、解析結果のメモリ使用量の見積もりで数える）
+    app.config['PARSE_PAGE_ROWS'] = max(1, int(os.environ.get('MD2EXCEL_PARSE_PAGE_ROWS', 100)))
+    app.config['PARSE_PAGE_MAX_ROWS'] = max(1, int(os.environ.get('MD2EXCEL_PARSE_PAGE_MAX_ROWS', 1000)))
+    app.config['PARSE_CACHE_MAX_BYTES'] = int(os.environ.get('MD2EXCEL_PARSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    
+    # 変換の同時実行数・実行待ちの上限・1リクエストの期限（秒）
+    app.config['CONVERSION_CONCURRENCY'] = int(os.environ.get('MD2EXCEL_CONVERSION_CONCURRENCY', 2))
+    app.config['CONVERSION_QUEUE'] = int(os.environ.get('MD2EXCEL_CONVERSION_QUEUE', 8))
+    app.config['CONVERSION_TIMEOUT'] = float(os.environ.get('MD2EXCEL_CONVERSION_TIMEOUT', 60))
+    
+    # アップロードフォルダの変換結果・作業ファイルの保持期間・最大合計サイズ・削除の実行間隔
+    app.config['UPLOAD_MAX_AGE'] = float(os.environ.get('MD2EXCEL_UPLOAD_MAX_AGE', 60 * 60))
+    app.config['UPLOAD_MAX_BYTES'] = int(os.environ.get('MD2EXCEL_UPLOAD_MAX_BYTES', 1024 * 1024 * 1024))
+    app.config['UPLOAD_CLEANUP_INTERVAL'] = float(os.environ.get('MD2EXCEL_UPLOAD_CLEANUP_INTERVAL', 60))
+    
     if testing:
-        app.config['UPLOAD_FOLDER'] = tempfile.mkdtemp()
+        app.config['UPLOAD_FOLDER'] = upload_folder or tempfile.mkdtemp()
+        app.config['CACHE_FOLDER'] = cache_folder or tempfile.mkdtemp()
     else:
-        app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(__file__), 'uploads')
+        app.config['UPLOAD_FOLDER'] = upload_folder or os.path.join(os.path.dirname(__file__), 'uploads')
+        app.config['CACHE_FOLDER'] = cache_folder or os.environ.get(
+            'MD2EXCEL_CACHE_DIR', os.path.join(os.path.dirname(__file__), 'cache')
+        )
     
     # アップロードフォルダ作成
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
-    # MarkdownToExcelProcessorの初期化
-    app.processor = MarkdownToExcelProcessor()
+    # MarkdownToExcelProcessorの初期化（変換結果はCLIと共有可能なキャッシュに保存）
+    app.processor = MarkdownToExcelProcessor(
+        cache=ConversionCache(app.config['CACHE_FOLDER'], app.config['CACHE_MAX_BYTES'])
+    )
+    
+    # 変換を実行するスレッドプール（上限を超えた変換は503で拒否する）
+    app.conversions = ConversionExecutor(
+        max_concurrency=app.config['CONVERSION_CONCURRENCY'],
+        max_queue=app.config['CONVERSION_QUEUE']
+    )
+    
+    # /api/parse の解析結果のキャッシュ（ページ送りで再解析しない）
+    app.parse_cache = ParseCache(app.config['PARSE_CACHE_MAX_BYTES'])
+    
+    # /metrics で公開するメトリクス（プロセス内に保持する）
+    app.metrics = AppMetrics()
+    
+    # アップロードフォルダの期限切れ・容量超過のファイルの削除（テスト時は自動実行しない）
+    app.janitor = UploadJanitor(
+        app.config['UPLOAD_FOLDER'],
+        max_age_seconds=app.config['UPLOAD_MAX_AGE'],
+        max_bytes=app.config['UPLOAD_MAX_BYTES']
+    )
+    if not testing:
+        app.janitor.start(app.config['UPLOAD_CLEANUP_INTERVAL'])
+    
+    # バッチ変換ジョブのキュー（バックグラウンドのスレッドで変換する）
+    app.job_queue = JobQueue(
+        app.processor,
+        max_workers=app.config['JOB_WORKERS'],
+        janitor=app.janitor,
+        metrics=app.metrics,
+        max_age_seconds=app.config['UPLOAD_MAX_AGE']
+    )
     
     # ルート登録
     register_routes(app)
@@ -44,6 +140,19 @@ def create_app(testing=False):
 def register_routes(app):
     """ルートを登録"""
     
+    @app.before_request
+    def start_request_timer():
+        """リクエストの所要時間の計測を開始"""
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        """リクエスト数と所要時間を記録（ストリーミングのレスポンスは送信開始までの時間）"""
+        start = g.get('request_start')
+        if start is not None:
+            app.metrics.observe_request(request.endpoint, response.status_code, time.perf_counter() - start)
+        return response
+
     @app.route('/')
     def index():
         """メインページ"""
@@ -64,11 +173,7 @@ def register_routes(app):
                 return redirect(request.url)
             
             if file and allowed_file(file.filename):
-                # ファイル保存
                 filename = secure_filename(file.filename)
-                unique_filename = f"{uuid.uuid4()}_{filename}"
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-                file.save(filepath)
                 
                 try:
                     # オプション取得
@@ -79,15 +184,24 @@ def register_routes(app):
                     output_filename = f"{Path(filename).stem}.xlsx"
                     output_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4()}_{output_filename}")
                     
-                    result = app.processor.process_file(
-                        filepath,
-                        output_path,
-                        apply_formatting=apply_formatting,
-                        auto_adjust_width=auto_adjust_width
+                    app.metrics.observe_upload(
+                        time.perf_counter() - g.request_start, request.content_length or 0
                     )
                     
-                    # 入力ファイル削除
-                    os.remove(filepath)
+                    # 入力はアップロードのストリームから直接変換し、ダウンロード用の
+                    # 出力ファイルだけを保存する（変換中は削除処理の対象外にする）
+                    with app.janitor.in_use(os.path.basename(output_path)):
+                        with app.metrics.track_in_flight():
+                            _, result = app.conversions.run(
+                                app.processor.process_stream,
+                                file.stream,
+                                output_path,
+                                apply_formatting=apply_formatting,
+                                auto_adjust_width=auto_adjust_width,
+                                input_name=filename,
+                                timeout=request_timeout()
+                            )
+                        app.metrics.observe_result(result)
                     
                     if result.success:
                         flash(f'変換成功！{result.tables_found}個のテーブルを処理しました', 'success')
@@ -101,11 +215,14 @@ def register_routes(app):
                             flash(f'エラー: {error}', 'error')
                         return redirect(request.url)
                         
+                except AdmissionRejected as e:
+                    flash('サーバーが混み合っています。しばらくしてから再度お試しください', 'error')
+                    return busy_response(render_template('upload.html'), e.retry_after)
+                except DeadlineExceeded:
+                    flash('変換が時間内に終わりませんでした', 'error')
+                    return render_template('upload.html'), 504
                 except Exception as e:
                     flash(f'処理中にエラーが発生しました: {str(e)}', 'error')
-                    # クリーンアップ
-                    if os.path.exists(filepath):
-                        os.remove(filepath)
                     return redirect(request.url)
             else:
                 flash('Markdownファイル（.md, .markdown）のみアップロード可能です', 'error')
@@ -135,54 +252,75 @@ def register_routes(app):
                 apply_formatting = 'apply_formatting' in request.form
                 auto_adjust_width = 'auto_adjust_width' in request.form
                 
-                # 一時ディレクトリ作成
-                batch_id = str(uuid.uuid4())
-                batch_input_dir = os.path.join(app.config['UPLOAD_FOLDER'], f"batch_input_{batch_id}")
-                batch_output_dir = os.path.join(app.config['UPLOAD_FOLDER'], f"batch_output_{batch_id}")
-                os.makedirs(batch_input_dir, exist_ok=True)
-                os.makedirs(batch_output_dir, exist_ok=True)
-                
-                # ファイル保存
-                for file in valid_files:
-                    filename = secure_filename(file.filename)
-                    filepath = os.path.join(batch_input_dir, filename)
-                    file.save(filepath)
-                
-                # バッチ処理実行
-                results = app.processor.process_directory(
-                    batch_input_dir,
-                    batch_output_dir,
-                    apply_formatting=apply_formatting,
-                    auto_adjust_width=auto_adjust_width
+                # アップロード内容を読み込む（ディスクには保存しない）
+                uploads = [(secure_filename(f.filename), f.read()) for f in valid_files]
+                app.metrics.observe_upload(
+                    time.perf_counter() - g.request_start, sum(len(content) for _, content in uploads)
                 )
-                
-                # 統計情報取得
-                stats = app.processor.get_statistics(results)
-                
-                # ZIP作成
-                zip_filename = f"converted_files_{batch_id}.zip"
-                zip_path = os.path.join(app.config['UPLOAD_FOLDER'], zip_filename)
-                
-                with zipfile.ZipFile(zip_path, 'w') as zipf:
-                    for result in results:
-                        if result.success and os.path.exists(result.output_file):
-                            zipf.write(result.output_file, os.path.basename(result.output_file))
-                
-                # クリーンアップ
-                import shutil
-                shutil.rmtree(batch_input_dir)
-                shutil.rmtree(batch_output_dir)
-                
-                # 結果表示
-                flash(f'バッチ処理完了！{stats["successful_files"]}個のファイルを変換しました', 'success')
-                if stats["failed_files"] > 0:
-                    flash(f'{stats["failed_files"]}個のファイルで処理に失敗しました', 'warning')
-                
-                return redirect(url_for('download_file', filename=zip_filename))
-                
             except Exception as e:
                 flash(f'バッチ処理中にエラーが発生しました: {str(e)}', 'error')
                 return redirect(request.url)
+            
+            # 送信を始めた後は503を返せないため、受け付け前に空きを確認する
+            if app.conversions.saturated():
+                flash('サーバーが混み合っています。しばらくしてから再度お試しください', 'error')
+                return busy_response(render_template('batch.html'), app.conversions.retry_after())
+            
+            deadline = time.monotonic() + request_timeout()
+            
+            def converted_entries():
+                """変換が終わったファイルから順に (ZIP内のファイル名, xlsx) を返す"""
+                failures = []
+                used_names = set()
+                for filename, content in uploads:
+                    try:
+                        markdown_content = content.decode('utf-8')
+                    except UnicodeDecodeError:
+                        failures.append(f"{filename}: File is not valid UTF-8 text")
+                        continue
+                    
+                    # 各ファイルは枠が空くまで待って変換する（期限はバッチ全体で共有）
+                    try:
+                        with app.metrics.track_in_flight():
+                            excel_bytes, result = app.conversions.run(
+                                app.processor.process_string,
+                                markdown_content,
+                                apply_formatting=apply_formatting,
+                                auto_adjust_width=auto_adjust_width,
+                                timeout=max(deadline - time.monotonic(), 0),
+                                block=True
+                            )
+                    except DeadlineExceeded as e:
+                        failures.append(f"{filename}: {str(e)}")
+                        continue
+                    
+                    app.metrics.observe_result(result)
+                    if result.success:
+                        # 同じ名前のファイル（a.md と a.markdown など）は番号を付けて区別する
+                        stem = Path(filename).stem or 'converted'
+                        name = f"{stem}.xlsx"
+                        number = 1
+                        while name in used_names:
+                            name = f"{stem}_{number}.xlsx"
+                            number += 1
+                        used_names.add(name)
+                        yield name, excel_bytes
+                    else:
+                        failures.extend(f"{filename}: {error}" for error in result.errors)
+                
+                # レスポンス送信後はメッセージを表示できないため、失敗はZIP内に記録する
+                if failures:
+                    yield 'errors.txt', '\n'.join(failures).encode('utf-8')
+            
+            # 変換の完了を待たず、ZIPをエントリ単位で生成しながら送信する
+            batch_id = str(uuid.uuid4())
+            return Response(
+                stream_with_context(iter_zip(converted_entries())),
+                mimetype='application/zip',
+                headers={
+                    'Content-Disposition': f'attachment; filename=converted_files_{batch_id}.zip'
+                }
+            )
         
         return render_template('batch.html')
 
@@ -190,12 +328,15 @@ def register_routes(app):
     def download_file(filename):
         """ファイルダウンロード"""
         try:
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            if not os.path.exists(file_path):
-                flash('ファイルが見つかりません', 'error')
-                return redirect(url_for('index'))
-            
-            return send_file(file_path, as_attachment=True, download_name=filename)
+            # ファイルを開くまで削除処理の対象外にする（開いた後に削除されても送信は続けられる）
+            with app.janitor.in_use(filename):
+                file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+                if not os.path.exists(file_path):
+                    flash('ファイルが見つかりません', 'error')
+                    return redirect(url_for('index'))
+                
+                app.janitor.touch(filename)
+                return send_file(file_path, as_attachment=True, download_name=filename)
             
         except Exception as e:
             flash(f'ダウンロードエラー: {str(e)}', 'error')
@@ -203,62 +344,369 @@ def register_routes(app):
 
     @app.route('/api/convert', methods=['POST'])
     def api_convert():
-        """API エンドポイント - JSON形式での変換"""
+        """
+        API エンドポイント - JSON形式での変換
+        
+        Acceptヘッダーでxlsxを要求された場合はxlsxを直接返し、
+        メタデータはレスポンスヘッダー（X-Tables-Found など）で返す。
+        それ以外はBase64エンコードしたxlsxを含むJSONを返す。
+        """
         try:
             data = request.get_json()
+            app.metrics.observe_upload(time.perf_counter() - g.request_start, request.content_length or 0)
             
             if not data or 'markdown_content' not in data:
                 return jsonify({'error': 'markdown_content is required'}), 400
             
             markdown_content = data['markdown_content']
+            if not isinstance(markdown_content, str):
+                return jsonify({'error': 'markdown_content must be a string'}), 400
             apply_formatting = data.get('apply_formatting', False)
             auto_adjust_width = data.get('auto_adjust_width', False)
             
-            # 一時ファイル作成
-            temp_id = str(uuid.uuid4())
-            temp_input = os.path.join(app.config['UPLOAD_FOLDER'], f"api_input_{temp_id}.md")
-            temp_output = os.path.join(app.config['UPLOAD_FOLDER'], f"api_output_{temp_id}.xlsx")
-            
-            # Markdownコンテンツ保存
-            with open(temp_input, 'w', encoding='utf-8') as f:
-                f.write(markdown_content)
-            
-            # 変換実行
-            result = app.processor.process_file(
-                temp_input,
-                temp_output,
-                apply_formatting=apply_formatting,
-                auto_adjust_width=auto_adjust_width
-            )
-            
-            # 入力ファイル削除
-            os.remove(temp_input)
+            # メモリ上で変換実行（一時ファイルは作成しない）
+            with app.metrics.track_in_flight():
+                excel_bytes, result = app.conversions.run(
+                    app.processor.process_string,
+                    markdown_content,
+                    apply_formatting=apply_formatting,
+                    auto_adjust_width=auto_adjust_width,
+                    timeout=request_timeout()
+                )
+            app.metrics.observe_result(result)
             
-            if result.success:
+            if result.success and wants_xlsx_response():
+                # xlsxをそのままレスポンスボディとして返す
+                response = send_file(
+                    io.BytesIO(excel_bytes),
+                    mimetype=XLSX_MIMETYPE,
+                    as_attachment=True,
+                    download_name='converted.xlsx'
+                )
+                response.headers['X-Tables-Found'] = str(result.tables_found)
+                response.headers['X-Warnings'] = json.dumps(result.warnings)
+                response.headers['X-Processing-Time'] = f"{result.processing_time_seconds:.6f}"
+                response.headers['X-Cache-Hit'] = 'true' if result.cache_hit else 'false'
+                return response
+            elif result.success:
                 # Base64エンコードしてファイル内容を返す
                 import base64
-                with open(temp_output, 'rb') as f:
-                    excel_data = base64.b64encode(f.read()).decode('utf-8')
-                
-                os.remove(temp_output)
+                excel_data = base64.b64encode(excel_bytes).decode('utf-8')
                 
                 return jsonify({
                     'success': True,
                     'tables_found': result.tables_found,
                     'warnings': result.warnings,
                     'excel_data': excel_data,
-                    'processing_time': result.processing_time_seconds
+                    'processing_time': result.processing_time_seconds,
+                    'cache_hit': result.cache_hit
                 })
             else:
-                if os.path.exists(temp_output):
-                    os.remove(temp_output)
                 return jsonify({
                     'success': False,
                     'errors': result.errors
                 }), 400
                 
+        except AdmissionRejected as e:
+            return busy_response(jsonify({'error': str(e), 'retry_after': e.retry_after}), e.retry_after)
+        except DeadlineExceeded as e:
+            return jsonify({'error': str(e)}), 504
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/convert/batch', methods=['POST'])
+    def api_convert_batch():
+        """
+        API エンドポイント - 複数ドキュメントの一括変換
+        
+        {"items": [{"id", "markdown_content", "options"}, ...]}（または items の配列）を
+        受け取り、変換スレッドプールで並行して変換する。変換が終わった項目から順に、
+        NDJSON（1行1件のJSON、xlsxはBase64）で返す。Acceptヘッダーでzipを要求された
+        場合は、成功した項目の <id>.xlsx と全項目の結果（results.json）を含むZIPを返す。
+        """
+        data = request.get_json(silent=True)
+        app.metrics.observe_upload(time.perf_counter() - g.request_start, request.content_length or 0)
+        
+        items = data.get('items') if isinstance(data, dict) else data
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'items must be a non-empty array'}), 400
+        if len(items) > app.config['API_BATCH_MAX_ITEMS']:
+            return jsonify({
+                'error': f"Too many items (maximum {app.config['API_BATCH_MAX_ITEMS']})"
+            }), 400
+        
+        # 送信を始めた後は503を返せないため、受け付け前に空きを確認する
+        if app.conversions.saturated():
+            retry_after = app.conversions.retry_after()
+            return busy_response(
+                jsonify({'error': 'Conversion capacity exhausted', 'retry_after': retry_after}),
+                retry_after
+            )
+        
+        # 入力が不正な項目は変換せずにエラーとして返す
+        item_ids = []
+        calls = []
+        invalid = []
+        for index, item in enumerate(items):
+            item = item if isinstance(item, dict) else {}
+            item_ids.append(str(item.get('id', index)))
+            options = item.get('options')
+            options = options if isinstance(options, dict) else {}
+            markdown_content = item.get('markdown_content')
+            if not isinstance(markdown_content, str):
+                invalid.append(index)
+                continue
+            calls.append((
+                index,
+                (markdown_content,),
+                {
+                    'apply_formatting': bool(options.get('apply_formatting', False)),
+                    'auto_adjust_width': bool(options.get('auto_adjust_width', False)),
+                    'infer_types': bool(options.get('infer_types', False))
+                }
+            ))
+        timeout = request_timeout()
+        
+        def item_results():
+            """変換が終わった項目から順に (項目の位置, 結果の辞書, xlsx) を返す"""
+            for index in invalid:
+                yield index, {
+                    'id': item_ids[index],
+                    'success': False,
+                    'errors': ['markdown_content is required']
+                }, None
+            
+            with app.metrics.track_in_flight():
+                converted = app.conversions.map_unordered(
+                    app.processor.process_string,
+                    [(args, kwargs) for _, args, kwargs in calls],
+                    timeout=timeout
+                )
+                for position, value, error in converted:
+                    index = calls[position][0]
+                    if error is not None:
+                        yield index, {'id': item_ids[index], 'success': False, 'errors': [str(error)]}, None
+                        continue
+                    
+                    excel_bytes, result = value
+                    app.metrics.observe_result(result)
+                    summary = {
+                        'id': item_ids[index],
+                        'success': result.success,
+                        'tables_found': result.tables_found,
+                        'warnings': result.warnings,
+                        'errors': result.errors,
+                        'processing_time': result.processing_time_seconds,
+                        'cache_hit': result.cache_hit
+                    }
+                    yield index, summary, excel_bytes if result.success else None
+        
+        if wants_zip_response():
+            def zip_entries():
+                """成功した項目の xlsx と、全項目の結果を返す"""
+                summaries = []
+                used_names = set()
+                for index, summary, excel_bytes in item_results():
+                    summaries.append(dict(summary, index=index))
+                    if excel_bytes is None:
+                        continue
+                    name = f"{secure_filename(summary['id']) or index}.xlsx"
+                    if name in used_names:
+                        name = f"{Path(name).stem}_{index}.xlsx"
+                    used_names.add(name)
+                    yield name, excel_bytes
+                
+                summaries.sort(key=lambda summary: summary['index'])
+                yield 'results.json', json.dumps(summaries, ensure_ascii=False, indent=2).encode('utf-8')
+            
+            batch_id = str(uuid.uuid4())
+            return Response(
+                stream_with_context(iter_zip(zip_entries())),
+                mimetype=ZIP_MIMETYPE,
+                headers={
+                    'Content-Disposition': f'attachment; filename=converted_items_{batch_id}.zip'
+                }
+            )
+        
+        def ndjson_lines():
+            """変換が終わった項目から順に1行ずつ返す"""
+            import base64
+            for index, summary, excel_bytes in item_results():
+                line = dict(summary, index=index)
+                if excel_bytes is not None:
+                    line['excel_data'] = base64.b64encode(excel_bytes).decode('utf-8')
+                yield json.dumps(line, ensure_ascii=False) + '\n'
+        
+        return Response(stream_with_context(ndjson_lines()), mimetype=NDJSON_MIMETYPE)
+
+    @app.route('/api/parse', methods=['POST'])
+    def api_parse():
+        """
+        API エンドポイント - 解析のみのプレビュー
+        
+        テーブルの解析だけを行い、全テーブルの概要（ヘッダー・アライメント・行数）と、
+        table で指定したテーブルの offset から limit 行を返す。解析結果は入力の
+        ハッシュ（content_hash）をキーにキャッシュし、次のページは markdown_content の
+        代わりに content_hash を指定して再解析せずに取得できる。
+        """
+        try:
+            data = request.get_json(silent=True)
+            app.metrics.observe_upload(time.perf_counter() - g.request_start, request.content_length or 0)
+            
+            if not isinstance(data, dict):
+                return jsonify({'error': 'markdown_content or content_hash is required'}), 400
+            
+            try:
+                table_index = page_argument(data, 'table', 0)
+                offset = page_argument(data, 'offset', 0)
+                limit = min(
+                    page_argument(data, 'limit', app.config['PARSE_PAGE_ROWS'], minimum=1),
+                    app.config['PARSE_PAGE_MAX_ROWS']
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            markdown_content = data.get('markdown_content')
+            if isinstance(markdown_content, str):
+                content = markdown_content.encode('utf-8')
+                content_hash = app.parse_cache.content_hash(content)
+                tables = app.parse_cache.get(content_hash)
+                cache_hit = tables is not None
+                if tables is None:
+                    tables = app.conversions.run(
+                        app.processor.parser.parse,
+                        markdown_content,
+                        as_table=True,
+                        timeout=request_timeout()
+                    )
+                    app.parse_cache.put(content_hash, tables, len(content))
+            elif isinstance(data.get('content_hash'), str):
+                content_hash = data['content_hash']
+                tables = app.parse_cache.get(content_hash)
+                cache_hit = True
+                if tables is None:
+                    return jsonify({
+                        'error': 'Unknown content_hash, send markdown_content instead'
+                    }), 404
+            else:
+                return jsonify({'error': 'markdown_content or content_hash is required'}), 400
+            
+            response = {
+                'content_hash': content_hash,
+                'cache_hit': cache_hit,
+                'tables_found': len(tables),
+                'tables': [dict(table.summary(), index=index) for index, table in enumerate(tables)]
+            }
+            if not tables:
+                return jsonify(response)
+            if table_index >= len(tables):
+                return jsonify({'error': f"table must be less than {len(tables)}"}), 400
+            
+            # 指定された範囲の行だけを組み立てる
+            table = tables[table_index]
+            next_offset = offset + limit
+            response.update({
+                'table': table_index,
+                'offset': offset,
+                'limit': limit,
+                'rows': table.to_dict(offset, limit)['rows'],
+                'next_offset': next_offset if next_offset < table.row_count else None
+            })
+            return jsonify(response)
+            
+        except AdmissionRejected as e:
+            return busy_response(jsonify({'error': str(e), 'retry_after': e.retry_after}), e.retry_after)
+        except DeadlineExceeded as e:
+            return jsonify({'error': str(e)}), 504
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/jobs', methods=['POST'])
+    def api_submit_job():
+        """
+        API エンドポイント - バッチ変換ジョブの登録
+        
+        アップロードされたファイルを保存してジョブを登録し、変換の完了を待たずに
+        ジョブIDを返す（202 Accepted）。進捗は GET /api/jobs/<job_id> で取得する。
+        """
+        files = request.files.getlist('files')
+        valid_files = [f for f in files if f.filename != '' and allowed_file(f.filename)]
+        
+        if not valid_files:
+            return jsonify({'error': 'No valid Markdown files uploaded'}), 400
+        
+        try:
+            apply_formatting = request.form.get('apply_formatting', 'false').lower() in ('1', 'true', 'on')
+            auto_adjust_width = request.form.get('auto_adjust_width', 'false').lower() in ('1', 'true', 'on')
+            
+            job = app.job_queue.create(app.config['UPLOAD_FOLDER'])
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+        
+        try:
+            for file in valid_files:
+                file.save(job.input_path(secure_filename(file.filename)))
+            app.metrics.observe_upload(
+                time.perf_counter() - g.request_start,
+                sum(entry.stat().st_size for entry in os.scandir(job.input_dir))
+            )
+            
+            app.job_queue.submit(job, apply_formatting=apply_formatting, auto_adjust_width=auto_adjust_width)
         except Exception as e:
+            # 実行を開始できなかったジョブは記録と作業ディレクトリを残さない
+            app.job_queue.discard(job)
             return jsonify({'error': str(e)}), 500
+        
+        response = jsonify({
+            'job_id': job.job_id,
+            'status': job.status,
+            'status_url': url_for('api_job_status', job_id=job.job_id),
+            'download_url': url_for('api_job_download', job_id=job.job_id)
+        })
+        response.status_code = 202
+        response.headers['Location'] = url_for('api_job_status', job_id=job.job_id)
+        return response
+
+    @app.route('/api/jobs/<job_id>')
+    def api_job_status(job_id):
+        """API エンドポイント - ジョブの進捗とファイルごとの処理結果"""
+        job = app.job_queue.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify(job.to_dict())
+
+    @app.route('/api/jobs/<job_id>/download')
+    def api_job_download(job_id):
+        """API エンドポイント - 完了したジョブの変換結果（ZIP）のダウンロード"""
+        job = app.job_queue.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        if job.status != JOB_COMPLETED:
+            return jsonify({'error': 'Job is not completed', 'status': job.status}), 409
+        
+        # ファイルを開くまで削除処理の対象外にする（開いた後に削除されても送信は続けられる）
+        job_dir_name = os.path.basename(job.job_dir)
+        with app.janitor.in_use(job_dir_name):
+            if not os.path.exists(job.archive_path):
+                return jsonify({'error': 'Job archive has expired'}), 410
+            
+            app.janitor.touch(job_dir_name)
+            return send_file(
+                job.archive_path,
+                mimetype='application/zip',
+                as_attachment=True,
+                download_name=f"converted_files_{job.job_id}.zip"
+            )
+
+    @app.route('/metrics')
+    def metrics():
+        """メトリクスエンドポイント（Prometheusのテキスト形式）"""
+        return Response(
+            app.metrics.render(app.janitor.usage(), app.conversions.usage()),
+            content_type=METRICS_CONTENT_TYPE
+        )
 
     @app.route('/status')
     def status():
@@ -266,7 +714,12 @@ def register_routes(app):
         return jsonify({
             'status': 'healthy',
             'version': '1.0.0',
-            'features': ['single_file', 'batch_processing', 'api']
+            'features': [
+                'single_file', 'batch_processing', 'api', 'api_batch', 'parse_preview', 'batch_jobs', 'metrics'
+            ],
+            'uploads': app.janitor.usage(),
+            'parse_cache': app.parse_cache.usage(),
+            'conversions': app.conversions.usage()
         })
 
     @app.errorhandler(413)
@@ -286,6 +739,49 @@ def register_routes(app):
         return render_template('500.html'), 500
 
 
+def request_timeout():
+    """
+    リクエストの変換の期限（秒）
+    
+    X-Request-Timeout ヘッダーで指定された秒数と、設定の CONVERSION_TIMEOUT の短い方。
+    """
+    timeout = current_app.config['CONVERSION_TIMEOUT']
+    try:
+        requested = float(request.headers.get('X-Request-Timeout', ''))
+    except ValueError:
+        return timeout
+    if requested > 0:
+        timeout = min(timeout, requested)
+    return timeout
+
+
+def busy_response(body, retry_after):
+    """混雑時の503レスポンス（Retry-After ヘッダー付き）を作成"""
+    response = make_response(body, 503)
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+
+def wants_xlsx_response():
+    """クライアントがJSONよりxlsxのレスポンスを優先しているかチェック"""
+    best = request.accept_mimetypes.best_match(['application/json', XLSX_MIMETYPE])
+    return best == XLSX_MIMETYPE
+
+
+def page_argument(data, name, default, minimum=0):
+    """/api/parse のページ指定（minimum以上の整数）を取得する"""
+    value = data.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+        raise ValueError(f"{name} must be an integer >= {minimum}")
+    return value
+
+
+def wants_zip_response():
+    """クライアントがNDJSONよりZIPのレスポンスを優先しているかチェック"""
+    best = request.accept_mimetypes.best_match([NDJSON_MIMETYPE, ZIP_MIMETYPE])
+    return best == ZIP_MIMETYPE
+
+
 def allowed_file(filename):
     """許可されたファイル拡張子かチェック"""
     ALLOWED_EXTENSIONS = {'md', 'markdown'}
@@ -0,0 +1,219 @@
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class UploadJanitor:
+    """
+    アップロードフォルダの変換結果・作業ファイルを削除するクラス
+    
+    フォルダ直下のファイルとディレクトリ（ジョブの作業ディレクトリなど）を1件の
+    エントリとして扱い、最終利用時刻が max_age_seconds より古いエントリと、
+    合計サイズが max_bytes を超えた分を最終利用時刻が古いものから削除する。
+    最終利用時刻はエントリ内で最も新しい更新時刻とし、ダウンロード時に touch() で更新する。
+    
+    処理中のエントリやダウンロードで開く前のファイルは acquire()/release()
+    （または in_use()）で登録し、登録中は削除しない。送信のために開いたファイルは
+    削除しても送信を続けられる。削除できないエントリ（開いているファイルを削除できない
+    環境で送信中のものなど）は読み飛ばし、次回の実行で削除する。
+    """
+    
+    def __init__(
+        self,
+        folder: str,
+        max_age_seconds: float = 60 * 60,
+        max_bytes: int = 1024 * 1024 * 1024
+    ):
+        """
+        Args:
+            folder: アップロードフォルダのパス
+            max_age_seconds: エントリを保持する最大時間（秒）
+            max_bytes: アップロードフォルダの最大合計サイズ（バイト）
+        """
+        self.folder = folder
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self.last_run: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.evicted_entries = 0
+        self.evicted_bytes = 0
+        self._in_use: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def acquire(self, name: str) -> None:
+        """エントリを使用中として登録する（同じエントリを複数回登録できる）"""
+        with self._lock:
+            self._in_use[name] = self._in_use.get(name, 0) + 1
+    
+    def release(self, name: str) -> None:
+        """エントリの使用中の登録を1回分解除する"""
+        with self._lock:
+            count = self._in_use.get(name, 0) - 1
+            if count > 0:
+                self._in_use[name] = count
+            else:
+                self._in_use.pop(name, None)
+    
+    @contextmanager
+    def in_use(self, name: str) -> Iterator[None]:
+        """with文のブロックの間、エントリを使用中として登録する"""
+        self.acquire(name)
+        try:
+            yield
+        finally:
+            self.release(name)
+    
+    def touch(self, name: str) -> None:
+        """エントリの最終利用時刻を現在時刻に更新する"""
+        try:
+            os.utime(os.path.join(self.folder, name))
+        except OSError:
+            pass
+    
+    def scan(self) -> List[Tuple[float, str, int]]:
+        """
+        アップロードフォルダのエントリを取得する
+        
+        Returns:
+            (最終利用時刻, エントリ名, サイズ) のリスト
+        """
+        entries = []
+        try:
+            dir_entries = list(os.scandir(self.folder))
+        except FileNotFoundError:
+            return entries
+        
+        for entry in dir_entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    last_used, size = self._directory_stat(entry.path)
+                else:
+                    stat = entry.stat(follow_symlinks=False)
+                    last_used, size = stat.st_mtime, stat.st_size
+            except FileNotFoundError:
+                continue
+            entries.append((last_used, entry.name, size))
+        return entries
+    
+    def run(self, now: Optional[float] = None) -> int:
+        """
+        期限切れのエントリと、合計サイズの上限を超えた分のエントリを削除する
+        
+        Args:
+            now: 現在時刻（Noneの場合は time.time()）
+            
+        Returns:
+            削除したエントリ数
+        """
+        now = time.time() if now is None else now
+        entries = sorted(self.scan())
+        total = sum(size for _, _, size in entries)
+        evicted = 0
+        
+        for last_used, name, size in entries:
+            expired = now - last_used > self.max_age_seconds
+            if not expired and total <= self.max_bytes:
+                # 以降のエントリはより新しいため、期限切れのものはない
+                break
+            
+            with self._lock:
+                if name in self._in_use:
+                    continue
+                if not self._remove(os.path.join(self.folder, name)):
+                    continue
+            
+            total -= size
+            evicted += 1
+            self.evicted_entries += 1
+            self.evicted_bytes += size
+        
+        self.last_run = now
+        return evicted
+    
+    def usage(self) -> Dict[str, Any]:
+        """アップロードフォルダの使用状況を辞書形式で返す"""
+        entries = self.scan()
+        with self._lock:
+            in_use = len(self._in_use)
+        
+        return {
+            'entries': len(entries),
+            'bytes': sum(size for _, _, size in entries),
+            'in_use': in_use,
+            'max_bytes': self.max_bytes,
+            'max_age_seconds': self.max_age_seconds,
+            'evicted_entries': self.evicted_entries,
+            'evicted_bytes': self.evicted_bytes,
+            'last_run': self.last_run,
+            'last_error': self.last_error
+        }
+    
+    def start(self, interval_seconds: float) -> None:
+        """バックグラウンドのスレッドで一定間隔ごとに run() を実行する"""
+        if self._thread is not None:
+            return
+        
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop,
+            args=(interval_seconds,),
+            name='md2excel-upload-janitor',
+            daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """バックグラウンドのスレッドを停止する"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def _loop(self, interval_seconds: float) -> None:
+        """バックグラウンドのスレッドの処理"""
+        while not self._stop.wait(interval_seconds):
+            try:
+                self.run()
+                self.last_error = None
+            except Exception as e:
+                # 削除の失敗で定期実行を止めない
+                self.last_error = str(e)
+    
+    @staticmethod
+    def _directory_stat(path: str) -> Tuple[float, int]:
+        """ディレクトリ内で最も新しい更新時刻と合計サイズを取得する"""
+        last_used = os.stat(path).st_mtime
+        size = 0
+        for root, dirs, files in os.walk(path):
+            for name in files:
+                try:
+                    stat = os.stat(os.path.join(root, name), follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                last_used = max(last_used, stat.st_mtime)
+                size += stat.st_size
+        return last_used, size
+    
+    @staticmethod
+    def _remove(path: str) -> bool:
+        """
+        ファイルまたはディレクトリを削除する
+        
+        Returns:
+            削除した（または既に削除されていた）場合はTrue、削除できなかった場合はFalse
+        """
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return False
+        return True
@@ -0,0 +1,303 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from src.integration import MarkdownToExcelProcessor, ProcessingResult
+from web.cleanup import UploadJanitor
+from web.metrics import AppMetrics
+
+
+# ジョブの状態
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+
+# 変換結果のアーカイブのファイル名
+ARCHIVE_NAME = 'converted_files.zip'
+
+
+class Job:
+    """
+    バッチ変換ジョブ
+    
+    ジョブごとのディレクトリに入力ファイル（input）・出力ファイル（output）・
+    変換結果のアーカイブを置く。状態はワーカースレッドが更新し、
+    リクエスト処理スレッドが to_dict() で参照するため、更新と参照はロックで保護する。
+    """
+    
+    def __init__(self, job_id: str, job_dir: str):
+        """
+        Args:
+            job_id: ジョブID
+            job_dir: ジョブの作業ディレクトリ
+        """
+        self.job_id = job_id
+        self.job_dir = job_dir
+        self.input_dir = os.path.join(job_dir, 'input')
+        self.output_dir = os.path.join(job_dir, 'output')
+        self.archive_path = os.path.join(job_dir, ARCHIVE_NAME)
+        self.status = JOB_QUEUED
+        self.total_files = 0
+        self.results: List[ProcessingResult] = []
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    def input_path(self, filename: str) -> str:
+        """
+        アップロードされたファイルの保存先パスを返す
+        
+        一括変換は拡張子 .md のファイルだけを変換するため、.markdown のファイルは
+        .md として保存する。同じ名前のファイルがある場合は番号を付ける。
+        
+        Args:
+            filename: 安全なファイル名（secure_filename の結果）
+            
+        Returns:
+            input_dir 内の保存先パス
+        """
+        stem, extension = os.path.splitext(filename)
+        if extension.lower() in ('.md', '.markdown'):
+            extension = '.md'
+        stem = stem or 'input'
+        
+        path = os.path.join(self.input_dir, stem + extension)
+        number = 1
+        while os.path.exists(path):
+            path = os.path.join(self.input_dir, f"{stem}_{number}{extension}")
+            number += 1
+        return path
+    
+    def record_result(self, result: ProcessingResult) -> None:
+        """ファイル1件の処理結果を記録する（process_directory の進捗コールバック）"""
+        with self._lock:
+            self.results.append(result)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """ジョブの状態を辞書形式で返す（パスはファイル名のみ返す）"""
+        with self._lock:
+            results = list(self.results)
+            status = self.status
+            error = self.error
+            finished_at = self.finished_at
+        
+        return {
+            'job_id': self.job_id,
+            'status': status,
+            'total_files': self.total_files,
+            'processed_files': len(results),
+            'successful_files': sum(1 for r in results if r.success),
+            'failed_files': sum(1 for r in results if not r.success),
+            'results': [
+                {
+                    'input_file': os.path.basename(r.input_file),
+                    'output_file': os.path.basename(r.output_file),
+                    'success': r.success,
+                    'tables_found': r.tables_found,
+                    'errors': r.errors,
+                    'warnings': r.warnings,
+                    'processing_time': r.processing_time_seconds
+                }
+                for r in results
+            ],
+            'error': error,
+            'created_at': self.created_at,
+            'finished_at': finished_at
+        }
+    
+    def start(self) -> None:
+        """状態を実行中にする"""
+        with self._lock:
+            self.status = JOB_RUNNING
+    
+    def complete(self, results: List[ProcessingResult]) -> None:
+        """
+        状態を完了にする
+        
+        ファイル単位で処理されなかった結果（出力先の作成失敗など）も含めるため、
+        進捗として記録した結果を process_directory の戻り値で置き換える。
+        """
+        with self._lock:
+            self.results = list(results)
+            self.status = JOB_COMPLETED
+            self.finished_at = time.time()
+    
+    def fail(self, error: str) -> None:
+        """状態を失敗にする"""
+        with self._lock:
+            self.error = error
+            self.status = JOB_FAILED
+            self.finished_at = time.time()
+
+
+class JobQueue:
+    """
+    バッチ変換ジョブをバックグラウンドのスレッドプールで実行するキュー
+    
+    ジョブの状態はプロセス内に保持する（外部サービスは使わない）。
+    ジョブは create() で作業ディレクトリを作成し、入力ファイルを
+    input_dir に保存してから submit() で実行を開始する（途中で失敗した場合は
+    discard() で削除する）。終了したジョブの記録は、max_age_seconds を過ぎるか
+    作業ディレクトリが削除された後、次の create() で破棄する。
+    """
+    
+    def __init__(
+        self,
+        processor: MarkdownToExcelProcessor,
+        max_workers: int = 2,
+        janitor: Optional[UploadJanitor] = None,
+        metrics: Optional[AppMetrics] = None,
+        max_age_seconds: float = 60 * 60
+    ):
+        """
+        Args:
+            processor: 変換に使うプロセッサ
+            max_workers: 同時に実行するジョブ数
+            janitor: アップロードフォルダの削除処理（指定した場合、作業ディレクトリを
+                ジョブの作成から終了まで使用中として登録する）
+            metrics: メトリクス（指定した場合、実行中のジョブ数とファイルごとの処理結果を記録する）
+            max_age_seconds: 終了したジョブの記録を保持する最大時間（秒）
+        """
+        self.processor = processor
+        self.janitor = janitor
+        self.metrics = metrics
+        self.max_age_seconds = max_age_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='md2excel-job')
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+    
+    def create(self, base_dir: str) -> Job:
+        """
+        ジョブと作業ディレクトリを作成する
+        
+        Args:
+            base_dir: ジョブの作業ディレクトリを作成する親ディレクトリ
+            
+        Returns:
+            Job: 作成したジョブ（状態は queued）
+        """
+        self.prune()
+        
+        job_id = uuid.uuid4().hex
+        job = Job(job_id, os.path.join(base_dir, f"job_{job_id}"))
+        if self.janitor is not None:
+            self.janitor.acquire(os.path.basename(job.job_dir))
+        with self._lock:
+            self._jobs[job_id] = job
+        
+        try:
+            os.makedirs(job.input_dir, exist_ok=True)
+            os.makedirs(job.output_dir, exist_ok=True)
+        except BaseException:
+            self.discard(job)
+            raise
+        return job
+    
+    def discard(self, job: Job) -> None:
+        """
+        実行を開始できなかったジョブを削除する
+        
+        ジョブの記録・作業ディレクトリ・使用中の登録を削除する（入力ファイルの保存や
+        submit() が失敗した場合に呼び出す）。
+        """
+        with self._lock:
+            self._jobs.pop(job.job_id, None)
+        shutil.rmtree(job.job_dir, ignore_errors=True)
+        if self.janitor is not None:
+            self.janitor.release(os.path.basename(job.job_dir))
+    
+    def prune(self, now: Optional[float] = None) -> int:
+        """
+        終了したジョブのうち、保持期間を過ぎたものと作業ディレクトリが削除されたものの記録を破棄する
+        
+        Args:
+            now: 現在時刻（Noneの場合は time.time()）
+            
+        Returns:
+            破棄したジョブ数
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished_at is not None and (
+                    now - job.finished_at > self.max_age_seconds or not os.path.exists(job.job_dir)
+                )
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+    
+    def submit(self, job: Job, apply_formatting: bool = False, auto_adjust_width: bool = False) -> None:
+        """
+        ジョブの実行を開始する
+        
+        Args:
+            job: create() で作成し、入力ファイルを保存したジョブ
+            apply_formatting: フォーマット適用フラグ
+            auto_adjust_width: 列幅自動調整フラグ
+        """
+        job.total_files = sum(1 for name in os.listdir(job.input_dir) if name.endswith('.md'))
+        self._executor.submit(self._run, job, apply_formatting, auto_adjust_width)
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """ジョブIDからジョブを取得する（存在しない場合はNone）"""
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """ワーカースレッドを停止する"""
+        self._executor.shutdown(wait=wait)
+    
+    def _run(self, job: Job, apply_formatting: bool, auto_adjust_width: bool) -> None:
+        """ワーカースレッドでジョブを実行する"""
+        job.start()
+        if self.metrics is not None:
+            self.metrics.in_flight.inc()
+        try:
+            results = self.processor.process_directory(
+                job.input_dir,
+                job.output_dir,
+                apply_formatting=apply_formatting,
+                auto_adjust_width=auto_adjust_width,
+                progress_callback=lambda result: self._record_result(job, result)
+            )
+            
+            # ディレクトリ単位の結果（ファイルがない・走査の失敗）はファイルの結果に含めない
+            directory_results = [result for result in results if result.input_file == job.input_dir]
+            results = [result for result in results if result.input_file != job.input_dir]
+            if not results:
+                errors = [error for result in directory_results for error in result.errors]
+                job.fail('; '.join(errors) or "No Markdown files to convert")
+                return
+            
+            # ZIP作成
+            with zipfile.ZipFile(job.archive_path, 'w') as zipf:
+                for result in results:
+                    if result.success and os.path.exists(result.output_file):
+                        zipf.write(result.output_file, os.path.basename(result.output_file))
+            
+            job.complete(results)
+        except Exception as e:
+            job.fail(str(e))
+        finally:
+            if self.metrics is not None:
+                self.metrics.in_flight.dec()
+            # アーカイブ以外の作業ファイルを削除
+            shutil.rmtree(job.input_dir, ignore_errors=True)
+            shutil.rmtree(job.output_dir, ignore_errors=True)
+            if self.janitor is not None:
+                self.janitor.release(os.path.basename(job.job_dir))
+    
+    def _record_result(self, job: Job, result: ProcessingResult) -> None:
+        """ファイル1件の処理結果をジョブとメトリクスに記録する"""
+        job.record_result(result)
+        if self.metrics is not None:
+            self.metrics.observe_result(result)
@@ -0,0 +1,334 @@
+import math
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.integration import ProcessingResult
+
+
+# Prometheus テキスト形式のContent-Type
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 所要時間のヒストグラムのバケット境界（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_value(value: float) -> str:
+    """サンプル値をテキスト形式の表記にする"""
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    """ラベル値のバックスラッシュ・二重引用符・改行をエスケープする"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    """ラベルをテキスト形式の表記にする（ラベルがない場合は空文字列）"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in labels) + '}'
+
+
+class _Metric:
+    """メトリクスの基底クラス（ラベルの組み合わせごとに値を保持する）"""
+    
+    metric_type = ''
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[Tuple[str, str], ...], Any] = {}
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+        """ラベルの値から値の保持に使うキーを作成する"""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple((name, str(labels[name])) for name in self.labelnames)
+    
+    def samples(self) -> List[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        """(サンプル名, ラベル, 値) のリスト"""
+        with self._lock:
+            return [(self.name, key, value) for key, value in sorted(self._values.items())]
+    
+    def render(self) -> List[str]:
+        """テキスト形式の行のリスト"""
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.metric_type}'
+        ]
+        for name, labels, value in self.samples():
+            lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return lines
+
+
+class Counter(_Metric):
+    """単調増加するカウンター"""
+    
+    metric_type = 'counter'
+    
+    def inc(self, amount: float = 1, **labels) -> None:
+        """値を加算する"""
+        if amount < 0:
+            raise ValueError('Counters can only be incremented')
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """増減する現在値"""
+    
+    metric_type = 'gauge'
+    
+    def set(self, value: float, **labels) -> None:
+        """値を設定する"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def inc(self, amount: float = 1, **labels) -> None:
+        """値を加算する"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def dec(self, amount: float = 1, **labels) -> None:
+        """値を減算する"""
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """観測値をバケットごとに数えるヒストグラム（_bucket・_sum・_count を出力する）"""
+    
+    metric_type = 'histogram'
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+    
+    def observe(self, value: float, **labels) -> None:
+        """値を観測する"""
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = state[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+    
+    def samples(self) -> List[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        with self._lock:
+            items = [(key, list(state[0]), state[1], state[2]) for key, state in sorted(self._values.items())]
+        
+        samples = []
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                samples.append((f'{self.name}_bucket', key + (('le', _format_value(bound)),), cumulative))
+            samples.append((f'{self.name}_sum', key, total))
+            samples.append((f'{self.name}_count', key, count))
+        return samples
+
+
+# UploadJanitor.usage() の値から出力するメトリクス（名前, 説明, キー, 種類）
+UPLOAD_USAGE_METRICS = (
+    ('md2excel_upload_folder_bytes', 'Bytes stored in UPLOAD_FOLDER.', 'bytes', Gauge),
+    ('md2excel_upload_folder_entries', 'Entries stored in UPLOAD_FOLDER.', 'entries', Gauge),
+    ('md2excel_upload_folder_max_bytes', 'Size bound of UPLOAD_FOLDER.', 'max_bytes', Gauge),
+    ('md2excel_upload_folder_evicted_bytes_total', 'Bytes evicted from UPLOAD_FOLDER.', 'evicted_bytes', Counter),
+    ('md2excel_upload_folder_evicted_entries_total', 'Entries evicted from UPLOAD_FOLDER.', 'evicted_entries', Counter)
+)
+
+# ConversionExecutor.usage() の値から出力するメトリクス（名前, 説明, キー, 種類）
+ADMISSION_USAGE_METRICS = (
+    ('md2excel_conversion_executor_running', 'Conversions running in the executor.', 'running', Gauge),
+    ('md2excel_conversion_executor_queued', 'Conversions waiting in the executor.', 'queued', Gauge),
+    ('md2excel_conversion_executor_max_concurrency', 'Concurrency limit of the executor.', 'max_concurrency', Gauge),
+    ('md2excel_conversion_executor_max_queue', 'Queue depth limit of the executor.', 'max_queue', Gauge),
+    ('md2excel_conversion_rejected_total', 'Conversions rejected with 503.', 'rejected', Counter),
+    ('md2excel_conversion_deadline_exceeded_total', 'Conversions that missed their deadline.', 'timed_out', Counter)
+)
+
+
+class AppMetrics:
+    """
+    Webアプリケーションのメトリクス
+    
+    値はプロセス内に保持し、render() でPrometheusのテキスト形式に変換する。
+    段階別の所要時間は変換結果の ConversionStats から記録し、アップロードの
+    受信時間は 'upload' として同じヒストグラムに記録する。
+    """
+    
+    def __init__(self):
+        self.requests = Counter(
+            'md2excel_http_requests_total',
+            'HTTP requests by endpoint and outcome.',
+            ('endpoint', 'outcome')
+        )
+        self.request_seconds = Histogram(
+            'md2excel_http_request_duration_seconds',
+            'HTTP request latency until the response is returned.',
+            ('endpoint',)
+        )
+        self.stage_seconds = Histogram(
+            'md2excel_stage_duration_seconds',
+            'Time spent in each stage of a conversion (upload, read, parse, infer, build, format, width, save).',
+            ('stage',)
+        )
+        self.conversion_seconds = Histogram(
+            'md2excel_conversion_duration_seconds',
+            'Total time of a single file conversion.'
+        )
+        self.conversions = Counter(
+            'md2excel_conversions_total',
+            'File conversions by outcome.',
+            ('outcome',)
+        )
+        self.uploaded_bytes = Counter(
+            'md2excel_upload_bytes_total',
+            'Bytes received in uploads.'
+        )
+        self.input_bytes = Counter(
+            'md2excel_input_bytes_total',
+            'Markdown bytes converted.'
+        )
+        self.output_bytes = Counter(
+            'md2excel_output_bytes_total',
+            'Workbook bytes written.'
+        )
+        self.tables = Counter(
+            'md2excel_tables_total',
+            'Tables converted.'
+        )
+        self.rows = Counter(
+            'md2excel_rows_total',
+            'Table rows converted.'
+        )
+        self.cells = Counter(
+            'md2excel_cells_written_total',
+            'Cells written to workbooks.'
+        )
+        self.in_flight = Gauge(
+            'md2excel_conversions_in_flight',
+            'Conversions (single files, batches and jobs) in progress, including those waiting in the executor.'
+        )
+        self.in_flight.set(0)
+    
+    @contextmanager
+    def track_in_flight(self) -> Iterator[None]:
+        """with文のブロックの間、実行中の変換数に加算する"""
+        self.in_flight.inc()
+        try:
+            yield
+        finally:
+            self.in_flight.dec()
+    
+    def observe_request(self, endpoint: Optional[str], status_code: int, seconds: float) -> None:
+        """HTTPリクエスト1件を記録する"""
+        endpoint = endpoint or 'unknown'
+        if status_code >= 500:
+            outcome = 'server_error'
+        elif status_code >= 400:
+            outcome = 'client_error'
+        else:
+            outcome = 'success'
+        self.requests.inc(endpoint=endpoint, outcome=outcome)
+        self.request_seconds.observe(seconds, endpoint=endpoint)
+    
+    def observe_upload(self, seconds: float, size: int) -> None:
+        """アップロードの受信（保存・読み込み）を記録する"""
+        self.stage_seconds.observe(seconds, stage='upload')
+        self.uploaded_bytes.inc(size)
+    
+    def observe_result(self, result: ProcessingResult) -> None:
+        """ファイル1件の変換結果を記録する"""
+        if result.skipped:
+            outcome = 'skipped'
+        elif not result.success:
+            outcome = 'failure'
+        elif result.cache_hit:
+            outcome = 'cache_hit'
+        else:
+            outcome = 'success'
+        self.conversions.inc(outcome=outcome)
+        
+        if result.processing_time_seconds is not None:
+            self.conversion_seconds.observe(result.processing_time_seconds)
+        
+        stats = result.stats
+        if stats is None:
+            return
+        for stage, seconds in stats.stage_seconds.items():
+            self.stage_seconds.observe(seconds, stage=stage)
+        self.input_bytes.inc(stats.input_bytes)
+        self.output_bytes.inc(stats.output_bytes)
+        self.rows.inc(stats.rows)
+        self.cells.inc(stats.cells_written)
+        if result.success:
+            self.tables.inc(result.tables_found)
+    
+    def render(
+        self,
+        upload_usage: Optional[Dict[str, Any]] = None,
+        admission_usage: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        メトリクスをPrometheusのテキスト形式に変換する
+        
+        Args:
+            upload_usage: UploadJanitor.usage() の戻り値（アップロードフォルダの使用状況）
+            admission_usage: ConversionExecutor.usage() の戻り値（変換の実行状況）
+            
+        Returns:
+            テキスト形式のメトリクス
+        """
+        metrics = [
+            self.requests,
+            self.request_seconds,
+            self.stage_seconds,
+            self.conversion_seconds,
+            self.conversions,
+            self.uploaded_bytes,
+            self.input_bytes,
+            self.output_bytes,
+            self.tables,
+            self.rows,
+            self.cells,
+            self.in_flight
+        ]
+        
+        # 使用状況の辞書の値を取得時点の値として出力する
+        for usage, definitions in (
+            (upload_usage, UPLOAD_USAGE_METRICS),
+            (admission_usage, ADMISSION_USAGE_METRICS)
+        ):
+            if usage is None:
+                continue
+            for name, documentation, key, metric_class in definitions:
+                metric = metric_class(name, documentation)
+                metric.inc(usage[key])
+                metrics.append(metric)
+        
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,109 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.table import Table
+
+
+# 解析結果のセル1つあたりのメモリ使用量の見積もり（バイト）
+# 文字列オブジェクトのヘッダー（49〜80バイト）と列のリストの要素（8バイト）。
+# セルの文字列の内容は入力のサイズで見積もる
+CELL_OVERHEAD_BYTES = 80
+
+
+class ParseCache:
+    """
+    Markdownの解析結果（Tableのリスト）をプロセス内に保持するLRUキャッシュ
+    
+    キーは入力のSHA-256で、/api/parse のページ送りでは同じ入力を再解析しない。
+    解析結果は入力の数倍のメモリを使うため、入力のサイズとセル数から見積もった
+    メモリ使用量（estimate_size()）の合計が max_bytes を超えた場合に、
+    最後に参照した時刻が古いものから削除する。
+    """
+    
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: 保持する解析結果のメモリ使用量（見積もり）の合計の上限（バイト）
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, Tuple[List[Table], int]]' = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        """入力のバイト列のハッシュ（キャッシュキー）"""
+        return hashlib.sha256(data).hexdigest()
+    
+    @staticmethod
+    def estimate_size(tables: List[Table], input_size: int) -> int:
+        """
+        解析結果のメモリ使用量を見積もる
+        
+        Args:
+            tables: 解析結果
+            input_size: 入力のサイズ（バイト）
+            
+        Returns:
+            見積もったメモリ使用量（バイト）
+        """
+        cells = sum(len(table.headers) + len(table.columns) * table.row_count for table in tables)
+        return input_size + cells * CELL_OVERHEAD_BYTES
+    
+    def get(self, key: str) -> Optional[List[Table]]:
+        """
+        解析結果を取得する
+        
+        Args:
+            key: content_hash() で求めたキー
+            
+        Returns:
+            Tableのリスト。キャッシュに存在しない場合はNone
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: str, tables: List[Table], size: int) -> None:
+        """
+        解析結果を保存する
+        
+        Args:
+            key: content_hash() で求めたキー
+            tables: 解析結果
+            size: 入力のサイズ（バイト）。見積もったメモリ使用量が上限を超える解析結果は保存しない
+        """
+        size = self.estimate_size(tables, size)
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+            self._entries[key] = (tables, size)
+            self._total_bytes += size
+            
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+    
+    def usage(self) -> Dict[str, Any]:
+        """キャッシュの使用状況を辞書形式で返す"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
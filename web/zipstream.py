@@ -0,0 +1,59 @@
+import zipfile
+from typing import Iterable, Iterator, List, Tuple
+
+
+class _ChunkBuffer:
+    """
+    ZipFileの書き込み先にする追記専用のバッファ
+    
+    seek/tell を持たないため、ZipFile は各エントリのサイズとCRCを
+    データディスクリプタとしてエントリの後ろに書き込む（書き戻しが不要になる）。
+    """
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self) -> None:
+        pass
+    
+    def drain(self) -> bytes:
+        """書き込まれたバイト列を取り出してバッファを空にする"""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(
+    entries: Iterable[Tuple[str, bytes]],
+    compression: int = zipfile.ZIP_DEFLATED
+) -> Iterator[bytes]:
+    """
+    ZIPアーカイブをエントリ単位で生成しながら返すジェネレーター
+    
+    entries から (アーカイブ内のファイル名, 内容) を1件受け取るたびに、
+    そのエントリのバイト列を返す。アーカイブ全体をメモリやディスクに保持しない。
+    
+    Args:
+        entries: (アーカイブ内のファイル名, 内容) のイテラブル
+        compression: 圧縮方式
+        
+    Yields:
+        ZIPアーカイブのバイト列（連結するとアーカイブ全体になる）
+    """
+    buffer = _ChunkBuffer()
+    
+    with zipfile.ZipFile(buffer, 'w', compression=compression) as archive:
+        for name, data in entries:
+            archive.writestr(name, data)
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+    
+    # セントラルディレクトリ
+    chunk = buffer.drain()
+    if chunk:
+        yield chunk